@@ -3,85 +3,53 @@
 Aggregate benchmark results from JSONL logs.
 Output: Markdown comparison report.
 
-Usage: python3 analyze-benchmark-results.py
+Usage: python3 analyze-benchmark-results.py [--jobs N] [--log-dir DIR]
 """
+import argparse
 import json
+import time
 from pathlib import Path
 from statistics import mean, stdev
 from datetime import datetime
 from collections import defaultdict
 
+from results_store import DB_FILE, record_runs
+from transcript_metrics import (REPORT_COLLECTORS, analyze_sessions, cache_report, context_report, latency_report,
+                                report_fields)
+
 LOG_DIR = Path("/tmp/ck-benchmark")
 REPORT_DIR = Path("/Users/duynguyen/www/claudekit/skill-validation/plans/reports")
 TRANSCRIPT_DIR = Path.home() / ".claude/projects/-Users-duynguyen-www-claudekit-skill-validation"
 
 
-def parse_transcript(session_id: str) -> dict:
-    """Parse Claude transcript file to extract tokens, duration, and tool usage."""
-    transcript_path = TRANSCRIPT_DIR / f"{session_id}.jsonl"
-    if not transcript_path.exists():
-        print(f"Transcript not found: {transcript_path}")
-        return {"input": 0, "output": 0, "total": 0, "duration_ms": 0, "tools": {}}
-
-    total_input = 0
-    total_output = 0
-    first_ts = None
-    last_ts = None
-    tool_counts = defaultdict(int)
+EMPTY_TRANSCRIPT = {"input": 0, "output": 0, "total": 0, "duration_ms": 0, "tools": {}}
 
-    try:
-        for line in transcript_path.read_text().splitlines():
-            if not line.strip():
-                continue
-            try:
-                obj = json.loads(line)
-
-                # Track timestamps for duration
-                ts = obj.get("timestamp")
-                if ts:
-                    if first_ts is None:
-                        first_ts = ts
-                    last_ts = ts
-
-                # Token usage is in message.usage for API responses
-                if "message" in obj and isinstance(obj["message"], dict):
-                    usage = obj["message"].get("usage", {})
-                    if usage:
-                        total_input += usage.get("input_tokens", 0)
-                        total_input += usage.get("cache_creation_input_tokens", 0)
-                        total_input += usage.get("cache_read_input_tokens", 0)
-                        total_output += usage.get("output_tokens", 0)
-
-                    # Count tool uses from content blocks
-                    content = obj["message"].get("content", [])
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "tool_use":
-                            tool_name = block.get("name", "unknown")
-                            tool_counts[tool_name] += 1
-
-            except json.JSONDecodeError:
-                continue
-    except Exception as e:
-        print(f"Error parsing transcript {session_id}: {e}")
-
-    # Calculate duration in ms from ISO timestamps
-    duration_ms = 0
-    if first_ts and last_ts:
-        try:
-            from datetime import datetime as dt
-            t1 = dt.fromisoformat(first_ts.replace("Z", "+00:00"))
-            t2 = dt.fromisoformat(last_ts.replace("Z", "+00:00"))
-            duration_ms = int((t2 - t1).total_seconds() * 1000)
-        except Exception:
-            pass
 
-    return {
-        "input": total_input,
-        "output": total_output,
-        "total": total_input + total_output,
-        "duration_ms": duration_ms,
-        "tools": dict(tool_counts)
-    }
+def parse_transcripts(session_ids: list, jobs: int = 1) -> list:
+    """Parse Claude transcripts to extract tokens, duration, and tool usage.
+
+    Metrics come from the shared transcript engine (cached, pooled with jobs > 1);
+    results keep the order of session_ids.
+    """
+    results = []
+    for metrics in analyze_sessions(session_ids, TRANSCRIPT_DIR, jobs, REPORT_COLLECTORS):
+        if metrics is None:
+            results.append(dict(EMPTY_TRANSCRIPT))
+            continue
+        results.append({
+            "input": metrics["input_tokens"],
+            "output": metrics["output_tokens"],
+            "total": metrics["total_tokens"],
+            "duration_ms": metrics["duration_ms"],
+            "tools": metrics["tool_counts"],
+            **report_fields(metrics),
+        })
+    return results
+
+
+def parse_transcript(session_id: str) -> dict:
+    """Parse Claude transcript file to extract tokens, duration, and tool usage."""
+    return parse_transcripts([session_id])[0]
 
 
 def parse_log(log_path: Path, session_id: str = None) -> dict:
@@ -123,14 +91,23 @@ def parse_log(log_path: Path, session_id: str = None) -> dict:
 
 
 def load_session_ids(method: str) -> list:
-    """Load session IDs from session file."""
+    """Load session IDs from session file, one per run ("" for a run without one)."""
     session_file = LOG_DIR / f"{method}-sessions.txt"
     if not session_file.exists():
         return []
-    return [s.strip() for s in session_file.read_text().splitlines() if s.strip()]
+    return [s.strip() for s in session_file.read_text().splitlines()]
 
 
-def categorize_logs() -> dict:
+def load_verification(method: str, run_num: int) -> dict:
+    """Load a run's verify-steps result ({} if it was not verified or the verifier failed)."""
+    verify_file = LOG_DIR / f"bench-{method}-{run_num}-verify.json"
+    try:
+        return json.loads(verify_file.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def categorize_logs(jobs: int = 1) -> dict:
     """Categorize log files by method (skill vs command)."""
     results = {"skill": [], "command": []}
 
@@ -142,35 +119,44 @@ def categorize_logs() -> dict:
     skill_sessions = load_session_ids("skill")
     cmd_sessions = load_session_ids("cmd")
 
+    # Parse every transcript up front (one pool for all sessions when jobs > 1)
+    parsed_all = parse_transcripts(skill_sessions + cmd_sessions, jobs)
+    skill_data = parsed_all[:len(skill_sessions)]
+    cmd_data = parsed_all[len(skill_sessions):]
+
     # Process skill runs - always use transcript for metrics
-    for i, session_id in enumerate(skill_sessions, 1):
-        data = parse_transcript(session_id)
+    for i, (session_id, data) in enumerate(zip(skill_sessions, skill_data), 1):
         if data["total"] > 0:  # Valid transcript found
             parsed = {
                 "file": f"skill-{i}",
+                "run": i,
                 "session_id": session_id,
                 "tool_count": sum(data["tools"].values()),
                 "tool_breakdown": data["tools"],
                 "duration_ms": data["duration_ms"],
                 "tokens_input": data["input"],
                 "tokens_output": data["output"],
-                "tokens_total": data["total"]
+                "tokens_total": data["total"],
+                "accuracy": load_verification("skill", i).get("accuracy"),
+                **report_fields(data),
             }
             results["skill"].append(parsed)
 
     # Process command runs - always use transcript for metrics
-    for i, session_id in enumerate(cmd_sessions, 1):
-        data = parse_transcript(session_id)
+    for i, (session_id, data) in enumerate(zip(cmd_sessions, cmd_data), 1):
         if data["total"] > 0:  # Valid transcript found
             parsed = {
                 "file": f"cmd-{i}",
+                "run": i,
                 "session_id": session_id,
                 "tool_count": sum(data["tools"].values()),
                 "tool_breakdown": data["tools"],
                 "duration_ms": data["duration_ms"],
                 "tokens_input": data["input"],
                 "tokens_output": data["output"],
-                "tokens_total": data["total"]
+                "tokens_total": data["total"],
+                "accuracy": load_verification("cmd", i).get("accuracy"),
+                **report_fields(data),
             }
             results["command"].append(parsed)
 
@@ -266,6 +252,10 @@ def generate_report(results: dict, model: str = "default") -> str:
                 report.append(f"- {tool}: {count}")
             report.append("")
 
+    report.extend(latency_report({"Skill": results["skill"], "Command": results["command"]}))
+    report.extend(cache_report({"Skill": results["skill"], "Command": results["command"]}))
+    report.extend(context_report({"Skill": results["skill"], "Command": results["command"]}))
+
     # Comparison
     if results["skill"] and results["command"]:
         report.append("## Comparison")
@@ -332,8 +322,40 @@ def generate_report(results: dict, model: str = "default") -> str:
     return "\n".join(report)
 
 
-def main():
-    results = categorize_logs()
+def store_results(results: dict, model: str) -> int:
+    """Record parsed runs in the results warehouse."""
+    runs = []
+    for method in ["skill", "command"]:
+        for i, r in enumerate(results[method], 1):
+            runs.append({
+                "method": method,
+                "run_index": r.get("run", i),
+                "session_id": r.get("session_id"),
+                "tokens_input": r["tokens_input"],
+                "tokens_output": r["tokens_output"],
+                "tokens_cache_read": r.get("cache_read_tokens"),
+                "tokens_cache_creation": r.get("cache_creation_tokens"),
+                "tokens_total": r["tokens_total"],
+                "cost_usd": r.get("cost_usd_effective"),
+                "duration_ms": r["duration_ms"],
+                "tool_count": r["tool_count"],
+                "tool_breakdown": r["tool_breakdown"],
+                "accuracy": r.get("accuracy"),
+            })
+    return record_runs("fileops", model, runs)
+
+
+def main(argv: list = None):
+    global LOG_DIR
+    parser = argparse.ArgumentParser(description="Aggregate file-ops benchmark results.")
+    parser.add_argument("--jobs", type=int, default=1, help="parse transcripts in N worker processes")
+    parser.add_argument("--log-dir", type=Path, help=f"benchmark logs (default: {LOG_DIR})")
+    args = parser.parse_args(argv)
+    LOG_DIR = args.log_dir or LOG_DIR
+
+    start = time.perf_counter()
+    results = categorize_logs(args.jobs)
+    print(f"Parsed transcripts in {time.perf_counter() - start:.2f}s (jobs={args.jobs})")
 
     skill_count = len(results["skill"])
     cmd_count = len(results["command"])
@@ -357,6 +379,7 @@ def main():
     report_path.write_text(report)
 
     print(f"\nReport saved: {report_path}")
+    print(f"Recorded {store_results(results, model)} runs in {DB_FILE}")
     print("\n" + "=" * 60)
     print(report)
 
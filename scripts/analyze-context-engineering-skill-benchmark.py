@@ -2,6 +2,9 @@
 """
 Analyze context engineering skill benchmark results.
 Compares ck-context-engineering (monolithic) vs external repo (modular) architectures.
+Token and cost totals come from each task's CLI JSON output; the context
+growth curve (peak context, growth per tool call, compactions) from its
+session transcript.
 """
 import json
 import os
@@ -11,8 +14,14 @@ from pathlib import Path
 from statistics import mean
 from typing import Dict, Optional
 
+from results_store import DB_FILE, record_runs
+from transcript_metrics import CONTEXT_KEYS, analyze_sessions, context_report, parse_cli_output
+from verification import load_cache, save_cache, verify
+
 LOG_DIR = Path("/tmp/ck-context-benchmark")
+TRANSCRIPT_DIR = Path.home() / ".claude/projects/-Users-duynguyen-www-claudekit-skill-validation"
 REPORTS_DIR = Path("/Users/duynguyen/www/claudekit/skill-validation/plans/reports")
+VERIFIER = "verify-context-engineering-skill-benchmark-responses.py"
 
 TASK_NAMES = [
     "context-degradation-diagnosis",
@@ -23,58 +32,6 @@ TASK_NAMES = [
 ]
 
 
-def parse_json_output(json_file: Path) -> Dict:
-    """Parse Claude CLI JSON output for metrics."""
-    result = {
-        "tokens_input": 0,
-        "tokens_output": 0,
-        "tokens_total": 0,
-        "tokens_cache_read": 0,
-        "tokens_cache_creation": 0,
-        "duration_ms": 0,
-        "num_turns": 0,
-        "cost_usd": 0,
-        "session_id": "",
-        "response_text": "",
-    }
-
-    try:
-        content = json_file.read_text().strip()
-        if not content:
-            return result
-
-        data = json.loads(content)
-        if isinstance(data, dict):
-            # Extract metrics from Claude CLI JSON output
-            result["session_id"] = data.get("session_id", "")
-            result["duration_ms"] = data.get("duration_ms", 0)
-            result["num_turns"] = data.get("num_turns", 0)
-            result["cost_usd"] = data.get("total_cost_usd", 0)
-            result["response_text"] = data.get("result", "")
-
-            # Token usage
-            usage = data.get("usage", {})
-            result["tokens_input"] = usage.get("input_tokens", 0)
-            result["tokens_output"] = usage.get("output_tokens", 0)
-            result["tokens_cache_read"] = usage.get("cache_read_input_tokens", 0)
-            result["tokens_cache_creation"] = usage.get("cache_creation_input_tokens", 0)
-
-            # Total = input + output + cache
-            result["tokens_total"] = (
-                result["tokens_input"]
-                + result["tokens_output"]
-                + result["tokens_cache_read"]
-                + result["tokens_cache_creation"]
-            )
-
-    except json.JSONDecodeError as e:
-        print(f"JSON parse error for {json_file}: {e}")
-    except Exception as e:
-        print(f"Error parsing {json_file}: {e}")
-
-    return result
-
-
 def analyze_skill_type(skill_type: str) -> Dict:
     """Analyze all tasks for a skill type by reading JSON outputs."""
     results = {
@@ -82,6 +39,9 @@ def analyze_skill_type(skill_type: str) -> Dict:
         "total_tokens": 0,
         "total_duration_ms": 0,
         "total_cost_usd": 0,
+        "total_cache_read_tokens": 0,
+        "total_cache_creation_tokens": 0,
+        "cache_read_ratio": 0,
         "avg_tokens_per_task": 0,
     }
 
@@ -99,11 +59,12 @@ def analyze_skill_type(skill_type: str) -> Dict:
         }
 
         if json_file.exists():
-            parsed = parse_json_output(json_file)
+            parsed = parse_cli_output(json_file)
             task_result["tokens"] = parsed["tokens_total"]
             task_result["tokens_input"] = parsed["tokens_input"]
             task_result["tokens_output"] = parsed["tokens_output"]
             task_result["tokens_cache_read"] = parsed["tokens_cache_read"]
+            task_result["tokens_cache_creation"] = parsed["tokens_cache_creation"]
             task_result["duration_ms"] = parsed["duration_ms"]
             task_result["cost_usd"] = parsed["cost_usd"]
             task_result["num_turns"] = parsed["num_turns"]
@@ -113,6 +74,19 @@ def analyze_skill_type(skill_type: str) -> Dict:
         results["total_tokens"] += task_result["tokens"]
         results["total_duration_ms"] += task_result["duration_ms"]
         results["total_cost_usd"] += task_result["cost_usd"]
+        results["total_cache_read_tokens"] += task_result.get("tokens_cache_read", 0)
+        results["total_cache_creation_tokens"] += task_result.get("tokens_cache_creation", 0)
+
+    # Context growth from the transcripts of the tasks that ran
+    tasks = [task for task in results["tasks"].values() if task.get("session_id")]
+    for task, metrics in zip(tasks, analyze_sessions([task["session_id"] for task in tasks], TRANSCRIPT_DIR)):
+        if metrics is not None:
+            task.update({key: metrics[key] for key in CONTEXT_KEYS})
+
+    # Share of all input (uncached + cache writes + cache reads) served from the prompt cache
+    total_input = sum(task["tokens"] - task["tokens_output"] for task in results["tasks"].values())
+    if total_input > 0:
+        results["cache_read_ratio"] = results["total_cache_read_tokens"] / total_input
 
     if len(TASK_NAMES) > 0:
         results["avg_tokens_per_task"] = results["total_tokens"] / len(TASK_NAMES)
@@ -121,26 +95,15 @@ def analyze_skill_type(skill_type: str) -> Dict:
 
 
 def run_verification() -> Dict:
-    """Run verification script and return results."""
-    import subprocess
-    import sys
-
-    verify_script = Path(__file__).parent / "verify-context-engineering-skill-benchmark-responses.py"
-    if verify_script.exists():
-        try:
-            result = subprocess.run(
-                [sys.executable, str(verify_script)],
-                capture_output=True,
-                text=True,
-            )
-            # Extract JSON from output
-            output = result.stdout
-            if "JSON Results:" in output:
-                json_part = output.split("JSON Results:")[-1].strip()
-                return json.loads(json_part)
-        except Exception as e:
-            print(f"Verification error: {e}")
-    return {}
+    """Score the responses in LOG_DIR in-process (cached while the responses are unchanged)."""
+    cache = load_cache()
+    try:
+        return verify(VERIFIER, LOG_DIR, cache)
+    except Exception as e:
+        print(f"Verification error: {e}")
+        return {}
+    finally:
+        save_cache(cache)
 
 
 def generate_report(local_results: Dict, external_results: Dict, verification: Dict) -> str:
@@ -166,6 +129,8 @@ def generate_report(local_results: Dict, external_results: Dict, verification: D
 | Avg Tokens/Task | {local_results['avg_tokens_per_task']:,.0f} | {external_results['avg_tokens_per_task']:,.0f} | {((external_results['avg_tokens_per_task'] - local_results['avg_tokens_per_task']) / max(local_results['avg_tokens_per_task'], 1) * 100):+.1f}% |
 | Total Duration | {l_dur:.1f}s | {e_dur:.1f}s | {((e_dur - l_dur) / max(l_dur, 0.1) * 100):+.1f}% |
 | Total Cost | ${l_cost:.4f} | ${e_cost:.4f} | {((e_cost - l_cost) / max(l_cost, 0.0001) * 100):+.1f}% |
+| Cache Read Ratio | {local_results['cache_read_ratio']:.1%} | {external_results['cache_read_ratio']:.1%} | {(external_results['cache_read_ratio'] - local_results['cache_read_ratio']) * 100:+.1f} pts |
+| Cache Created | {local_results['total_cache_creation_tokens']:,} | {external_results['total_cache_creation_tokens']:,} | {((external_results['total_cache_creation_tokens'] - local_results['total_cache_creation_tokens']) / max(local_results['total_cache_creation_tokens'], 1) * 100):+.1f}% |
 
 ## Accuracy Comparison
 
@@ -205,28 +170,35 @@ def generate_report(local_results: Dict, external_results: Dict, verification: D
             else:
                 report += "**Tie** |\n"
 
+    report += "\n" + "\n".join(context_report({
+        "Local (Monolithic)": list(local_results["tasks"].values()),
+        "External (Modular)": list(external_results["tasks"].values()),
+    }))
+
     report += """
 ## Task Details
 
 ### Local (Monolithic) Skill
 
-| Task | Tokens | Duration | Cost | Turns |
-|------|--------|----------|------|-------|
+| Task | Tokens | Peak context | Duration | Cost | Turns |
+|------|--------|--------------|----------|------|-------|
 """
     for task_id, task_data in local_results["tasks"].items():
         dur = task_data.get('duration_ms', 0) / 1000
         cost = task_data.get('cost_usd', 0)
         turns = task_data.get('num_turns', 0)
-        report += f"| {task_data['name']} | {task_data['tokens']:,} | {dur:.1f}s | ${cost:.4f} | {turns} |\n"
+        peak = f"{task_data['peak_context_tokens']:,}" if "peak_context_tokens" in task_data else "-"
+        report += f"| {task_data['name']} | {task_data['tokens']:,} | {peak} | {dur:.1f}s | ${cost:.4f} | {turns} |\n"
 
     report += "\n### External (Modular) Skills\n\n"
-    report += "| Task | Tokens | Duration | Cost | Turns |\n"
-    report += "|------|--------|----------|------|-------|\n"
+    report += "| Task | Tokens | Peak context | Duration | Cost | Turns |\n"
+    report += "|------|--------|--------------|----------|------|-------|\n"
     for task_id, task_data in external_results["tasks"].items():
         dur = task_data.get('duration_ms', 0) / 1000
         cost = task_data.get('cost_usd', 0)
         turns = task_data.get('num_turns', 0)
-        report += f"| {task_data['name']} | {task_data['tokens']:,} | {dur:.1f}s | ${cost:.4f} | {turns} |\n"
+        peak = f"{task_data['peak_context_tokens']:,}" if "peak_context_tokens" in task_data else "-"
+        report += f"| {task_data['name']} | {task_data['tokens']:,} | {peak} | {dur:.1f}s | ${cost:.4f} | {turns} |\n"
 
     report += "\n"
 
@@ -279,6 +251,32 @@ def generate_report(local_results: Dict, external_results: Dict, verification: D
     return report
 
 
+def store_results(results_by_type: Dict, verification: Dict, model: str) -> int:
+    """Record parsed task runs in the results warehouse."""
+    runs = []
+    for skill_type, results in results_by_type.items():
+        for task_id, task_data in results["tasks"].items():
+            if not task_data.get("session_id"):
+                continue
+            task_verification = verification.get(skill_type, {}).get(str(task_id), {})
+            runs.append({
+                "method": skill_type,
+                "task": task_data["name"],
+                "run_index": task_id,
+                "session_id": task_data["session_id"],
+                "tokens_input": task_data["tokens_input"],
+                "tokens_output": task_data["tokens_output"],
+                "tokens_cache_read": task_data["tokens_cache_read"],
+                "tokens_cache_creation": task_data["tokens_cache_creation"],
+                "tokens_total": task_data["tokens"],
+                "duration_ms": task_data["duration_ms"],
+                "cost_usd": task_data["cost_usd"],
+                "num_turns": task_data["num_turns"],
+                "accuracy": task_verification.get("accuracy") if verification else None,
+            })
+    return record_runs("context-engineering", model, runs)
+
+
 def main():
     if not LOG_DIR.exists():
         print(f"Log directory not found: {LOG_DIR}")
@@ -304,6 +302,13 @@ def main():
     report_path.write_text(report)
 
     print(f"\nReport saved: {report_path}")
+
+    model = "default"
+    model_file = LOG_DIR / "model.txt"
+    if model_file.exists():
+        model = model_file.read_text().strip()
+    recorded = store_results({"local": local_results, "external": external_results}, verification, model)
+    print(f"Recorded {recorded} runs in {DB_FILE}")
     print("\n" + "=" * 60)
     print(report)
 
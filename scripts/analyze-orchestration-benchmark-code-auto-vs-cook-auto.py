@@ -8,119 +8,45 @@ Extended metrics:
 - Tool calls breakdown
 - Subagent calls (Task tool invocations by subagent_type)
 - Review cycle counts
+- Time attribution (model, tools, subagents) and per-tool latency
+- Subagent critical path, concurrency and idle gaps
+- Prompt-cache reuse and effective cost
 - Accuracy from verification results
 
-Usage: python3 analyze-orchestration-benchmark-code-auto-vs-cook-auto.py
+Usage: python3 analyze-orchestration-benchmark-code-auto-vs-cook-auto.py [--jobs N] [--log-dir DIR]
 """
+import argparse
 import json
+import time
 from pathlib import Path
 from statistics import mean, stdev
 from datetime import datetime
-from collections import defaultdict
-import re
+
+from results_store import DB_FILE, record_runs
+from transcript_metrics import (REPORT_COLLECTORS, analyze_sessions, cache_report, context_report, empty_report,
+                                latency_report, report_fields)
 
 LOG_DIR = Path("/tmp/ck-orchestration-benchmark")
 REPORT_DIR = Path("/Users/duynguyen/www/claudekit/skill-validation/plans/reports")
 TRANSCRIPT_DIR = Path.home() / ".claude/projects/-Users-duynguyen-www-claudekit-skill-validation"
 
 
-def parse_transcript(session_id: str) -> dict:
-    """Parse Claude transcript to extract comprehensive metrics."""
-    transcript_path = TRANSCRIPT_DIR / f"{session_id}.jsonl"
-    if not transcript_path.exists():
-        # Try alternative paths (workspace-based)
-        for alt_dir in Path.home().glob(".claude/projects/*bench-greeting*"):
-            alt_path = alt_dir / f"{session_id}.jsonl"
-            if alt_path.exists():
-                transcript_path = alt_path
-                break
-
-    if not transcript_path.exists():
-        print(f"Transcript not found: {session_id}")
-        return empty_metrics()
-
-    metrics = {
-        "input_tokens": 0,
-        "output_tokens": 0,
-        "total_tokens": 0,
-        "duration_ms": 0,
-        "tool_counts": defaultdict(int),
-        "subagent_counts": defaultdict(int),
-        "review_cycles": 0,
-        "task_creates": 0,
-        "task_updates": 0,
-    }
+def parse_transcripts(session_ids: list, jobs: int = 1) -> list:
+    """Parse Claude transcripts to extract comprehensive metrics.
 
-    first_ts = None
-    last_ts = None
+    Metrics come from the shared transcript engine (cached, pooled with jobs > 1);
+    results keep the order of session_ids.
+    """
+    results = []
+    for metrics in analyze_sessions(session_ids, TRANSCRIPT_DIR, jobs, REPORT_COLLECTORS):
+        empty = empty_metrics()
+        results.append(empty if metrics is None else {key: metrics[key] for key in empty})
+    return results
 
-    try:
-        for line in transcript_path.read_text().splitlines():
-            if not line.strip():
-                continue
-            try:
-                obj = json.loads(line)
-
-                # Track timestamps
-                ts = obj.get("timestamp")
-                if ts:
-                    if first_ts is None:
-                        first_ts = ts
-                    last_ts = ts
-
-                # Token usage from message.usage
-                if "message" in obj and isinstance(obj["message"], dict):
-                    usage = obj["message"].get("usage", {})
-                    if usage:
-                        metrics["input_tokens"] += usage.get("input_tokens", 0)
-                        metrics["input_tokens"] += usage.get("cache_creation_input_tokens", 0)
-                        metrics["input_tokens"] += usage.get("cache_read_input_tokens", 0)
-                        metrics["output_tokens"] += usage.get("output_tokens", 0)
-
-                    # Count tool uses from content blocks
-                    content = obj["message"].get("content", [])
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "tool_use":
-                            tool_name = block.get("name", "unknown")
-                            metrics["tool_counts"][tool_name] += 1
-
-                            # Track subagent calls (Task tool)
-                            if tool_name == "Task":
-                                tool_input = block.get("input", {})
-                                subagent_type = tool_input.get("subagent_type", "unknown")
-                                metrics["subagent_counts"][subagent_type] += 1
-
-                                # Track review cycles (code-reviewer invocations)
-                                if subagent_type == "code-reviewer":
-                                    metrics["review_cycles"] += 1
-
-                            # Track task management
-                            elif tool_name == "TaskCreate":
-                                metrics["task_creates"] += 1
-                            elif tool_name == "TaskUpdate":
-                                metrics["task_updates"] += 1
-
-            except json.JSONDecodeError:
-                continue
-
-    except Exception as e:
-        print(f"Error parsing transcript {session_id}: {e}")
-        return empty_metrics()
-
-    # Calculate duration
-    if first_ts and last_ts:
-        try:
-            t1 = datetime.fromisoformat(first_ts.replace("Z", "+00:00"))
-            t2 = datetime.fromisoformat(last_ts.replace("Z", "+00:00"))
-            metrics["duration_ms"] = int((t2 - t1).total_seconds() * 1000)
-        except Exception:
-            pass
-
-    metrics["total_tokens"] = metrics["input_tokens"] + metrics["output_tokens"]
-    metrics["tool_counts"] = dict(metrics["tool_counts"])
-    metrics["subagent_counts"] = dict(metrics["subagent_counts"])
-
-    return metrics
+
+def parse_transcript(session_id: str) -> dict:
+    """Parse Claude transcript to extract comprehensive metrics."""
+    return parse_transcripts([session_id])[0]
 
 
 def empty_metrics() -> dict:
@@ -135,15 +61,16 @@ def empty_metrics() -> dict:
         "review_cycles": 0,
         "task_creates": 0,
         "task_updates": 0,
+        **empty_report(),
     }
 
 
 def load_session_ids(method: str) -> list:
-    """Load session IDs from session file."""
+    """Load session IDs from session file, one per run ("" for a run without one)."""
     session_file = LOG_DIR / f"{method}-sessions.txt"
     if not session_file.exists():
         return []
-    return [s.strip() for s in session_file.read_text().splitlines() if s.strip()]
+    return [s.strip() for s in session_file.read_text().splitlines()]
 
 
 def load_verification(method: str, run_num: int) -> dict:
@@ -154,34 +81,39 @@ def load_verification(method: str, run_num: int) -> dict:
 
     try:
         content = verify_file.read_text()
-        # Find JSON in output (may have other text)
-        match = re.search(r'\{[^{}]*"accuracy"[^{}]*\}', content, re.DOTALL)
-        if match:
-            return json.loads(match.group())
-        return json.loads(content)
+        # run-benchmarks.py writes the verifier's JSON; older runs may have stray
+        # output before it, so decode from the first line that opens an object
+        start = 0 if content.startswith("{") else content.index("\n{") + 1
+        return json.JSONDecoder().raw_decode(content, start)[0]
     except Exception:
         return {"accuracy": 0, "passed": 0, "total": 0}
 
 
-def load_walltime(method: str, run_num: int) -> int:
-    """Load wall-clock time for a run."""
+def load_walltime(method: str, run_num: int) -> float:
+    """Load wall-clock seconds for a run (ms resolution when written by run-benchmarks.py)."""
     walltime_file = LOG_DIR / f"{method}-{run_num}-walltime.txt"
     if not walltime_file.exists():
         return 0
     try:
-        return int(walltime_file.read_text().strip())
+        return float(walltime_file.read_text().strip())
     except Exception:
         return 0
 
 
-def categorize_runs() -> dict:
+def categorize_runs(jobs: int = 1) -> dict:
     """Categorize and parse all benchmark runs."""
     results = {"code": [], "cook": []}
 
+    # Parse every transcript up front (one pool for both methods when jobs > 1)
+    sessions = {method: load_session_ids(method) for method in ["code", "cook"]}
+    parsed_all = parse_transcripts(sessions["code"] + sessions["cook"], jobs)
+    parsed = {
+        "code": parsed_all[:len(sessions["code"])],
+        "cook": parsed_all[len(sessions["code"]):],
+    }
+
     for method in ["code", "cook"]:
-        sessions = load_session_ids(method)
-        for i, session_id in enumerate(sessions, 1):
-            metrics = parse_transcript(session_id)
+        for i, (session_id, metrics) in enumerate(zip(sessions[method], parsed[method]), 1):
             if metrics["total_tokens"] > 0:
                 verification = load_verification(method, i)
                 walltime = load_walltime(method, i)
@@ -204,6 +136,7 @@ def categorize_runs() -> dict:
                     "accuracy": verification.get("accuracy", 0),
                     "checks_passed": verification.get("passed", 0),
                     "checks_total": verification.get("total", 0),
+                    **report_fields(metrics),
                 }
                 results[method].append(run_data)
 
@@ -222,6 +155,39 @@ def calc_stats(values: list) -> dict:
     }
 
 
+def schedule_report(results: dict) -> list:
+    """Markdown lines on how subagents were scheduled: critical path vs busy time, concurrency, idle gaps."""
+    report = ["## Subagent Concurrency", ""]
+    report.append("| Method | Subagents | Busy | Critical path | Parallelized | Max conc. | Avg conc. | Idle gaps |")
+    report.append("|--------|-----------|------|---------------|--------------|-----------|-----------|-----------|")
+    for method in ["code", "cook"]:
+        runs = results[method]
+        if not runs:
+            continue
+        method_name = "/code:auto" if method == "code" else "/cook --auto"
+        busy = mean([r["subagent_busy_ms"] for r in runs])
+        critical = mean([r["critical_path_ms"] for r in runs])
+        gaps = mean([sum(r["idle_gaps_ms"]) for r in runs])
+        concurrency = [r["avg_concurrency"] for r in runs if r["subagent_covered_ms"]]
+        report.append(
+            f"| {method_name} | {mean([r['subagent_count'] for r in runs]):.1f} | {busy / 1000:.1f}s | "
+            f"{critical / 1000:.1f}s | {1 - critical / busy if busy else 0:.0%} | "
+            f"{max(r['max_concurrency'] for r in runs)} | {mean(concurrency) if concurrency else 0:.2f} | "
+            f"{mean([len(r['idle_gaps_ms']) for r in runs]):.1f} ({gaps / 1000:.1f}s) |"
+        )
+    report.append("")
+    report.append("Parallelized is the share of subagent time off the critical path; idle gaps are stretches "
+                  "between subagents with none running.")
+    report.append("")
+    for method in ["code", "cook"]:
+        runs = results[method]
+        if runs and runs[0]["critical_path"]:
+            method_name = "/code:auto" if method == "code" else "/cook --auto"
+            report.append(f"**Critical path, {method_name} (Run 1):** {' → '.join(runs[0]['critical_path'])}")
+            report.append("")
+    return report
+
+
 def generate_report(results: dict, model: str = "default") -> str:
     """Generate comprehensive markdown report."""
     report = []
@@ -303,6 +269,11 @@ def generate_report(results: dict, model: str = "default") -> str:
                 report.append(f"- {tool}: {count}")
             report.append("")
 
+    report.extend(latency_report({"/code:auto": results["code"], "/cook --auto": results["cook"]}))
+    report.extend(schedule_report(results))
+    report.extend(cache_report({"/code:auto": results["code"], "/cook --auto": results["cook"]}))
+    report.extend(context_report({"/code:auto": results["code"], "/cook --auto": results["cook"]}))
+
     # Comparison
     if results["code"] and results["cook"]:
         report.append("## Comparison")
@@ -393,8 +364,43 @@ def generate_report(results: dict, model: str = "default") -> str:
     return "\n".join(report)
 
 
-def main():
-    results = categorize_runs()
+def store_results(results: dict, model: str) -> int:
+    """Record parsed runs in the results warehouse."""
+    runs = []
+    for method in ["code", "cook"]:
+        for r in results[method]:
+            runs.append({
+                "method": method,
+                "run_index": r["run"],
+                "session_id": r["session_id"],
+                "tokens_input": r["input_tokens"],
+                "tokens_output": r["output_tokens"],
+                "tokens_cache_read": r["cache_read_tokens"],
+                "tokens_cache_creation": r["cache_creation_tokens"],
+                "tokens_total": r["tokens"],
+                "cost_usd": r["cost_usd_effective"],
+                "duration_ms": r["duration_ms"],
+                "walltime_s": r["walltime_s"],
+                "tool_count": r["tool_count"],
+                "tool_breakdown": r["tool_breakdown"],
+                "subagent_count": r["subagent_count"],
+                "subagent_breakdown": r["subagent_breakdown"],
+                "accuracy": r["accuracy"],
+            })
+    return record_runs("orchestration", model, runs)
+
+
+def main(argv: list = None):
+    global LOG_DIR
+    parser = argparse.ArgumentParser(description="Analyze /code:auto vs /cook --auto benchmark results.")
+    parser.add_argument("--jobs", type=int, default=1, help="parse transcripts in N worker processes")
+    parser.add_argument("--log-dir", type=Path, help=f"benchmark logs (default: {LOG_DIR})")
+    args = parser.parse_args(argv)
+    LOG_DIR = args.log_dir or LOG_DIR
+
+    start = time.perf_counter()
+    results = categorize_runs(args.jobs)
+    print(f"Parsed transcripts in {time.perf_counter() - start:.2f}s (jobs={args.jobs})")
 
     code_count = len(results["code"])
     cook_count = len(results["cook"])
@@ -419,6 +425,7 @@ def main():
     report_path.write_text(report)
 
     print(f"\nReport saved: {report_path}")
+    print(f"Recorded {store_results(results, model)} runs in {DB_FILE}")
     print("\n" + "=" * 60)
     print(report)
 
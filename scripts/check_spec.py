@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Declarative workspace checks, compiled into a per-file plan.
+
+A spec is a JSON file, {"name": ..., "checks": [...]}, where each check has an
+"id", a "description" and a "path" relative to the workspace, plus:
+  "type"       what must exist at path: "file" (default), "dir" or "any"
+  "contains"   substring(s); "icontains" the same, case-insensitive
+  "regex"      pattern(s), searched with re.MULTILINE
+  "json"       dotted field of the file's JSON, compared (type-strict) to "equals"
+  "absent"     a path that must not exist
+  "optional"   skip the check (it is not counted) instead of failing it when
+               the file is missing or unreadable
+A check passes when path exists with the right type, "absent" does not exist
+and, if it has content tests, any one of them matches.
+
+An optional "changes" section declares what a run should do to the workspace,
+checked by verify_changes against a workspace_manifest.diff_manifests diff:
+  "created", "modified", "deleted"   paths or globs, each of which must match
+                                     at least one change of that kind
+  "renamed"    [old, new] pairs that must appear as renames (same content hash)
+  "allowed"    globs of changes that are expected but not required
+Any other change is a side effect and fails the "no_side_effects" check.
+Globs use fnmatch, where "*" also matches "/". A rename satisfies "deleted"
+for its old path and "created" for its new one.
+
+compile_spec groups the checks by file and precompiles regexes, so running a
+plan reads, decodes, lowercases and JSON-parses each file at most once
+however many checks look at it. Specs live in scripts/verify-specs/; the
+verify-*.py scripts run theirs, and verification.py runs any spec by name.
+
+Usage: python3 check_spec.py <spec.json> <workspace> [...]
+"""
+import json
+import re
+import sys
+from fnmatch import fnmatchcase
+from functools import cached_property
+from pathlib import Path
+
+from workspace_snapshot import Snapshot
+
+SPEC_DIR = Path(__file__).resolve().parent / "verify-specs"
+CONTENT_TESTS = ("contains", "icontains", "regex", "json")
+CHANGE_KEYS = ("created", "modified", "deleted", "renamed", "allowed")
+MISSING = object()
+
+
+def load_spec(spec) -> dict:
+    """A spec dict from a dict, a path, or a file name in SPEC_DIR."""
+    if isinstance(spec, dict):
+        return spec
+    path = Path(spec)
+    if not path.exists() and (SPEC_DIR / path).exists():
+        path = SPEC_DIR / path
+    return json.loads(path.read_text())
+
+
+def as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def compile_check(check: dict) -> dict:
+    """Normalize one check: list-valued tests, lowercased icontains, compiled regexes."""
+    unknown = set(check) - {"id", "description", "path", "type", "absent", "optional", "equals", *CONTENT_TESTS}
+    if unknown or "path" not in check:
+        raise ValueError(f"Bad check {check.get('id')}: {', '.join(sorted(unknown)) or 'missing path'}")
+    return {
+        "id": check["id"],
+        "description": check.get("description", ""),
+        "path": check["path"],
+        "type": check.get("type", "file"),
+        "absent": check.get("absent"),
+        "optional": check.get("optional", False),
+        "contains": as_list(check.get("contains", [])),
+        "icontains": [s.lower() for s in as_list(check.get("icontains", []))],
+        "regex": [re.compile(p, re.MULTILINE) for p in as_list(check.get("regex", []))],
+        "json": check["json"].split(".") if "json" in check else None,
+        "equals": check.get("equals"),
+        "reads": any(test in check for test in CONTENT_TESTS),
+    }
+
+
+def compile_changes(changes: dict) -> dict:
+    """Normalize a spec's "changes" section: every key present, renames as tuples."""
+    unknown = set(changes) - set(CHANGE_KEYS)
+    if unknown:
+        raise ValueError(f"Bad changes section: {', '.join(sorted(unknown))}")
+    compiled = {key: list(changes.get(key, [])) for key in CHANGE_KEYS}
+    compiled["renamed"] = [tuple(pair) for pair in compiled["renamed"]]
+    return compiled
+
+
+def compile_spec(spec) -> dict:
+    """Plan for a spec: compiled checks, grouped by the file they look at."""
+    spec = load_spec(spec)
+    checks = [compile_check(check) for check in spec["checks"]]
+    files = {}
+    for index, check in enumerate(checks):
+        files.setdefault(check["path"], []).append(index)
+    changes = compile_changes(spec["changes"]) if "changes" in spec else None
+    return {"name": spec.get("name", ""), "checks": checks, "files": files, "changes": changes}
+
+
+class FileContent:
+    """One file's text, lowercased text and JSON, each derived at most once."""
+
+    def __init__(self, snap: Snapshot, path: str):
+        self.snap = snap
+        self.path = path
+
+    @cached_property
+    def text(self) -> str:
+        return self.snap.read_text(self.path)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def data(self):
+        return json.loads(self.text)
+
+
+def json_field(data, fields: list):
+    """Value at a dotted path, or MISSING when any step is missing."""
+    for field in fields:
+        if not isinstance(data, dict) or field not in data:
+            return MISSING
+        data = data[field]
+    return data
+
+
+def content_matches(check: dict, content: FileContent) -> bool:
+    """Whether any of the check's content tests matches."""
+    if any(s in content.text for s in check["contains"]):
+        return True
+    if check["icontains"] and any(s in content.lower for s in check["icontains"]):
+        return True
+    if any(regex.search(content.text) for regex in check["regex"]):
+        return True
+    if check["json"] is not None:
+        try:
+            value = json_field(content.data, check["json"])
+        except ValueError:
+            return False
+        return value == check["equals"] and type(value) is type(check["equals"])
+    return False
+
+
+def evaluate(check: dict, snap: Snapshot, content: FileContent):
+    """True/False for a check, or None when an optional check is skipped."""
+    kind = snap.entries.get(check["path"], (None,))[0]
+    if kind is None or (check["type"] != "any" and kind != check["type"]):
+        return None if check["optional"] else False
+    if check["absent"] and snap.exists(check["absent"]):
+        return False
+    if not check["reads"]:
+        return True
+    try:
+        return content_matches(check, content)
+    except (OSError, UnicodeDecodeError):
+        return None if check["optional"] else False
+
+
+def run_plan(plan: dict, workspace) -> list:
+    """[(check, passed)] in spec order for a workspace path or Snapshot; skipped checks omitted."""
+    snap = workspace if isinstance(workspace, Snapshot) else Snapshot(Path(workspace))
+    outcomes = {}
+    for path, indexes in plan["files"].items():
+        content = FileContent(snap, path)
+        for index in indexes:
+            outcomes[index] = evaluate(plan["checks"][index], snap, content)
+    return [(check, outcomes[i]) for i, check in enumerate(plan["checks"]) if outcomes[i] is not None]
+
+
+def verify_spec(plan: dict, workspace) -> dict:
+    """Run a compiled plan and summarize it like the greeting verifier does."""
+    snap = workspace if isinstance(workspace, Snapshot) else Snapshot(Path(workspace))
+    outcomes = run_plan(plan, snap)
+    passed = sum(1 for _, ok in outcomes if ok)
+    return {
+        "workspace": str(snap.root),
+        "spec": plan["name"],
+        "checks": {str(check["id"]): {"passed": ok, "description": check["description"]} for check, ok in outcomes},
+        "passed": passed,
+        "failed": len(outcomes) - passed,
+        "total": len(outcomes),
+        "accuracy": passed / len(outcomes) if outcomes else 0,
+    }
+
+
+def matches_any(path: str, patterns: list) -> bool:
+    return any(fnmatchcase(path, pattern) for pattern in patterns)
+
+
+def verify_changes(plan: dict, diff: dict) -> dict:
+    """Compare a manifest diff with the plan's expected changes, listing side effects."""
+    expected = plan["changes"] or compile_changes({})
+    renamed = [tuple(pair) for pair in diff["renamed"]]
+    seen = {
+        "created": diff["created"] + [new for _, new in renamed],
+        "modified": diff["modified"],
+        "deleted": diff["deleted"] + [old for old, _ in renamed],
+    }
+
+    checks = {}
+    for kind in ("created", "modified", "deleted"):
+        for pattern in expected[kind]:
+            checks[f"{kind}:{pattern}"] = {
+                "passed": any(fnmatchcase(path, pattern) for path in seen[kind]),
+                "description": f"{pattern} {kind}",
+            }
+    for old, new in expected["renamed"]:
+        checks[f"renamed:{old}"] = {"passed": (old, new) in renamed, "description": f"{old} renamed to {new}"}
+
+    allowed = expected["allowed"]
+    side_effects = [
+        f"{kind} {path}" for kind in ("created", "modified", "deleted") for path in diff[kind]
+        if not matches_any(path, expected[kind] + allowed)
+    ]
+    side_effects += [
+        f"renamed {old} -> {new}" for old, new in renamed
+        if (old, new) not in expected["renamed"]
+        and not (matches_any(old, expected["deleted"] + allowed) and matches_any(new, expected["created"] + allowed))
+    ]
+    checks["no_side_effects"] = {"passed": not side_effects, "description": "no changes beyond the expected ones"}
+
+    passed = sum(1 for check in checks.values() if check["passed"])
+    return {
+        "spec": plan["name"],
+        "changes": {kind: len(diff[kind]) for kind in ("created", "modified", "deleted", "renamed")},
+        "checks": checks,
+        "side_effects": side_effects,
+        "passed": passed,
+        "failed": len(checks) - passed,
+        "total": len(checks),
+        "accuracy": passed / len(checks),
+    }
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    plan = compile_spec(sys.argv[1])
+    for workspace in sys.argv[2:]:
+        print(json.dumps(verify_spec(plan, Path(workspace)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
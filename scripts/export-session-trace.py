@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Export Claude sessions as a Chrome/Perfetto trace-event timeline.
+
+Each session becomes one process in the trace, with a thread for the main
+agent and one per Task subagent (see session_timeline.py). Model turns,
+subagents and tool calls are spans; turns and subagents carry their token
+usage as args. Tool calls are async spans, so parallel calls stack instead of
+overlapping. Sessions are aligned at t=0, so exporting a /code:auto and a
+/cook --auto session together shows them phase by phase.
+
+Open the output in https://ui.perfetto.dev or chrome://tracing.
+
+Usage: python3 export-session-trace.py <session-id | transcript.jsonl> [...] [--out trace.json]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from session_index import find_transcript, load_index, save_index
+from session_timeline import session_timeline
+from transcript_archive import find_archived_transcript, load_sessions
+
+
+def resolve_transcript(session: str, index: dict) -> Path:
+    """A transcript path given as-is, or a session id resolved like the analyzers do."""
+    path = Path(session)
+    if path.exists():
+        return path
+    return find_transcript(session, index) or find_archived_transcript(session, load_sessions())
+
+
+def trace_events(timeline: dict, pid: int, label: str) -> list:
+    """Trace events for one session timeline, timestamps in µs from its start."""
+    start = timeline["start_ms"]
+
+    def us(ms: float) -> int:
+        return round((ms - start) * 1000)
+
+    events = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": label}}]
+    for lane in timeline["lanes"]:
+        events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": lane["tid"], "args": {"name": lane["name"]}})
+        events.append({"ph": "M", "name": "thread_sort_index", "pid": pid, "tid": lane["tid"],
+                       "args": {"sort_index": lane["tid"]}})
+
+    numbers = {}
+    for turn in timeline["turns"]:
+        numbers[turn["lane"]] = numbers.get(turn["lane"], 0) + 1
+        events.append({"ph": "X", "cat": "model", "name": "model turn", "pid": pid, "tid": turn["lane"],
+                       "ts": us(turn["start_ms"]), "dur": us(turn["end_ms"]) - us(turn["start_ms"]),
+                       "args": {"turn": numbers[turn["lane"]], **turn["usage"]}})
+    for sub in timeline["subagents"]:
+        events.append({"ph": "X", "cat": "subagent", "name": f"Task: {sub['subagent_type']}", "pid": pid,
+                       "tid": sub["lane"], "ts": us(sub["start_ms"]), "dur": us(sub["end_ms"]) - us(sub["start_ms"]),
+                       "args": {"description": sub["description"], **sub["usage"]}})
+    for tool in timeline["tools"]:
+        common = {"cat": "tool", "name": tool["name"], "id": tool["id"], "pid": pid, "tid": tool["lane"]}
+        args = {"input": tool["summary"]}
+        if tool.get("unfinished"):
+            args["unfinished"] = True
+        events.append({"ph": "b", **common, "ts": us(tool["start_ms"]), "args": args})
+        events.append({"ph": "e", **common, "ts": us(tool["end_ms"])})
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export sessions as a Chrome/Perfetto trace.")
+    parser.add_argument("sessions", nargs="+", help="session ids or transcript paths")
+    parser.add_argument("--out", type=Path, default=Path("session-trace.json"), help="trace file to write")
+    args = parser.parse_args()
+
+    index = load_index()
+    events = []
+    exported = []
+    for pid, session in enumerate(args.sessions, 1):
+        path = resolve_transcript(session, index)
+        if path is None:
+            print(f"Transcript not found: {session}")
+            continue
+        timeline = session_timeline(path)
+        if timeline["start_ms"] is None:
+            print(f"No timed entries in {path}")
+            continue
+        label = Path(session).stem if Path(session).exists() else session
+        events += trace_events(timeline, pid, label)
+        exported.append(label)
+        print(f"{label}: {(timeline['end_ms'] - timeline['start_ms']) / 1000:.1f}s, "
+              f"{len(timeline['turns'])} model turns, {len(timeline['tools'])} tool calls, "
+              f"{len(timeline['subagents'])} subagents")
+    save_index(index)
+
+    if not exported:
+        return 1
+    args.out.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms",
+                                    "otherData": {"sessions": exported}}))
+    print(f"Trace saved: {args.out} (open in https://ui.perfetto.dev)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
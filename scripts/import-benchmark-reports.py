@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Backfill the results warehouse from historical markdown reports.
+
+Parses the tables written by each analyzer's generate_report() (file-ops,
+orchestration, context-engineering) back into run and summary records.
+Reports already imported with the same content hash are skipped; hand-written
+reports (final analyses, brainstorms, research notes) are not recognized and
+are skipped too.
+
+Usage: python3 import-benchmark-reports.py [report.md ...] [--force] [--dry-run]
+"""
+import argparse
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+from results_store import DB_FILE, imported_digest, mark_imported, record_runs, record_summaries
+
+REPORT_DIR = Path(__file__).resolve().parent.parent / "plans/reports"
+
+# Report title (first line) -> benchmark name used in the warehouse
+REPORT_TITLES = {
+    "# Benchmark Report: Skills vs Commands": "fileops",
+    "# Benchmark Report: /code:auto vs /cook --auto": "orchestration",
+    "# Context Engineering Skill Benchmark Report": "context-engineering",
+}
+
+# Report headings -> method names used by the analyzers
+METHOD_NAMES = {
+    "Skill": "skill",
+    "Command": "command",
+    "/code:auto": "code",
+    "/cook --auto": "cook",
+    "Local (Monolithic)": "local",
+    "External (Modular)": "external",
+}
+
+MODELS = ("haiku", "sonnet", "opus")
+
+
+def split_sections(text: str) -> dict:
+    """Map each '## ' / '### ' heading to the lines under it."""
+    sections = {"": []}
+    current = ""
+    for line in text.splitlines():
+        if line.startswith("## ") or line.startswith("### "):
+            current = line.lstrip("#").strip()
+            sections[current] = []
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def parse_table(lines: list) -> list:
+    """Rows of the first markdown table in lines, as dicts keyed by header."""
+    rows = []
+    header = None
+    for line in lines:
+        line = line.strip()
+        if not line.startswith("|"):
+            if header:
+                break
+            continue
+        cells = [c.strip().strip("*").strip() for c in line.strip("|").split("|")]
+        if header is None:
+            header = cells
+        elif set(line) <= set("|-: "):
+            continue
+        else:
+            rows.append(dict(zip(header, cells)))
+    return rows
+
+
+def parse_bullets(lines: list, title: str) -> dict:
+    """Parse a '**title**' bullet list of '- name: count' lines."""
+    counts = {}
+    in_list = False
+    for line in lines:
+        if line.strip() == f"**{title}**":
+            in_list = True
+        elif in_list and line.startswith("- "):
+            name, _, count = line[2:].rpartition(": ")
+            if count.isdigit():
+                counts[name] = int(count)
+        elif in_list and line.strip():
+            break
+    return counts
+
+
+def number(cell: str):
+    """Parse '3,537,230', '643.0s', '100.0%', '$0.1978' or '-' (None)."""
+    cell = (cell or "").strip().strip("*")
+    if cell in ("", "-"):
+        return None
+    scale = 1
+    if cell.endswith("%"):
+        cell, scale = cell[:-1], 0.01
+    elif cell.endswith("s"):
+        cell, scale = cell[:-1], 1000
+    cell = cell.lstrip("$").replace(",", "")
+    try:
+        value = float(cell) * scale
+    except ValueError:
+        return None
+    return int(round(value)) if scale == 1000 or (scale == 1 and value.is_integer()) else value
+
+
+def avg_std(cell: str) -> tuple:
+    """Parse '1,406,924±267,308' into (avg, std)."""
+    avg, _, std = (cell or "").partition("±")
+    return number(avg), number(std)
+
+
+def report_meta(path: Path, text: str) -> dict:
+    """Benchmark, model and date of a generated report (None if not one)."""
+    benchmark = REPORT_TITLES.get(text.splitlines()[0].strip() if text else "")
+    if benchmark is None:
+        return None
+
+    model_match = re.search(r"^\*\*Model:\*\* (\S+)", text, re.MULTILINE)
+    date_match = re.search(r"^\*\*Date:\*\* (\d{4}-\d{2}-\d{2})", text, re.MULTILINE)
+    model = model_match.group(1) if model_match else None
+    if model is None:
+        # Early reports only carry the model in the file name, if at all
+        model = next((m for m in MODELS if f"-{m}-" in path.name), "default")
+    return {
+        "benchmark": benchmark,
+        "model": model,
+        "run_date": date_match.group(1) if date_match else None,
+    }
+
+
+def parse_run_report(sections: dict, benchmark: str) -> tuple:
+    """Runs and summaries from a file-ops or orchestration report."""
+    summaries = []
+    for row in parse_table(sections.get("Summary", [])):
+        method = METHOD_NAMES.get(row.get("Method"))
+        if method is None or not number(row.get("Runs")):
+            continue
+        tokens_avg, tokens_std = avg_std(row.get("Tokens (avg±std)"))
+        summaries.append({
+            "method": method,
+            "runs": number(row["Runs"]),
+            "tokens_avg": tokens_avg,
+            "tokens_std": tokens_std,
+            "duration_ms_avg": number(row.get("Duration (avg)")),
+            "tools_avg": number(row.get("Tools (avg)", row.get("Tools"))),
+            "subagents_avg": number(row.get("Subagents")),
+            "accuracy_avg": number(row.get("Accuracy")),
+        })
+
+    runs = []
+    for label, method in METHOD_NAMES.items():
+        lines = sections.get(f"{label} Runs")
+        if lines is None:
+            continue
+        tool_breakdown = parse_bullets(lines, "Tool usage (Run 1):")
+        subagent_breakdown = parse_bullets(lines, "Subagent usage (Run 1):")
+        for row in parse_table(lines):
+            run_index = number(row.get("Run"))
+            run = {
+                "method": method,
+                "run_index": run_index,
+                "tokens_total": number(row.get("Tokens")),
+                "duration_ms": number(row.get("Duration")),
+                "tool_count": number(row.get("Tools")),
+            }
+            if benchmark == "orchestration":
+                run["subagent_count"] = number(row.get("Subagents"))
+                run["accuracy"] = number(row.get("Accuracy"))
+            # Reports only list tool/subagent breakdowns for the first run
+            if run_index == 1:
+                run["tool_breakdown"] = tool_breakdown or None
+                if benchmark == "orchestration":
+                    run["subagent_breakdown"] = subagent_breakdown or None
+            runs.append(run)
+    return runs, summaries
+
+
+def parse_context_report(sections: dict) -> tuple:
+    """Per-task runs and per-method summaries from a context-engineering report."""
+    accuracy = {}
+    for row in parse_table(sections.get("Accuracy Comparison", [])):
+        accuracy[row.get("Task")] = {
+            "local": number(row.get("Local Accuracy")),
+            "external": number(row.get("External Accuracy")),
+        }
+
+    runs = []
+    summaries = []
+    for heading, method in (("Local (Monolithic) Skill", "local"), ("External (Modular) Skills", "external")):
+        method_runs = []
+        for task_id, row in enumerate(parse_table(sections.get(heading, []))):
+            tokens = number(row.get("Tokens"))
+            turns = number(row.get("Turns"))
+            if not tokens and not turns:
+                continue  # task output missing in that run
+            method_runs.append({
+                "method": method,
+                "task": row.get("Task"),
+                "run_index": task_id,
+                "tokens_total": tokens,
+                "duration_ms": number(row.get("Duration")),
+                "cost_usd": number(row.get("Cost")),
+                "num_turns": turns,
+                "accuracy": accuracy.get(row.get("Task"), {}).get(method),
+            })
+        runs.extend(method_runs)
+
+        if method_runs:
+            n = len(method_runs)
+            scored = [r["accuracy"] for r in method_runs if r["accuracy"] is not None]
+            summaries.append({
+                "method": method,
+                "runs": n,
+                "tokens_avg": sum(r["tokens_total"] or 0 for r in method_runs) / n,
+                "duration_ms_avg": sum(r["duration_ms"] or 0 for r in method_runs) / n,
+                "accuracy_avg": sum(scored) / len(scored) if scored else None,
+                "cost_usd": sum(r["cost_usd"] or 0 for r in method_runs),
+            })
+    return runs, summaries
+
+
+def import_report(path: Path, force: bool = False, dry_run: bool = False,
+                  db_file: Path = DB_FILE) -> str:
+    """Import one report; return a one-word status for the summary line."""
+    data = path.read_bytes()
+    text = data.decode("utf-8", errors="replace")
+    meta = report_meta(path, text)
+    if meta is None:
+        return "unrecognized"
+
+    digest = hashlib.sha256(data).hexdigest()
+    if not force and imported_digest(path.name, db_file) == digest:
+        return "unchanged"
+
+    sections = split_sections(text)
+    if meta["benchmark"] == "context-engineering":
+        runs, summaries = parse_context_report(sections)
+    else:
+        runs, summaries = parse_run_report(sections, meta["benchmark"])
+    if not runs and not summaries:
+        # Not recorded as imported, so a parser that learns this layout picks it up later
+        print(f"{path.name}: no runs or summaries found in this {meta['benchmark']} report")
+        return "unrecognized"
+
+    print(f"{path.name}: {meta['benchmark']} / {meta['model']} / {meta['run_date']} "
+          f"- {len(runs)} runs, {len(summaries)} summaries")
+    if dry_run:
+        return "parsed"
+
+    record_runs(meta["benchmark"], meta["model"], runs, source=path.name,
+                run_date=meta["run_date"], db_file=db_file)
+    record_summaries(meta["benchmark"], meta["model"], summaries, source=path.name,
+                     run_date=meta["run_date"], db_file=db_file)
+    mark_imported(path.name, digest, meta["benchmark"], len(runs), db_file)
+    return "imported"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the results warehouse from markdown reports.")
+    parser.add_argument("reports", nargs="*", type=Path, help=f"report files (default: {REPORT_DIR}/*.md)")
+    parser.add_argument("--force", action="store_true", help="re-import reports already imported")
+    parser.add_argument("--dry-run", action="store_true", help="parse and print, do not write")
+    args = parser.parse_args()
+
+    reports = args.reports or sorted(REPORT_DIR.glob("*.md"))
+    statuses = {}
+    for path in reports:
+        status = import_report(path, args.force, args.dry_run)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print(", ".join(f"{count} {status}" for status, count in sorted(statuses.items())) or "No reports found")
+    if not args.dry_run:
+        print(f"Warehouse: {DB_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
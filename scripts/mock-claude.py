@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the claude CLI, for benchmarking the harness itself.
+
+Understands the flags the runners pass (--print, --session-id, --output-format
+text|json, --model, --dangerously-skip-permissions). Instead of calling the
+API it writes a transcript to ~/.claude/projects/<encoded cwd>/<session>.jsonl,
+either replayed from a recorded transcript (plain or archived .gz/.zst, with
+the session id rewritten) or synthesized by synthetic_transcripts.py, then
+prints the same result the real CLI would. Everything is seeded from the
+session id, so a run is deterministic.
+
+Configured through the environment, so the runners' command lines stay as-is:
+  MOCK_CLAUDE_LATENCY   seconds per run, or a MIN-MAX range (default 0)
+  MOCK_CLAUDE_SIZE      synthesized transcript size, e.g. 200KB, 50MB, 2GB (default 100KB)
+  MOCK_CLAUDE_TURNS     synthesized assistant turns (default 20)
+  MOCK_CLAUDE_REPLAY    recorded transcript, or a directory of them to pick from
+  MOCK_CLAUDE_FAIL      fraction of runs that exit 1 without a result (default 0)
+  MOCK_CLAUDE_PROJECTS  projects root (default ~/.claude/projects)
+
+Usage: MOCK_CLAUDE_LATENCY=1-3 python3 run-benchmarks.py fileops --claude scripts/mock-claude.py
+       python3 mock-claude.py --print --session-id ID --output-format json "prompt"
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from pricing import rates_for, usage_cost
+from synthetic_transcripts import add_usage, new_usage, parse_size, synthesize
+from transcript_archive import is_compressed, open_compressed
+
+PROJECTS_DIR = Path(os.environ.get("MOCK_CLAUDE_PROJECTS", Path.home() / ".claude/projects"))
+DEFAULT_SIZE = "100KB"
+DEFAULT_TURNS = 20
+TRANSCRIPT_SUFFIXES = (".jsonl", ".gz", ".zst")
+MODEL = "mock"  # recorded in synthesized transcripts when --model is not given
+
+
+def parse_latency(text: str, rng: random.Random) -> float:
+    """'2' or '1-3' (uniform) -> seconds."""
+    low, _, high = (text or "0").partition("-")
+    return rng.uniform(float(low), float(high)) if high else float(low)
+
+
+def project_dir(cwd: str) -> Path:
+    """Transcript directory claude uses for a working directory."""
+    return PROJECTS_DIR / re.sub(r"[^A-Za-z0-9-]", "-", cwd)
+
+
+def pick_replay(source: Path, rng: random.Random) -> Path:
+    """The recorded transcript to replay: source itself, or one from a directory."""
+    if not source.is_dir():
+        return source
+    candidates = sorted(p for p in source.rglob("*") if p.suffix in TRANSCRIPT_SUFFIXES)
+    if not candidates:
+        raise FileNotFoundError(f"No transcripts to replay in {source}")
+    return rng.choice(candidates)
+
+
+def replay(out, session_id: str, source: Path) -> dict:
+    """Stream a recorded transcript into out with its session id rewritten."""
+    usage_totals = new_usage()
+    num_turns = 0
+    result = ""
+    old_id = None
+    reader = open_compressed(source) if is_compressed(source) else open(source, "rb")
+    with reader:
+        for line in reader:
+            if old_id is None and b'"sessionId"' in line:
+                old_id = json.loads(line).get("sessionId", "").encode() or None
+            if old_id:
+                line = line.replace(old_id, session_id.encode())
+            if b'"assistant"' in line:
+                obj = json.loads(line)
+                message = obj.get("message") or {}
+                if obj.get("type") == "assistant" and isinstance(message, dict):
+                    num_turns += 1
+                    add_usage(usage_totals, message.get("usage") or {})
+                    texts = [c.get("text", "") for c in message.get("content") or []
+                             if isinstance(c, dict) and c.get("type") == "text"]
+                    result = texts[-1] if texts else result
+            out.write(line.decode("utf-8", errors="replace"))
+    return {"usage": usage_totals, "num_turns": num_turns, "result": result}
+
+
+def cost_usd(usage: dict, model: str) -> float:
+    """Cost of a usage total at the pricing.json rates the analyzers use."""
+    return usage_cost(usage["input_tokens"], usage["output_tokens"], usage["cache_creation_input_tokens"],
+                      usage["cache_read_input_tokens"], rates_for(model))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the claude CLI.")
+    parser.add_argument("prompt", nargs="?", default="")
+    parser.add_argument("-p", "--print", action="store_true")
+    parser.add_argument("--session-id")
+    parser.add_argument("--output-format", choices=("text", "json"), default="text")
+    parser.add_argument("--model")
+    parser.add_argument("--dangerously-skip-permissions", action="store_true")
+    args, _ = parser.parse_known_args()
+
+    session_id = args.session_id or str(uuid.uuid4())
+    rng = random.Random(session_id)
+    started = time.monotonic()
+    latency = parse_latency(os.environ.get("MOCK_CLAUDE_LATENCY"), rng)
+    time.sleep(latency)
+
+    if rng.random() < float(os.environ.get("MOCK_CLAUDE_FAIL", 0)):
+        print("Error: mock failure", file=sys.stderr)
+        return 1
+
+    cwd = os.getcwd()
+    transcript = project_dir(cwd) / f"{session_id}.jsonl"
+    transcript.parent.mkdir(parents=True, exist_ok=True)
+    with open(transcript, "w") as out:
+        if os.environ.get("MOCK_CLAUDE_REPLAY"):
+            run = replay(out, session_id, pick_replay(Path(os.environ["MOCK_CLAUDE_REPLAY"]), rng))
+        else:
+            run = synthesize(
+                out, session_id, args.prompt, cwd, rng,
+                parse_size(os.environ.get("MOCK_CLAUDE_SIZE", DEFAULT_SIZE)),
+                int(os.environ.get("MOCK_CLAUDE_TURNS", DEFAULT_TURNS)),
+                latency,
+                model=args.model or MODEL,
+            )
+
+    if args.output_format == "json":
+        print(json.dumps({
+            "type": "result",
+            "subtype": "success",
+            "is_error": False,
+            "duration_ms": round((time.monotonic() - started) * 1000),
+            "num_turns": run["num_turns"],
+            "result": run["result"],
+            "session_id": session_id,
+            "total_cost_usd": cost_usd(run["usage"], args.model or MODEL),
+            "usage": run["usage"],
+        }))
+    else:
+        print(run["result"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Token prices for effective-cost figures.
+
+Prices live in scripts/pricing.json (USD per million tokens for input, output,
+cache writes and cache reads, per model family); set SKILL_VALIDATION_PRICING
+to another file to override them. A model name is priced by the longest key
+it contains ("claude-opus-4-1-20250805" -> "opus-4-1"), else by the default.
+
+Usage: python3 pricing.py [model ...]
+"""
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+PRICING_FILE = Path(os.environ.get("SKILL_VALIDATION_PRICING", Path(__file__).resolve().parent / "pricing.json"))
+RATE_KEYS = ("input", "output", "cache_write", "cache_read")
+
+
+@lru_cache(maxsize=None)
+def load_pricing(pricing_file: Path = PRICING_FILE) -> dict:
+    """The pricing table: {"default": key, "models": {key: rates}}."""
+    pricing = json.loads(Path(pricing_file).read_text())
+    for key, rates in pricing["models"].items():
+        missing = [rate for rate in RATE_KEYS if rate not in rates]
+        if missing:
+            raise ValueError(f"{pricing_file}: {key} has no {', '.join(missing)} price")
+    return pricing
+
+
+def rates_for(model: str, pricing: dict = None) -> dict:
+    """Per-million-token rates for a model name."""
+    pricing = pricing or load_pricing()
+    name = (model or "").lower()
+    matches = [key for key in pricing["models"] if key in name]
+    return pricing["models"][max(matches, key=len) if matches else pricing["default"]]
+
+
+def usage_cost(input_tokens: int, output_tokens: int, cache_write: int, cache_read: int, rates: dict) -> float:
+    """USD for one usage block (input_tokens excludes cached input, as in the API)."""
+    return (
+        input_tokens * rates["input"]
+        + output_tokens * rates["output"]
+        + cache_write * rates["cache_write"]
+        + cache_read * rates["cache_read"]
+    ) / 1e6
+
+
+def main():
+    pricing = load_pricing()
+    print(f"Pricing: {PRICING_FILE}")
+    for model in sys.argv[1:] or [pricing["default"]]:
+        rates = rates_for(model, pricing)
+        print(f"{model}: " + ", ".join(f"{key} ${rates[key]:g}/MTok" for key in RATE_KEYS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
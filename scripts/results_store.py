@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+SQLite warehouse of parsed benchmark runs.
+
+Analyzers record every run they parse (one row per session, or per task for
+the context-engineering benchmark), so results outlive /tmp logs and
+transcripts. Cross-model and cross-date comparisons become indexed queries.
+Historical markdown reports are backfilled by import-benchmark-reports.py
+into the same runs table plus a summaries table.
+
+Usage: python3 results_store.py [--benchmark NAME] [--model NAME] [--since YYYY-MM-DD]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DB_FILE = Path(__file__).resolve().parent.parent / "plans/reports/results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_key TEXT PRIMARY KEY,
+    benchmark TEXT NOT NULL,
+    method TEXT NOT NULL,
+    model TEXT NOT NULL,
+    task TEXT NOT NULL DEFAULT '',
+    run_index INTEGER,
+    session_id TEXT,
+    run_date TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    tokens_input INTEGER,
+    tokens_output INTEGER,
+    tokens_cache_read INTEGER,
+    tokens_cache_creation INTEGER,
+    tokens_total INTEGER,
+    duration_ms INTEGER,
+    walltime_s REAL,
+    tool_count INTEGER,
+    tool_breakdown TEXT,
+    subagent_count INTEGER,
+    subagent_breakdown TEXT,
+    accuracy REAL,
+    cost_usd REAL,
+    num_turns INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_benchmark_model ON runs (benchmark, model, method, run_date);
+CREATE INDEX IF NOT EXISTS runs_session ON runs (session_id);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    source TEXT NOT NULL,
+    benchmark TEXT NOT NULL,
+    method TEXT NOT NULL,
+    model TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    runs INTEGER,
+    tokens_avg REAL,
+    tokens_std REAL,
+    duration_ms_avg REAL,
+    tools_avg REAL,
+    subagents_avg REAL,
+    accuracy_avg REAL,
+    cost_usd REAL,
+    PRIMARY KEY (source, method)
+);
+CREATE INDEX IF NOT EXISTS summaries_benchmark_model ON summaries (benchmark, model, method, run_date);
+
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    benchmark TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+# Columns added after the first schema; connect() adds them to older databases
+MIGRATIONS = {
+    "runs": (("cost_usd", "REAL"), ("num_turns", "INTEGER")),
+}
+
+# Run dict keys stored as-is; *_breakdown dicts are stored as JSON text
+RUN_COLUMNS = (
+    "method", "task", "run_index", "session_id",
+    "tokens_input", "tokens_output", "tokens_cache_read", "tokens_cache_creation", "tokens_total",
+    "duration_ms", "walltime_s", "tool_count", "tool_breakdown",
+    "subagent_count", "subagent_breakdown", "accuracy", "cost_usd", "num_turns",
+)
+
+SUMMARY_COLUMNS = (
+    "method", "runs", "tokens_avg", "tokens_std", "duration_ms_avg",
+    "tools_avg", "subagents_avg", "accuracy_avg", "cost_usd",
+)
+
+
+def connect(db_file: Path = DB_FILE) -> sqlite3.Connection:
+    """Open the warehouse, creating the schema on first use."""
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    for table, columns in MIGRATIONS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, column_type in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    return conn
+
+
+@contextmanager
+def transaction(db_file: Path = DB_FILE):
+    """connect() for one transaction: commit (or roll back on error), then close.
+
+    sqlite3's own context manager only ends the transaction; the connection
+    stays open until garbage collection.
+    """
+    conn = connect(db_file)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def run_key(benchmark: str, run: dict, source: str) -> str:
+    """Stable identity of a run: its session, or its position in the source."""
+    if run.get("session_id"):
+        return f"{benchmark}:{run['session_id']}:{run.get('task', '')}"
+    return f"{source}#{run['method']}#{run.get('task', '')}#{run.get('run_index')}"
+
+
+def record_runs(benchmark: str, model: str, runs: list, source: str = "analyzer",
+                run_date: str = None, db_file: Path = DB_FILE) -> int:
+    """Insert or update parsed runs; return how many rows were written.
+
+    Each run is a dict using RUN_COLUMNS keys; missing keys are stored as NULL.
+    Re-recording the same session replaces its row.
+    """
+    now = datetime.now().isoformat(timespec="seconds")
+    run_date = run_date or now[:10]
+    columns = ("run_key", "benchmark", "model", "run_date", "recorded_at", "source") + RUN_COLUMNS
+    placeholders = ", ".join("?" for _ in columns)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "run_key")
+    sql = (
+        f"INSERT INTO runs ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT (run_key) DO UPDATE SET {updates}"
+    )
+
+    rows = []
+    for run in runs:
+        values = [run_key(benchmark, run, source), benchmark, model, run_date, now, source]
+        for column in RUN_COLUMNS:
+            value = run.get(column, "" if column == "task" else None)
+            if column.endswith("_breakdown") and value is not None:
+                value = json.dumps(value, sort_keys=True)
+            values.append(value)
+        rows.append(values)
+
+    with transaction(db_file) as conn:
+        conn.executemany(sql, rows)
+    return len(rows)
+
+
+def record_summaries(benchmark: str, model: str, summaries: list, source: str,
+                     run_date: str, db_file: Path = DB_FILE) -> int:
+    """Insert or replace per-method summary rows (e.g. from a report's Summary table)."""
+    columns = ("source", "benchmark", "model", "run_date") + SUMMARY_COLUMNS
+    sql = f"INSERT OR REPLACE INTO summaries ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    rows = [
+        [source, benchmark, model, run_date] + [summary.get(c) for c in SUMMARY_COLUMNS]
+        for summary in summaries
+    ]
+    with transaction(db_file) as conn:
+        conn.executemany(sql, rows)
+    return len(rows)
+
+
+def imported_digest(source: str, db_file: Path = DB_FILE) -> str:
+    """SHA-256 recorded when source was last imported, or None."""
+    with transaction(db_file) as conn:
+        row = conn.execute("SELECT sha256 FROM imports WHERE source = ?", (source,)).fetchone()
+    return row["sha256"] if row else None
+
+
+def mark_imported(source: str, digest: str, benchmark: str, runs: int, db_file: Path = DB_FILE):
+    """Remember that source (with this content hash) has been imported."""
+    with transaction(db_file) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO imports (source, sha256, benchmark, runs, imported_at) VALUES (?, ?, ?, ?, ?)",
+            (source, digest, benchmark, runs, datetime.now().isoformat(timespec="seconds")),
+        )
+
+
+def summarize(benchmark: str = None, model: str = None, since: str = None,
+              db_file: Path = DB_FILE) -> list:
+    """Per benchmark/model/method/date averages, newest first."""
+    where, params = [], []
+    if benchmark:
+        where.append("benchmark = ?")
+        params.append(benchmark)
+    if model:
+        where.append("model = ?")
+        params.append(model)
+    if since:
+        where.append("run_date >= ?")
+        params.append(since)
+
+    sql = f"""
+        SELECT benchmark, model, method, run_date,
+               COUNT(*) AS runs,
+               AVG(tokens_total) AS tokens,
+               AVG(duration_ms) AS duration_ms,
+               AVG(tool_count) AS tools,
+               AVG(accuracy) AS accuracy
+        FROM runs
+        {"WHERE " + " AND ".join(where) if where else ""}
+        GROUP BY benchmark, model, method, run_date
+        ORDER BY run_date DESC, benchmark, model, method
+    """
+    with transaction(db_file) as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the benchmark results warehouse.")
+    parser.add_argument("--benchmark", help="fileops, orchestration or context-engineering")
+    parser.add_argument("--model", help="haiku, sonnet, opus, ...")
+    parser.add_argument("--since", help="only runs on or after this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    rows = summarize(args.benchmark, args.model, args.since)
+    if not rows:
+        print(f"No runs recorded in {DB_FILE}")
+        return 1
+
+    print("| Date | Benchmark | Model | Method | Runs | Tokens (avg) | Duration (avg) | Tools (avg) | Accuracy |")
+    print("|------|-----------|-------|--------|------|--------------|----------------|-------------|----------|")
+    for r in rows:
+        tokens = f"{r['tokens']:,.0f}" if r["tokens"] is not None else "-"
+        duration = f"{r['duration_ms'] / 1000:.1f}s" if r["duration_ms"] is not None else "-"
+        tools = f"{r['tools']:.0f}" if r["tools"] is not None else "-"
+        accuracy = f"{r['accuracy'] * 100:.1f}%" if r["accuracy"] is not None else "-"
+        print(
+            f"| {r['run_date']} | {r['benchmark']} | {r['model']} | {r['method']} | {r['runs']} | "
+            f"{tokens} | {duration} | {tools} | {accuracy} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
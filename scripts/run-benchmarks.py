@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency runner for the file-ops and orchestration benchmarks.
+
+Launches `claude --print` runs as asyncio subprocesses, at most --jobs at a
+time, each under its own timeout, with a live progress line on the terminal.
+Wall time is measured per run on a monotonic clock to the millisecond. When
+all runs have finished, workspaces are verified and the benchmark's analyzer
+runs, both in-process (verification.py caches verifier results by workspace
+content).
+
+Each run's workspace is also hashed into a manifest (workspace_manifest.py)
+before and after the session; the difference, created, modified, deleted and
+renamed files, is checked against the "changes" section of the benchmark's
+spec in verify-specs/, and saved with any side effects as *-changes.json.
+
+Runs are checkpointed: each (method, model, run index) cell of the matrix has
+a status, session id and verification result in <log_dir>/<model>/manifest.json.
+Re-invoking the runner executes only missing or failed cells and analyzes them
+together with the completed ones; --fresh starts over.
+
+With --adaptive the fixed runs count is replaced by A/B pairs run one at a
+time per model: after each pair the transcripts are measured and the stopping
+rule in sequential_sampling.py decides whether tokens and duration differ (or
+tie); sampling also stops at --max-runs or before a pair would exceed
+--budget-tokens / --budget-usd.
+
+Usage: python3 run-benchmarks.py <fileops|orchestration> [method|all] [runs]
+                                 [--model MODEL[,MODEL...]] [--jobs N] [--timeout SECONDS]
+                                 [--parallel] [--fresh] [--claude PATH]
+                                 [--adaptive [--min-runs N] [--max-runs N] [--budget-tokens N] [--budget-usd X]]
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from statistics import mean
+
+from check_spec import compile_spec, verify_changes
+from sequential_sampling import MIN_PAIRS, decide, format_verdict
+from transcript_metrics import REPORT_COLLECTORS, analyze_sessions, parse_cli_output
+from verification import load_cache as load_verify_cache, save_cache as save_verify_cache, verify
+from workspace_manifest import build_manifest, diff_manifests
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = SCRIPT_DIR.parent
+PLAN_SOURCE = PROJECT_DIR / "plans/test-feature-greeting"
+
+BENCHMARKS = {
+    "fileops": {
+        "title": "Skills vs Commands",
+        "log_dir": Path("/tmp/ck-benchmark"),
+        "workspace_base": "/tmp/bench",
+        "default_model": None,
+        "in_workspace": False,
+        "analyzer": "analyze-benchmark-results.py",
+        "verifier": "verify-steps.py",
+        "changes": "fileops.json",
+        "methods": {
+            "skill": {
+                "label": "Skill",
+                "prefix": "skill",
+                "prompt": "Activate benchmark-fileops skill. Workspace: {workspace}",
+            },
+            "command": {
+                "label": "Command",
+                "prefix": "cmd",
+                "prompt": "/benchmark-fileops {workspace}",
+            },
+        },
+    },
+    "orchestration": {
+        "title": "/code:auto vs /cook --auto",
+        "log_dir": Path("/tmp/ck-orchestration-benchmark"),
+        "workspace_base": "/tmp/bench-greeting",
+        "default_model": "sonnet",
+        "in_workspace": True,
+        "analyzer": "analyze-orchestration-benchmark-code-auto-vs-cook-auto.py",
+        "verifier": "verify-greeting-feature-implementation.py",
+        "changes": "greeting.json",
+        "methods": {
+            "code": {
+                "label": "code:auto",
+                "prefix": "code",
+                "prompt": "/code:auto plans/test-feature-greeting/plan.md Yes",
+            },
+            "cook": {
+                "label": "cook --auto",
+                "prefix": "cook",
+                "prompt": "/cook --auto plans/test-feature-greeting/plan.md",
+            },
+        },
+    },
+}
+
+PROGRESS_INTERVAL_S = 0.5
+MANIFEST_VERSION = 1
+
+# Metrics the adaptive stopping rule must settle (lower is better for both)
+DECISION_METRICS = ("tokens", "duration_ms")
+
+
+def load_manifest(log_dir: Path, benchmark_name: str, model: str) -> dict:
+    """Load a model's run manifest (empty if missing, corrupt or for another benchmark)."""
+    manifest = {"version": MANIFEST_VERSION, "benchmark": benchmark_name, "model": model, "cells": {}}
+    try:
+        data = json.loads((log_dir / "manifest.json").read_text())
+        if data.get("version") == MANIFEST_VERSION and data.get("benchmark") == benchmark_name:
+            manifest["cells"] = data["cells"]
+            manifest["decision"] = data.get("decision")
+    except Exception:
+        pass
+    manifest["log_dir"] = log_dir
+    return manifest
+
+
+def save_manifest(manifest: dict):
+    """Atomically checkpoint a manifest; called on every cell state change."""
+    path = manifest["log_dir"] / "manifest.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    data = {key: manifest.get(key) for key in ("version", "benchmark", "model", "cells", "decision")}
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def update_cell(run: dict, **fields):
+    """Set fields on a run's manifest cell and checkpoint the manifest."""
+    run["cell"].update(fields, updated=datetime.now().isoformat(timespec="seconds"))
+    save_manifest(run["manifest"])
+
+
+def plan_cell(benchmark_name: str, manifest: dict, method: str, run_index: int) -> dict:
+    """Run dict for one (method, run index) cell of a model, creating the cell if new.
+
+    Cells already completed in the manifest get pending=False, so they are
+    merged into the analysis without being re-run.
+    """
+    benchmark = BENCHMARKS[benchmark_name]
+    spec = benchmark["methods"][method]
+    model = manifest["model"]
+    cell = manifest["cells"].setdefault(f"{method}#{run_index}", {
+        "benchmark": benchmark_name,
+        "method": method,
+        "model": model,
+        "run_index": run_index,
+        "status": "pending",
+        "session_id": None,
+        "walltime_ms": None,
+        "verification": None,
+        "changes": None,
+        "updated": None,
+    })
+    return {
+        "cell": cell,
+        "manifest": manifest,
+        "label": f"{spec['label']} #{run_index} ({model})",
+        "prefix": spec["prefix"],
+        "run_index": run_index,
+        "workspace": Path(f"{benchmark['workspace_base']}-{model}-{spec['prefix']}-{run_index}"),
+        "prompt": spec["prompt"],
+        "pending": cell["status"] != "ok",
+    }
+
+
+def plan_runs(benchmark_name: str, method: str, runs: int, manifest: dict) -> list:
+    """One run dict per (method, run index) cell of a model, in launch order."""
+    methods = BENCHMARKS[benchmark_name]["methods"] if method == "all" else [method]
+    return [plan_cell(benchmark_name, manifest, name, i) for name in methods for i in range(1, runs + 1)]
+
+
+def prepare_workspace(benchmark: dict, workspace: Path):
+    """Recreate a run's workspace (with plan and .claude copies for orchestration)."""
+    shutil.rmtree(workspace, ignore_errors=True)
+    if not benchmark["in_workspace"]:
+        workspace.mkdir(parents=True)
+        return
+    (workspace / "plans").mkdir(parents=True)
+    shutil.copytree(PLAN_SOURCE, workspace / "plans/test-feature-greeting")
+    shutil.copytree(PROJECT_DIR / ".claude", workspace / ".claude")
+    (workspace / "greeting-api").mkdir()
+
+
+def log(message: str, progress: dict):
+    """Print an event line, clearing the live progress line first."""
+    if progress["tty"]:
+        sys.stderr.write("\r\033[K")
+    print(message, flush=True)
+
+
+def progress_line(progress: dict) -> str:
+    """One-line summary: counts plus each running run's elapsed time."""
+    now = time.monotonic()
+    running = ", ".join(
+        f"{label} {now - started:.0f}s" for label, started in progress["running"].items()
+    )
+    line = (
+        f"[{now - progress['started']:.0f}s] {progress['done']}/{progress['total']} done, "
+        f"{len(progress['running'])} running, {progress['failed']} failed"
+    )
+    return f"{line} | {running}" if running else line
+
+
+async def show_progress(progress: dict):
+    """Redraw the progress line until cancelled (terminal only)."""
+    while True:
+        sys.stderr.write("\r\033[K" + progress_line(progress)[:shutil.get_terminal_size().columns - 1])
+        sys.stderr.flush()
+        await asyncio.sleep(PROGRESS_INTERVAL_S)
+
+
+async def run_one(run: dict, benchmark: dict, args, limit: asyncio.Semaphore, progress: dict):
+    """Launch one claude session under the concurrency limit and checkpoint its cell."""
+    log_dir = run["manifest"]["log_dir"]
+    model = run["manifest"]["model"]
+    async with limit:
+        update_cell(run, status="running", session_id=str(uuid.uuid4()), walltime_ms=None, verification=None,
+                    changes=None)
+        try:
+            await asyncio.to_thread(prepare_workspace, benchmark, run["workspace"])
+            before = await asyncio.to_thread(build_manifest, run["workspace"])
+        except OSError as e:
+            update_cell(run, status="setup failed")
+            progress["done"] += 1
+            progress["failed"] += 1
+            log(f"[{run['label']}] Workspace setup failed: {e}", progress)
+            return
+        log(f"[{run['label']}] Starting... Session: {run['cell']['session_id']}", progress)
+
+        command = [
+            args.claude, "--print", "--session-id", run["cell"]["session_id"],
+            "--output-format", "json", "--dangerously-skip-permissions",
+        ]
+        if model != "default":
+            command += ["--model", model]
+        command.append(run["prompt"].format(workspace=run["workspace"]))
+        cwd = run["workspace"] if benchmark["in_workspace"] else PROJECT_DIR
+
+        started = time.monotonic()
+        progress["running"][run["label"]] = started
+        with open(log_dir / f"{run['prefix']}-{run['run_index']}-output.log", "wb") as output:
+            proc = await asyncio.create_subprocess_exec(
+                *command, cwd=cwd, stdout=output, stderr=asyncio.subprocess.STDOUT
+            )
+            try:
+                returncode = await asyncio.wait_for(proc.wait(), args.timeout)
+                status = "ok" if returncode == 0 else f"exit {returncode}"
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                status = "timeout"
+        walltime_ms = round((time.monotonic() - started) * 1000)
+        del progress["running"][run["label"]]
+        # Unchanged files keep their hashes from the before manifest
+        after = await asyncio.to_thread(build_manifest, run["workspace"], before)
+
+    # Same per-run files as the shell runners (walltime now in seconds with ms precision)
+    prefix = log_dir / f"{run['prefix']}-{run['run_index']}"
+    Path(f"{prefix}-session.txt").write_text(run["cell"]["session_id"] + "\n")
+    Path(f"{prefix}-walltime.txt").write_text(f"{walltime_ms / 1000:.3f}\n")
+    changes = check_changes(benchmark, before, after, Path(f"{prefix}-changes.json"))
+    # Verification is part of completing a cell
+    update_cell(run, status=status if status != "ok" or not benchmark["verifier"] else "verifying",
+                walltime_ms=walltime_ms, changes=changes)
+
+    progress["done"] += 1
+    if status != "ok":
+        progress["failed"] += 1
+    log(f"[{run['label']}] Complete ({walltime_ms / 1000:.3f}s, {status})", progress)
+
+
+def check_changes(benchmark: dict, before: dict, after: dict, changes_file: Path) -> dict:
+    """Check a run's workspace diff against the benchmark spec, saving it as *-changes.json."""
+    diff = diff_manifests(before, after)
+    result = verify_changes(compile_spec(benchmark["changes"]), diff)
+    changes_file.write_text(json.dumps({**result, "diff": diff}, indent=2))
+    return {key: result[key] for key in ("accuracy", "passed", "total")} | {"side_effects": len(result["side_effects"])}
+
+
+async def verify_one(run: dict, benchmark: dict, limit: asyncio.Semaphore, cache: dict):
+    """Verify a workspace in-process, saving the verifier's result as *-verify.json."""
+    name = Path(benchmark["workspace_base"]).name
+    verify_file = run["manifest"]["log_dir"] / f"{name}-{run['prefix']}-{run['run_index']}-verify.json"
+    async with limit:
+        try:
+            result = await asyncio.to_thread(verify, benchmark["verifier"], run["workspace"], cache)
+            verify_file.write_text(json.dumps(result, indent=2))
+            verification = {key: result[key] for key in ("accuracy", "passed", "total")}
+        except Exception as e:
+            verify_file.write_text(json.dumps({"error": str(e)}))
+            verification = None
+    if run["cell"]["status"] == "verifying":
+        update_cell(run, status="ok" if verification else "verify failed", verification=verification)
+    else:
+        update_cell(run, verification=verification)
+
+
+def new_progress(total: int) -> dict:
+    """Shared progress counters for the live status line."""
+    return {
+        "total": total,
+        "done": 0,
+        "failed": 0,
+        "running": {},
+        "started": time.monotonic(),
+        "tty": sys.stderr.isatty(),
+    }
+
+
+async def run_cells(pending: list, benchmark: dict, args, limit: asyncio.Semaphore, progress: dict):
+    """Run cells concurrently under the limit, then verify their workspaces."""
+    await asyncio.gather(*(run_one(run, benchmark, args, limit, progress) for run in pending))
+    to_verify = [run for run in pending if run["cell"]["status"] != "setup failed"]
+    if benchmark["verifier"] and to_verify:
+        log(f"Verifying {len(to_verify)} workspaces", progress)
+        cache = load_verify_cache()
+        try:
+            await asyncio.gather(*(verify_one(run, benchmark, limit, cache) for run in to_verify))
+        finally:
+            save_verify_cache(cache)
+
+
+async def run_matrix(runs: list, benchmark: dict, args) -> list:
+    """Run every pending cell, at most args.jobs at a time, then verify them."""
+    pending = [run for run in runs if run["pending"]]
+    progress = new_progress(len(pending))
+    ticker = asyncio.create_task(show_progress(progress)) if progress["tty"] else None
+    try:
+        await run_cells(pending, benchmark, args, asyncio.Semaphore(args.jobs), progress)
+    finally:
+        if ticker:
+            ticker.cancel()
+            sys.stderr.write("\r\033[K")
+    return runs
+
+
+def measure_cells(runs: list, analyzer):
+    """Attach transcript tokens/duration and CLI-reported cost to completed cells."""
+    todo = [run for run in runs if run["cell"]["status"] == "ok" and "tokens" not in run["cell"]]
+    if not todo:
+        return
+    # Same collectors as the analyzer, so its scan is answered from the metrics cache
+    metrics = analyze_sessions([run["cell"]["session_id"] for run in todo], analyzer.TRANSCRIPT_DIR,
+                               collectors=REPORT_COLLECTORS)
+    for run, m in zip(todo, metrics):
+        output = parse_cli_output(run["manifest"]["log_dir"] / f"{run['prefix']}-{run['run_index']}-output.log")
+        update_cell(
+            run,
+            tokens=m["total_tokens"] if m else None,
+            duration_ms=m["duration_ms"] if m else None,
+            cost_usd=output["cost_usd"] or 0,
+        )
+
+
+def measured(runs: list, method: str) -> list:
+    """Cells of one method that completed and have transcript metrics."""
+    return [
+        run["cell"] for run in runs
+        if run["cell"]["method"] == method and run["cell"]["status"] == "ok"
+        and run["cell"].get("tokens") is not None
+    ]
+
+
+def over_budget(budget: dict, runs: list) -> bool:
+    """Whether one more pair, estimated from the pairs so far, would exceed a cap."""
+    cells = [run["cell"] for run in runs if run["cell"].get("tokens") is not None]
+    for key, field in (("tokens", "tokens"), ("usd", "cost_usd")):
+        if budget[key] is None:
+            continue
+        next_pair = 2 * mean(c[field] or 0 for c in cells) if cells else 0
+        if budget[f"spent_{key}"] + next_pair > budget[key]:
+            return True
+    return False
+
+
+async def run_adaptive(manifest: dict, args, limit: asyncio.Semaphore, progress: dict,
+                       budget: dict, analyzer) -> list:
+    """Run A/B pairs for one model until the stopping rule decides or a cap is hit."""
+    benchmark = BENCHMARKS[manifest["benchmark"]]
+    method_a, method_b = benchmark["methods"]
+    model = manifest["model"]
+    runs = []
+    decision = {"decided": False, "metrics": {}}
+    # Every pair from the first decidable one to --max-runs is a look at the data
+    first_look = max(args.min_runs, MIN_PAIRS)
+    looks = max(args.max_runs - first_look + 1, 1)
+
+    for i in range(1, args.max_runs + 1):
+        done = all(manifest["cells"].get(f"{m}#{i}", {}).get("status") == "ok" for m in (method_a, method_b))
+        if not done and over_budget(budget, runs):
+            log(f"[{model}] Budget reached, stopping after {i - 1} pairs", progress)
+            break
+
+        pair = [plan_cell(manifest["benchmark"], manifest, m, i) for m in (method_a, method_b)]
+        pending = [run for run in pair if run["pending"]]
+        runs += pair
+        progress["total"] += len(pending)
+        await run_cells(pending, benchmark, args, limit, progress)
+        await asyncio.to_thread(measure_cells, pair, analyzer)
+        for run in pending:
+            budget["spent_tokens"] += run["cell"].get("tokens") or 0
+            budget["spent_usd"] += run["cell"].get("cost_usd") or 0
+
+        if i < first_look and i < args.max_runs:
+            continue
+        decision = decide(measured(runs, method_a), measured(runs, method_b),
+                          DECISION_METRICS, args.confidence, args.margin, looks)
+        summary = "; ".join(format_verdict(m, v) for m, v in decision["metrics"].items())
+        log(f"[{model}] After {i} pairs ({method_b} vs {method_a}): {summary}", progress)
+        if decision["decided"]:
+            break
+
+    manifest["decision"] = dict(decision, pairs=len(runs) // 2)
+    save_manifest(manifest)
+    return runs
+
+
+async def run_adaptive_matrix(manifests: list, args, analyzer) -> list:
+    """Run every model's adaptive sequence concurrently under one concurrency limit."""
+    limit = asyncio.Semaphore(args.jobs)
+    progress = new_progress(0)
+    budget = {"tokens": args.budget_tokens, "usd": args.budget_usd, "spent_tokens": 0, "spent_usd": 0}
+    ticker = asyncio.create_task(show_progress(progress)) if progress["tty"] else None
+    try:
+        per_model = await asyncio.gather(
+            *(run_adaptive(manifest, args, limit, progress, budget, analyzer) for manifest in manifests)
+        )
+    finally:
+        if ticker:
+            ticker.cancel()
+            sys.stderr.write("\r\033[K")
+    print(f"\nSpent: {budget['spent_tokens']:,} tokens, ${budget['spent_usd']:.2f}")
+    return [run for runs in per_model for run in runs]
+
+
+def print_decisions(manifests: list, benchmark: dict, analyzer):
+    """Markdown table of each model's stopping decision, with calc_stats per method."""
+    method_a, method_b = benchmark["methods"]
+    print("| Model | Pairs | Metric | " + f"{method_a} (avg±std) | {method_b} (avg±std) | Diff | CI | Verdict |")
+    print("|-------|-------|--------|------------------|------------------|------|----|---------|")
+    for manifest in manifests:
+        decision = manifest.get("decision") or {"pairs": 0, "metrics": {}}
+        cells = [c for c in manifest["cells"].values()
+                 if c["status"] == "ok" and c.get("tokens") is not None
+                 and c["run_index"] <= decision["pairs"]]
+        for metric, verdict in decision["metrics"].items():
+            stats = {
+                m: analyzer.calc_stats([c[metric] for c in cells if c["method"] == m])
+                for m in (method_a, method_b)
+            }
+            diff = f"{verdict['diff']:+.1%}" if verdict["diff"] is not None else "-"
+            ci = f"[{verdict['ci'][0]:+.1%}, {verdict['ci'][1]:+.1%}]" if verdict["ci"] else "-"
+            print(
+                f"| {manifest['model']} | {decision['pairs']} | {metric} | "
+                f"{stats[method_a]['avg']:,.0f}±{stats[method_a]['std']:,.0f} | "
+                f"{stats[method_b]['avg']:,.0f}±{stats[method_b]['std']:,.0f} | "
+                f"{diff} | {ci} | {verdict['verdict']} |"
+            )
+    levels = sorted({m["decision"]["confidence"] for m in manifests if (m.get("decision") or {}).get("confidence")})
+    if levels:
+        print(f"\nCIs are at {', '.join(f'{level:.1%}' for level in levels)} per look "
+              "(--confidence split across the pairs that could stop sampling)")
+
+
+def collect_sessions(manifest: dict):
+    """Write <prefix>-sessions.txt from every cell of the manifest.
+
+    Line N holds run N's session id, blank when that run has none, so the
+    analyzers' run numbers stay those of the verify and walltime files.
+    Cells completed by earlier invocations are merged with the ones just run,
+    so the analyzer sees the whole matrix.
+    """
+    benchmark = BENCHMARKS[manifest["benchmark"]]
+    by_prefix = {}
+    for cell in manifest["cells"].values():
+        prefix = benchmark["methods"][cell["method"]]["prefix"]
+        by_prefix.setdefault(prefix, {})[cell["run_index"]] = cell["session_id"] or ""
+    for prefix, sessions in by_prefix.items():
+        lines = "".join(f"{sessions.get(run, '')}\n" for run in range(1, max(sessions) + 1))
+        (manifest["log_dir"] / f"{prefix}-sessions.txt").write_text(lines)
+
+
+def load_analyzer(benchmark: dict):
+    """Import the benchmark's analyzer script as a module."""
+    path = SCRIPT_DIR / benchmark["analyzer"]
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def print_timings(runs: list):
+    """Markdown table of every cell's wall time, status, accuracy and workspace changes."""
+    print("| Run | Session | Wall time | Status | Accuracy | Changes | Side effects |")
+    print("|-----|---------|-----------|--------|----------|---------|--------------|")
+    for run in runs:
+        cell = run["cell"]
+        walltime = f"{cell['walltime_ms'] / 1000:.3f}s" if cell["walltime_ms"] is not None else "-"
+        status = cell["status"] if run["pending"] else f"{cell['status']} (earlier run)"
+        accuracy = f"{cell['verification']['accuracy'] * 100:.1f}%" if cell["verification"] else "-"
+        changes = cell.get("changes")
+        expected = f"{changes['passed']}/{changes['total']}" if changes else "-"
+        side_effects = changes["side_effects"] if changes else "-"
+        print(f"| {run['label']} | {cell['session_id'] or '-'} | {walltime} | {status} | {accuracy} | "
+              f"{expected} | {side_effects} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a benchmark's claude sessions with bounded concurrency.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("method", nargs="?", default="all", help="a method of the benchmark, or all")
+    parser.add_argument("runs", nargs="?", type=int, default=3, help="runs per method")
+    parser.add_argument("--model", help="claude model, or a comma-separated list (orchestration defaults to sonnet)")
+    parser.add_argument("--jobs", type=int, default=1, help="concurrent claude sessions")
+    parser.add_argument("--parallel", action="store_true", help="run every session at once (old --parallel)")
+    parser.add_argument("--timeout", type=float, default=3600, help="per-run timeout in seconds")
+    parser.add_argument("--fresh", action="store_true", help="discard completed cells and re-run everything")
+    parser.add_argument("--no-analyze", action="store_true", help="skip the analyzer after the runs")
+    parser.add_argument("--claude", default="claude", help="claude executable (e.g. scripts/mock-claude.py)")
+    adaptive = parser.add_argument_group("adaptive sampling (replaces the fixed runs count)")
+    adaptive.add_argument("--adaptive", action="store_true", help="run A/B pairs until the comparison is decided")
+    adaptive.add_argument("--min-runs", type=int, default=MIN_PAIRS,
+                          help=f"pairs before the first decision (at least {MIN_PAIRS})")
+    adaptive.add_argument("--max-runs", type=int, default=10, help="pairs after which to stop regardless")
+    adaptive.add_argument("--confidence", type=float, default=0.95,
+                          help="overall bootstrap CI level, split across the pairs that may stop sampling")
+    adaptive.add_argument("--margin", type=float, default=0.1, help="relative difference counted as a tie")
+    adaptive.add_argument("--budget-tokens", type=int, help="stop starting pairs past this many tokens")
+    adaptive.add_argument("--budget-usd", type=float, help="stop starting pairs past this CLI-reported cost")
+    args = parser.parse_args()
+
+    benchmark = BENCHMARKS[args.benchmark]
+    if args.method != "all" and args.method not in benchmark["methods"]:
+        print(f"Unknown method for {args.benchmark}: {args.method} "
+              f"(choose from {', '.join(benchmark['methods'])}, all)")
+        return 1
+    if args.adaptive and args.method != "all":
+        print("--adaptive compares both methods; use method 'all'")
+        return 1
+    claude = shutil.which(args.claude)
+    if claude is None:
+        print(f"ERROR: claude CLI not found: {args.claude}")
+        return 1
+    args.claude = os.path.abspath(claude)  # runs start in their own workspace
+    if benchmark["in_workspace"] and not PLAN_SOURCE.is_dir():
+        print(f"ERROR: Plan directory not found: {PLAN_SOURCE}")
+        return 1
+
+    models = (args.model or benchmark["default_model"] or "default").split(",")
+    manifests = []
+    runs = []
+    for model in models:
+        # One log dir per model, so a multi-model matrix resumes cell by cell
+        log_dir = benchmark["log_dir"] / model
+        if args.fresh:
+            shutil.rmtree(log_dir, ignore_errors=True)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        (log_dir / "model.txt").write_text(f"{model}\n")
+        (log_dir / "started.txt").write_text(datetime.now().astimezone().isoformat(timespec="seconds") + "\n")
+        manifest = load_manifest(log_dir, args.benchmark, model)
+        manifests.append(manifest)
+        if not args.adaptive:
+            runs += plan_runs(args.benchmark, args.method, args.runs, manifest)
+        save_manifest(manifest)
+
+    pending = sum(run["pending"] for run in runs)
+    if args.parallel:
+        args.jobs = 2 * len(models) if args.adaptive else max(pending, 1)
+
+    print("=" * 46)
+    print(f"Benchmark: {benchmark['title']}")
+    print("=" * 46)
+    print(f"Method: {args.method}")
+    print(f"Models: {', '.join(models)}")
+    if args.adaptive:
+        budget = " / ".join(filter(None, [
+            f"{args.budget_tokens:,} tokens" if args.budget_tokens else None,
+            f"${args.budget_usd:.2f}" if args.budget_usd else None,
+        ]))
+        print(f"Sampling: adaptive, {max(args.min_runs, MIN_PAIRS)}-{args.max_runs} pairs per model")
+        print(f"Stopping rule: {args.confidence:.0%} bootstrap CI on {', '.join(DECISION_METRICS)}, "
+              f"tie within ±{args.margin:.0%}")
+        print(f"Budget: {budget or 'none'}")
+    else:
+        print(f"Runs per method: {args.runs}")
+        print(f"Cells: {len(runs)} ({len(runs) - pending} completed earlier, {pending} to run)")
+    print(f"Concurrency: {args.jobs}")
+    print(f"Timeout: {args.timeout:.0f}s")
+    print("")
+
+    analyzer = load_analyzer(benchmark)
+    start = time.monotonic()
+    if args.adaptive:
+        runs = asyncio.run(run_adaptive_matrix(manifests, args, analyzer))
+    else:
+        asyncio.run(run_matrix(runs, benchmark, args))
+    for manifest in manifests:
+        collect_sessions(manifest)
+
+    print(f"\nAll runs finished in {time.monotonic() - start:.3f}s\n")
+    print_timings(runs)
+    if args.adaptive:
+        print("")
+        print_decisions(manifests, benchmark, analyzer)
+
+    if not args.no_analyze:
+        for manifest in manifests:
+            print(f"\n=== Analyzing Results ({manifest['model']}) ===")
+            analyzer.main(["--jobs", str(args.jobs), "--log-dir", str(manifest["log_dir"])])
+
+    print(f"\nLogs: {benchmark['log_dir']}/<model>/ (manifest.json tracks each cell)")
+    print(f"Reports: {PROJECT_DIR / 'plans/reports'}")
+    return 1 if any(run["cell"]["status"] != "ok" for run in runs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Benchmark: ck-context-engineering vs Agent-Skills-for-Context-Engineering
 # Compares monolithic vs modular skill architectures for context engineering tasks
+# Set CLAUDE_BIN (e.g. scripts/mock-claude.py) to run against another claude executable
 
 set -e
 
@@ -41,6 +42,9 @@ declare -a TASK_NAMES=(
 # Setup
 mkdir -p "$LOG_DIR" "$REPORTS_DIR"
 
+# Save model name for analysis
+echo "$MODEL" > "$LOG_DIR/model.txt"
+
 # Clone external skills if needed
 setup_external_skills() {
   if [[ ! -d "$EXTERNAL_SKILLS_DIR" ]]; then
@@ -81,7 +85,7 @@ run_test() {
 
   # Run claude with skill activation
   cd "$workspace"
-  claude --model "$MODEL" \
+  "${CLAUDE_BIN:-claude}" --model "$MODEL" \
     --print \
     --output-format json \
     "Activate context-engineering skills. $prompt" \
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Stopping rule for adaptive A/B benchmark sampling.
+
+run-benchmarks.py --adaptive runs one A/B pair of sessions at a time and asks
+decide() after each pair whether the comparison is settled. A metric is
+settled when the bootstrap confidence interval of B's relative difference
+from A (mean(B) / mean(A) - 1) excludes zero (B is higher or lower), or lies
+entirely within +/-margin (a tie). The resampling is seeded, so a decision is
+reproducible from the recorded runs.
+
+Checking after every pair gives a metric several chances to cross a bound
+by luck, so each look's interval is widened: the 1 - confidence error rate is
+split evenly across the planned looks (Bonferroni), which keeps the chance of
+any false stop per metric at or below it. No decision is taken before
+MIN_PAIRS pairs, since percentile bootstrap intervals run narrow on a few
+samples; at 5-10 pairs they still cover a little less than their level.
+
+Usage: python3 sequential_sampling.py A1,A2,... B1,B2,... [--confidence 0.95] [--margin 0.1] [--looks N]
+"""
+import argparse
+import random
+import sys
+from statistics import mean
+
+BOOTSTRAP_SAMPLES = 2000
+SEED = 0
+MIN_PAIRS = 5  # pairs before decide() may stop sampling
+
+
+def bootstrap_ci(a: list, b: list, confidence: float = 0.95,
+                 samples: int = BOOTSTRAP_SAMPLES, seed: int = SEED) -> tuple:
+    """Percentile bootstrap CI of mean(b) / mean(a) - 1, resampling each group."""
+    rng = random.Random(seed)
+    diffs = []
+    for _ in range(samples):
+        mean_a = mean(rng.choices(a, k=len(a)))
+        if mean_a:
+            diffs.append(mean(rng.choices(b, k=len(b))) / mean_a - 1)
+    if not diffs:
+        return None
+    diffs.sort()
+    tail = (1 - confidence) / 2
+    return diffs[int(tail * len(diffs))], diffs[min(len(diffs) - 1, int((1 - tail) * len(diffs)))]
+
+
+def look_confidence(confidence: float, looks: int) -> float:
+    """Confidence level for each of looks interim checks (Bonferroni)."""
+    return 1 - (1 - confidence) / max(looks, 1)
+
+
+def compare_metric(a: list, b: list, confidence: float = 0.95, margin: float = 0.1) -> dict:
+    """Verdict on B vs A for one metric: higher, lower, tie or undecided."""
+    result = {"diff": None, "ci": None, "verdict": "undecided"}
+    if len(a) < 2 or len(b) < 2 or not mean(a):
+        return result
+    result["diff"] = mean(b) / mean(a) - 1
+    result["ci"] = bootstrap_ci(a, b, confidence)
+    if result["ci"] is None:
+        return result
+
+    low, high = result["ci"]
+    if low > 0:
+        result["verdict"] = "higher"
+    elif high < 0:
+        result["verdict"] = "lower"
+    elif -margin <= low and high <= margin:
+        result["verdict"] = "tie"
+    return result
+
+
+def decide(a_runs: list, b_runs: list, metrics: tuple, confidence: float = 0.95,
+           margin: float = 0.1, looks: int = 1, min_pairs: int = MIN_PAIRS) -> dict:
+    """Compare two lists of run dicts on each metric; decided once every metric is.
+
+    looks is how many times decide() may be called for this comparison; each
+    call uses look_confidence(confidence, looks). Nothing is decided before
+    min_pairs runs per side.
+    """
+    level = look_confidence(confidence, looks)
+    verdicts = {
+        metric: compare_metric(
+            [r[metric] for r in a_runs], [r[metric] for r in b_runs], level, margin
+        )
+        for metric in metrics
+    }
+    return {
+        "decided": min(len(a_runs), len(b_runs)) >= min_pairs
+                   and all(v["verdict"] != "undecided" for v in verdicts.values()),
+        "confidence": level,
+        "metrics": verdicts,
+    }
+
+
+def format_verdict(metric: str, verdict: dict) -> str:
+    """'tokens -12.3% [-20.1%, -5.0%] lower' for logs and reports."""
+    if verdict["diff"] is None:
+        return f"{metric} undecided"
+    ci = f" [{verdict['ci'][0]:+.1%}, {verdict['ci'][1]:+.1%}]" if verdict["ci"] else ""
+    return f"{metric} {verdict['diff']:+.1%}{ci} {verdict['verdict']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap stopping rule for two samples.")
+    parser.add_argument("a", help="comma-separated values for method A")
+    parser.add_argument("b", help="comma-separated values for method B")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--margin", type=float, default=0.1, help="relative difference counted as a tie")
+    parser.add_argument("--looks", type=int, default=1, help="interim checks the confidence is shared by")
+    args = parser.parse_args()
+
+    a = [float(v) for v in args.a.split(",")]
+    b = [float(v) for v in args.b.split(",")]
+    level = look_confidence(args.confidence, args.looks)
+    print(format_verdict("B vs A", compare_metric(a, b, level, args.margin)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
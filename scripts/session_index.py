@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Session ID -> transcript path index over ~/.claude/projects.
+
+Built by one scan of the projects directory and persisted, so resolving a
+session that is not in the analyzer's TRANSCRIPT_DIR is a dict lookup instead
+of a glob over every project. On a miss the index is refreshed once per
+process, rescanning only project directories whose mtime changed (adding or
+removing a transcript bumps its directory's mtime).
+
+Usage: python3 session_index.py [session_id ...] [--rebuild]
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECTS_DIR = Path.home() / ".claude/projects"
+INDEX_FILE = Path.home() / ".cache/skill-validation/session-index.json"
+INDEX_VERSION = 1
+
+
+def _build_lookup(index: dict):
+    """Rebuild the in-memory session_id -> path map from per-directory entries."""
+    lookup = {}
+    root = Path(index["projects_dir"])
+    for dir_name, entry in index["dirs"].items():
+        for session_id in entry["sessions"]:
+            lookup.setdefault(session_id, root / dir_name / f"{session_id}.jsonl")
+    index["lookup"] = lookup
+
+
+def load_index(index_file: Path = INDEX_FILE, projects_dir: Path = PROJECTS_DIR) -> dict:
+    """Load the persisted index (empty if missing, corrupt or for another root)."""
+    index = {"version": INDEX_VERSION, "projects_dir": str(projects_dir), "dirs": {}}
+    try:
+        data = json.loads(index_file.read_text())
+        if data.get("version") == INDEX_VERSION and data.get("projects_dir") == str(projects_dir):
+            index["dirs"] = data["dirs"]
+    except Exception:
+        pass
+    index["refreshed"] = False
+    index["dirty"] = False
+    _build_lookup(index)
+    return index
+
+
+def save_index(index: dict, index_file: Path = INDEX_FILE):
+    """Atomically persist the index if it changed."""
+    if not index.get("dirty"):
+        return
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_file.with_suffix(f".{os.getpid()}.tmp")
+    data = {key: index[key] for key in ("version", "projects_dir", "dirs")}
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, index_file)
+    index["dirty"] = False
+
+
+def refresh_index(index: dict) -> int:
+    """Rescan project directories whose mtime changed; return how many were rescanned."""
+    root = Path(index["projects_dir"])
+    dirs = index["dirs"]
+    seen = set()
+    rescanned = 0
+
+    try:
+        project_entries = list(os.scandir(root))
+    except FileNotFoundError:
+        project_entries = []
+
+    for project in project_entries:
+        if not project.is_dir():
+            continue
+        seen.add(project.name)
+        mtime = project.stat().st_mtime_ns
+        if dirs.get(project.name, {}).get("mtime") == mtime:
+            continue
+        try:
+            sessions = [
+                e.name[:-len(".jsonl")] for e in os.scandir(project.path)
+                if e.name.endswith(".jsonl") and e.is_file()
+            ]
+        except OSError:
+            continue
+        dirs[project.name] = {"mtime": mtime, "sessions": sorted(sessions)}
+        rescanned += 1
+
+    for name in set(dirs) - seen:
+        del dirs[name]
+        rescanned += 1
+
+    index["refreshed"] = True
+    if rescanned:
+        index["dirty"] = True
+        _build_lookup(index)
+    return rescanned
+
+
+def find_transcript(session_id: str, index: dict) -> Path:
+    """Resolve a session transcript path, or None if it does not exist.
+
+    Stale hits (transcript deleted since indexing) and misses trigger a single
+    incremental refresh per process.
+    """
+    path = index["lookup"].get(session_id)
+    if path is not None and path.exists():
+        return path
+    if not index["refreshed"]:
+        refresh_index(index)
+        path = index["lookup"].get(session_id)
+        if path is not None and path.exists():
+            return path
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve Claude session IDs to transcript paths.")
+    parser.add_argument("session_ids", nargs="*", help="session IDs to look up")
+    parser.add_argument("--rebuild", action="store_true", help="discard the saved index and rescan")
+    args = parser.parse_args()
+
+    index = load_index()
+    if args.rebuild:
+        index["dirs"] = {}
+    rescanned = refresh_index(index)
+    save_index(index)
+    print(f"Indexed {len(index['lookup']):,} sessions in {len(index['dirs']):,} projects "
+          f"({rescanned} directories rescanned)")
+
+    for session_id in args.session_ids:
+        print(f"{session_id}: {find_transcript(session_id, index) or 'not found'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Rebuild the timeline of a Claude session from its transcript.
+
+A timeline has one lane for the main thread and one per Task subagent, and
+three kinds of span on them: model turns (from the entry a turn answers to
+the turn's last assistant entry, with its token usage), tool calls (tool_use
+to tool_result) and subagents (the Task call's span on the subagent's own
+lane, with the tokens its sidechain used).
+
+Subagent work is read from inline isSidechain entries, grouped into chains by
+parentUuid, and from the <session>/subagents/*.jsonl files next to the
+transcript (or archived with it by transcript_archive.py). A chain is matched to its Task by agentId when the transcript
+records one, otherwise to the earliest Task still running when it starts.
+
+export-session-trace.py turns timelines into Chrome/Perfetto trace JSON.
+
+Usage: python3 session_timeline.py <transcript.jsonl> [...]
+"""
+import sys
+from pathlib import Path
+
+from transcript_archive import find_archived_subagents, is_compressed
+from transcript_metrics import decode_line, open_transcript, timestamp_ms, tool_results, tool_uses
+
+USAGE_KEYS = ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens")
+# Tool input fields shown on a tool span, first present wins
+SUMMARY_FIELDS = ("description", "command", "file_path", "pattern", "subject", "prompt")
+SUMMARY_CHARS = 120
+
+
+def summarize_input(tool_input) -> str:
+    """Short description of a tool call's input."""
+    if not isinstance(tool_input, dict):
+        return ""
+    for field in SUMMARY_FIELDS:
+        value = tool_input.get(field)
+        if isinstance(value, str) and value:
+            return value[:SUMMARY_CHARS]
+    return ""
+
+
+def compact_record(obj: dict, chain_file: str = None):
+    """The fields of a user/assistant entry the timeline needs, or None for other entries."""
+    message = obj.get("message")
+    if obj.get("type") not in ("user", "assistant") or not isinstance(message, dict):
+        return None
+    ms = timestamp_ms(obj.get("timestamp"))
+    if ms is None:
+        return None
+    result = obj.get("toolUseResult")
+    return {
+        "ms": ms,
+        "type": obj["type"],
+        "uuid": obj.get("uuid"),
+        "parent": obj.get("parentUuid"),
+        "sidechain": bool(obj.get("isSidechain")) or chain_file is not None,
+        "chain_file": chain_file,
+        "agent_id": obj.get("agentId"),
+        "result_agent_id": result.get("agentId") if isinstance(result, dict) else None,
+        "message_id": message.get("id") or obj.get("uuid"),
+        "usage": message.get("usage") if obj["type"] == "assistant" else None,
+        "tool_uses": [
+            (block.get("id"), block.get("name", "unknown"), block.get("input", {}))
+            for block in tool_uses(message)
+        ] if obj["type"] == "assistant" else [],
+        "tool_results": [block.get("tool_use_id") for block in tool_results(message)],
+    }
+
+
+def read_records(path: Path, chain_file: str = None) -> list:
+    """Compact records of one transcript file, in file order."""
+    records = []
+    with open_transcript(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = decode_line(line)
+            if isinstance(obj, dict):
+                record = compact_record(obj, chain_file)
+                if record:
+                    records.append(record)
+    return records
+
+
+def subagent_files(transcript_path: Path) -> list:
+    """(file name, path) of the subagent transcripts next to or archived with a session transcript."""
+    path = Path(transcript_path)
+    if is_compressed(path):
+        return find_archived_subagents(path)
+    if path.suffix != ".jsonl":
+        return []
+    return [(sub.name, sub) for sub in sorted((path.parent / path.stem / "subagents").glob("*.jsonl"))]
+
+
+def load_records(transcript_path: Path) -> list:
+    """Records of a session and its subagent files, ordered by time (file order on ties)."""
+    records = read_records(transcript_path)
+    for name, sub in subagent_files(transcript_path):
+        records += read_records(sub, chain_file=name)
+    records.sort(key=lambda r: r["ms"])
+    return records
+
+
+def sum_usage(messages: dict) -> dict:
+    """Token totals over {message id: usage}; repeated entries of a message count once."""
+    totals = dict.fromkeys(USAGE_KEYS, 0)
+    for usage in messages.values():
+        for key in USAGE_KEYS:
+            totals[key] += usage.get(key, 0) or 0
+    return totals
+
+
+def build_timeline(records: list) -> dict:
+    """Lanes, model turns, tool calls and subagent spans from time-ordered records."""
+    if not records:
+        return {"start_ms": None, "end_ms": None, "lanes": [], "turns": [], "tools": [], "subagents": []}
+
+    lanes = [{"tid": 0, "name": "main", "last_ms": None, "turn": None, "messages": {}}]
+    timeline = {"start_ms": records[0]["ms"], "end_ms": records[-1]["ms"], "turns": [], "tools": [], "subagents": []}
+    pending = {}        # tool_use id -> tool span
+    tasks = {}          # Task tool_use id -> subagent span
+    chain_of = {}       # sidechain entry uuid -> chain key
+    chain_lane = {}     # chain key -> lane
+    agent_task = {}     # agentId -> Task tool_use id, from the Task results
+    for record in records:
+        if record["result_agent_id"] and record["tool_results"]:
+            agent_task[record["result_agent_id"]] = record["tool_results"][0]
+
+    def new_lane(name: str) -> dict:
+        lanes.append({"tid": len(lanes), "name": name, "last_ms": None, "turn": None, "messages": {}})
+        return lanes[-1]
+
+    def task_lane(task: dict) -> dict:
+        if task["lane"] is None:
+            task["lane"] = new_lane(f"subagent {len(lanes)}: {task['subagent_type']}")
+            # The subagent's first turn answers the Task call
+            task["lane"]["last_ms"] = task["start_ms"]
+        return task["lane"]
+
+    def lane_for(record: dict) -> dict:
+        if not record["sidechain"]:
+            return lanes[0]
+        key = f"file:{record['chain_file']}" if record["chain_file"] else chain_of.get(record["parent"], record["uuid"])
+        chain_of[record["uuid"]] = key
+        if key not in chain_lane:
+            task = tasks.get(agent_task.get(record["agent_id"]))
+            if task is None or task["lane"] is not None:
+                running = [t for t in tasks.values() if t["end_ms"] is None]
+                unassigned = [t for t in running if t["lane"] is None]
+                task = (unassigned or running or [None])[0]
+            chain_lane[key] = task_lane(task) if task else new_lane("sidechain")
+        return chain_lane[key]
+
+    def close_turn(lane: dict):
+        turn = lane["turn"]
+        if turn:
+            timeline["turns"].append({"lane": lane["tid"], "start_ms": turn["start_ms"], "end_ms": turn["end_ms"],
+                                      "usage": sum_usage(turn["messages"])})
+            lane["turn"] = None
+
+    for record in records:
+        lane = lane_for(record)
+        now = record["ms"]
+        if record["type"] == "assistant":
+            if lane["turn"] is None:
+                start = lane["last_ms"] if lane["last_ms"] is not None else now
+                lane["turn"] = {"start_ms": start, "end_ms": now, "messages": {}}
+            lane["turn"]["end_ms"] = now
+            if record["usage"]:
+                lane["turn"]["messages"][record["message_id"]] = record["usage"]
+                lane["messages"][record["message_id"]] = record["usage"]
+            for tool_id, name, tool_input in record["tool_uses"]:
+                span = {"id": tool_id, "name": name, "lane": lane["tid"], "start_ms": now, "end_ms": None,
+                        "summary": summarize_input(tool_input)}
+                pending[tool_id] = span
+                timeline["tools"].append(span)
+                if name == "Task":
+                    tasks[tool_id] = {
+                        "id": tool_id, "parent_lane": lane["tid"], "start_ms": now, "end_ms": None, "lane": None,
+                        "subagent_type": (tool_input or {}).get("subagent_type", "unknown"),
+                        "description": summarize_input(tool_input),
+                    }
+        else:
+            close_turn(lane)
+            for tool_id in record["tool_results"]:
+                span = pending.pop(tool_id, None)
+                if span:
+                    span["end_ms"] = now
+                if tool_id in tasks:
+                    tasks[tool_id]["end_ms"] = now
+        lane["last_ms"] = now
+
+    for lane in lanes:
+        close_turn(lane)
+    for span in pending.values():
+        span["end_ms"] = timeline["end_ms"]
+        span["unfinished"] = True
+    for task in tasks.values():
+        lane = task_lane(task)
+        timeline["subagents"].append({
+            "id": task["id"],
+            "subagent_type": task["subagent_type"],
+            "description": task["description"],
+            "parent_lane": task["parent_lane"],
+            "lane": lane["tid"],
+            "start_ms": task["start_ms"],
+            "end_ms": task["end_ms"] if task["end_ms"] is not None else timeline["end_ms"],
+            "usage": sum_usage(lane["messages"]),
+        })
+    timeline["turns"].sort(key=lambda turn: turn["start_ms"])
+    timeline["lanes"] = [{"tid": lane["tid"], "name": lane["name"]} for lane in lanes]
+    return timeline
+
+
+def session_timeline(transcript_path: Path) -> dict:
+    """Timeline of one session transcript (plain or archived)."""
+    return build_timeline(load_records(transcript_path))
+
+
+def main():
+    for path in sys.argv[1:]:
+        timeline = session_timeline(Path(path))
+        if timeline["start_ms"] is None:
+            print(f"{path}: no timed entries")
+            continue
+        busy = sum(s["end_ms"] - s["start_ms"] for s in timeline["subagents"])
+        print(f"{path}: {(timeline['end_ms'] - timeline['start_ms']) / 1000:.1f}s, "
+              f"{len(timeline['turns'])} model turns, {len(timeline['tools'])} tool calls, "
+              f"{len(timeline['subagents'])} subagents ({busy / 1000:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Critical path and concurrency of a session's Task subagents.
+
+Given the subagent spans of a session (Task tool_use to tool_result on the
+main thread), schedule_stats rebuilds when they overlapped and what each one
+waited for:
+  - concurrency: a sweep over span starts and ends gives the maximum number
+    running at once, the time with two or more running, and the average
+    concurrency while any is running (busy time / covered time)
+  - dependencies: a subagent that starts after others ended depends on the
+    one that ended last before it (the one that unblocked it); overlapping
+    subagents are independent
+  - critical path: the longest chain of subagents that ran one after another,
+    i.e. the subagent time that could not have been parallelized
+  - idle gaps: stretches between the first subagent start and the last end
+    with none running (the orchestrator working alone)
+
+A session that wins on duration through parallel fan-out has a critical path
+well below its busy time; one that wins through fewer subagents has both low.
+SubagentCollector in transcript_metrics.py feeds this from the shared
+transcript pass.
+
+Usage: python3 subagent_schedule.py <transcript.jsonl> [...]
+"""
+import sys
+from pathlib import Path
+
+SCHEDULE_KEYS = (
+    "subagent_busy_ms", "subagent_covered_ms", "subagent_parallel_ms", "max_concurrency", "avg_concurrency",
+    "critical_path_ms", "critical_path", "idle_gaps_ms", "lead_in_ms", "tail_ms", "subagent_spans",
+    "subagent_edges",
+)
+
+
+def empty_schedule() -> dict:
+    """Schedule stats of a session without subagents."""
+    return {
+        "subagent_busy_ms": 0, "subagent_covered_ms": 0, "subagent_parallel_ms": 0,
+        "max_concurrency": 0, "avg_concurrency": 0, "critical_path_ms": 0, "critical_path": [],
+        "idle_gaps_ms": [], "lead_in_ms": 0, "tail_ms": 0, "subagent_spans": [], "subagent_edges": [],
+    }
+
+
+def schedule_stats(spans: list, start_ms: float, end_ms: float) -> dict:
+    """Concurrency, dependency edges, critical path and idle gaps of [subagent_type, start, end] spans."""
+    if not spans:
+        return empty_schedule()
+    spans = sorted(spans, key=lambda span: (span[1], span[2]))
+
+    # Sweep: ends sort before starts at the same instant, so back-to-back spans do not overlap
+    events = sorted([(start, 1) for _, start, _ in spans] + [(end, -1) for _, _, end in spans])
+    running = max_running = 0
+    covered = parallel = 0
+    gaps = []
+    previous = events[0][0]
+    for at, step in events:
+        if running >= 1:
+            covered += at - previous
+        if running >= 2:
+            parallel += at - previous
+        if running == 0 and at > previous:
+            gaps.append(at - previous)
+        running += step
+        max_running = max(max_running, running)
+        previous = at
+
+    # Each span depends on the span that ended last before it started
+    edges = []
+    longest = []   # (critical path ms ending at span i, predecessor index)
+    for i, (_, start, end) in enumerate(spans):
+        done = [j for j in range(i) if spans[j][2] <= start]
+        best = max(done, key=lambda j: longest[j][0], default=None)
+        if done:
+            edges.append([max(done, key=lambda j: spans[j][2]), i])
+        longest.append(((end - start) + (longest[best][0] if best is not None else 0), best))
+
+    last = max(range(len(spans)), key=lambda i: longest[i][0])
+    path = []
+    while last is not None:
+        path.append(spans[last][0])
+        last = longest[last][1]
+
+    busy = sum(end - start for _, start, end in spans)
+    first_start = spans[0][1]
+    last_end = max(end for _, _, end in spans)
+    return {
+        "subagent_busy_ms": round(busy),
+        "subagent_covered_ms": round(covered),
+        "subagent_parallel_ms": round(parallel),
+        "max_concurrency": max_running,
+        "avg_concurrency": busy / covered if covered else 0,
+        "critical_path_ms": round(max(total for total, _ in longest)),
+        "critical_path": path[::-1],
+        "idle_gaps_ms": [round(gap) for gap in gaps],
+        "lead_in_ms": round(max(first_start - start_ms, 0)),
+        "tail_ms": round(max(end_ms - last_end, 0)),
+        "subagent_spans": [[kind, round(start - start_ms), round(end - start_ms)] for kind, start, end in spans],
+        "subagent_edges": edges,
+    }
+
+
+def main():
+    from transcript_metrics import TIMING_COLLECTORS, scan_transcript
+
+    for path in sys.argv[1:]:
+        m = scan_transcript(Path(path), collectors=TIMING_COLLECTORS)
+        print(f"{path}: {len(m['subagent_spans'])} subagents, busy {m['subagent_busy_ms'] / 1000:.1f}s, "
+              f"critical path {m['critical_path_ms'] / 1000:.1f}s ({' -> '.join(m['critical_path']) or '-'}), "
+              f"max concurrency {m['max_concurrency']}, avg {m['avg_concurrency']:.2f}, "
+              f"idle gaps {len(m['idle_gaps_ms'])} ({sum(m['idle_gaps_ms']) / 1000:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Synthetic Claude session transcripts (JSONL) of any size, for testing and
+benchmarking the analysis tooling without real sessions.
+
+Entries look like the real thing: a user prompt, assistant turns with usage
+blocks (cache reads growing with context), tool_use blocks answered by
+tool_result entries, Task calls with a subagent_type whose subagent work is
+written inline as isSidechain entries, TaskCreate/TaskUpdate calls, the
+attachment entries the CLI adds around tool calls (hook results, edited file
+snippets) and ISO timestamps. Size is reached by padding tool results and
+edit snippets, with the number of turns scaling with size so line lengths
+stay realistic. Output is seeded, so the same arguments always produce the
+same bytes; TRANSCRIPT_FORMAT changes whenever those bytes do.
+
+Usage: python3 synthetic_transcripts.py <out.jsonl> [--size 100MB] [--turns N] [--seed S]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+TRANSCRIPT_FORMAT = 2
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+DEFAULT_TURNS = 20
+TURN_BYTES = 24 * 1024  # average bytes per turn when the turn count follows size
+SECONDS_PER_TURN = 6
+
+EDIT_TOOLS = ("Write", "Edit")
+TOOLS = ("Bash", "Read", "Write", "Edit", "Grep", "Glob", "Task", "TaskCreate", "TaskUpdate")
+TOOL_WEIGHTS = (20, 25, 8, 12, 10, 6, 6, 2, 3)
+SUBAGENTS = ("planner", "researcher", "tester", "code-reviewer", "debugger")
+FILLER = "mock tool output line for harness benchmarking\n"
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_size(text: str) -> int:
+    """'200KB' / '1.5GB' / '4096' -> bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?B?)\s*", str(text).upper())
+    if not match:
+        raise ValueError(f"Bad size: {text}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def timestamp(t: datetime) -> str:
+    """ISO timestamp in the transcript format."""
+    return t.strftime("%Y-%m-%dT%H:%M:%S.") + f"{t.microsecond // 1000:03d}Z"
+
+
+def new_usage() -> dict:
+    """Zeroed usage totals, keyed like the CLI's JSON output."""
+    return {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_input_tokens": 0,
+        "cache_creation_input_tokens": 0,
+    }
+
+
+def add_usage(totals: dict, usage: dict):
+    """Accumulate one message's usage."""
+    for key in totals:
+        totals[key] += usage.get(key, 0) or 0
+
+
+def synthesize(out, session_id: str, prompt: str, cwd: str, rng: random.Random,
+               size: int, turns: int = None, duration_s: float = None,
+               start: datetime = None, model: str = "mock") -> dict:
+    """Write a synthetic transcript of roughly size bytes to a text stream.
+
+    Returns the summed usage, the number of assistant turns and the final
+    result text, which is what the CLI reports for the session.
+    """
+    turns = max(turns or size // TURN_BYTES, 1)
+    duration_s = duration_s if duration_s is not None else turns * SECONDS_PER_TURN
+    start = start or datetime.now(timezone.utc) - timedelta(seconds=duration_s)
+    step = duration_s / (turns + 1)
+    pad = max(size // turns - 1900, 0)
+    filler = (FILLER * (pad // len(FILLER) + 1))[:pad]
+    usage_totals = new_usage()
+    state = {"context": rng.randint(8000, 20000), "parent": None, "turns": 0}
+
+    def write(entry_type: str, t: datetime, message: dict, sidechain: bool = False):
+        entry_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        out.write(json.dumps({
+            "parentUuid": state["parent"],
+            "isSidechain": sidechain,
+            "sessionId": session_id,
+            "cwd": cwd,
+            "type": entry_type,
+            "uuid": entry_id,
+            "timestamp": timestamp(t),
+            "message": message,
+        }) + "\n")
+        state["parent"] = entry_id
+
+    def attach(t: datetime, attachment: dict):
+        entry_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        out.write(json.dumps({
+            "parentUuid": state["parent"],
+            "isSidechain": False,
+            "attachment": attachment,
+            "type": "attachment",
+            "uuid": entry_id,
+            "timestamp": timestamp(t),
+            "sessionId": session_id,
+            "cwd": cwd,
+        }) + "\n")
+        state["parent"] = entry_id
+
+    def hook(t: datetime, event: str, tool: str, tool_id: str):
+        attach(t, {"type": "hook_success", "hookName": f"{event}:{tool}", "toolUseID": tool_id,
+                   "hookEvent": event, "content": "", "stdout": "", "stderr": "", "exitCode": 0,
+                   "command": "mock-hook", "durationMs": rng.randint(5, 80)})
+
+    def assistant(t: datetime, content: list, sidechain: bool = False):
+        usage = {
+            "input_tokens": rng.randint(2, 40),
+            "cache_read_input_tokens": state["context"],
+            "cache_creation_input_tokens": rng.randint(200, 3000),
+            "output_tokens": rng.randint(50, 800),
+        }
+        state["context"] += usage["cache_creation_input_tokens"]
+        state["turns"] += 1
+        add_usage(usage_totals, usage)
+        write("assistant", t, {"role": "assistant", "model": model, "usage": usage, "content": content},
+              sidechain)
+
+    write("user", start, {"role": "user", "content": prompt})
+    for turn in range(turns):
+        t = start + timedelta(seconds=step * (turn + 1))
+        tool = rng.choices(TOOLS, TOOL_WEIGHTS)[0]
+        tool_id = f"toolu_{rng.getrandbits(64):016x}"
+        if tool == "Task":
+            tool_input = {"subagent_type": rng.choice(SUBAGENTS), "description": "mock subtask",
+                          "prompt": "Work on the delegated part."}
+        elif tool in ("TaskCreate", "TaskUpdate"):
+            tool_input = {"subject": f"Phase {turn % 4 + 1}", "status": "in_progress"}
+        else:
+            tool_input = {"command": f"mock {turn}"}
+        assistant(t, [
+            {"type": "text", "text": f"Step {turn + 1}."},
+            {"type": "tool_use", "id": tool_id, "name": tool, "input": tool_input},
+        ])
+        hook(t, "PreToolUse", tool, tool_id)
+
+        if tool == "Task":
+            # Subagent work is logged inline as sidechain entries before the Task result
+            for sub in range(rng.randint(2, 4)):
+                sub_t = t + timedelta(seconds=step * (sub + 1) / 6)
+                sub_id = f"toolu_{rng.getrandbits(64):016x}"
+                assistant(sub_t, [{"type": "tool_use", "id": sub_id, "name": "Read",
+                                   "input": {"file_path": f"src/mock_{sub}.py"}}], sidechain=True)
+                write("user", sub_t + timedelta(seconds=step / 12), {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": sub_id, "content": "mock file"}]}, sidechain=True)
+
+        # Edits are answered briefly; the edited snippet follows as an attachment
+        done = t + timedelta(seconds=step * 0.8)
+        path = f"{cwd}/src/mock_{turn}.py"
+        result = f"The file {path} has been updated." if tool in EDIT_TOOLS else filler
+        write("user", done, {
+            "role": "user",
+            "content": [{"type": "tool_result", "tool_use_id": tool_id, "content": result}],
+        })
+        hook(done, "PostToolUse", tool, tool_id)
+        if tool in EDIT_TOOLS:
+            attach(done, {"type": "edited_text_file", "filename": path, "snippet": filler})
+
+    result = "Mock run complete."
+    assistant(start + timedelta(seconds=duration_s), [{"type": "text", "text": result}])
+    return {"usage": usage_totals, "num_turns": state["turns"], "result": result}
+
+
+def generate_transcript(path: Path, size: int, seed: int = 0, turns: int = None) -> dict:
+    """Write a deterministic synthetic transcript to path."""
+    rng = random.Random(seed)
+    session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", buffering=1024 * 1024) as out:
+        run = synthesize(out, session_id, "Synthetic benchmark session.", "/tmp/synthetic", rng,
+                         size, turns, start=EPOCH)
+    return dict(run, session_id=session_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Claude session transcript.")
+    parser.add_argument("out", type=Path, help="output .jsonl path")
+    parser.add_argument("--size", default="100MB", help="target size, e.g. 1MB, 500MB, 5GB")
+    parser.add_argument("--turns", type=int, help=f"assistant turns (default: one per {TURN_BYTES // 1024}KB)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run = generate_transcript(args.out, parse_size(args.size), args.seed, args.turns)
+    print(f"Wrote {args.out}: {args.out.stat().st_size / 1e6:,.1f} MB, {run['num_turns']:,} assistant turns, "
+          f"session {run['session_id']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
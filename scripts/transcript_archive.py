@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Compressed, content-addressed archive for transcripts and benchmark logs.
+
+Files are stored once per content hash under objects/<aa>/<sha256>.<codec>,
+compressed with zstd when the zstandard package is installed, gzip otherwise.
+Each archived log run gets a manifest under runs/<label>.json mapping its
+relative file names to objects; archived transcripts are also listed in
+sessions.json so the analyzers can find them by session id. A session's
+<session>/subagents/*.jsonl files are archived with its transcript and listed
+in subagents.json under the transcript's digest, so the timeline of an
+archived session keeps its subagent lanes.
+
+Readers never inflate objects to disk: open_compressed() returns a streaming
+binary reader, and the transcript engine and CLI-output parser read .gz/.zst
+files through it directly.
+
+Usage:
+  python3 transcript_archive.py store <log_dir> --label LABEL [--transcripts] [--codec gzip|zstd]
+  python3 transcript_archive.py transcript <session_id> [...]
+  python3 transcript_archive.py list
+  python3 transcript_archive.py restore <label> [dest_dir]
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = Path(__file__).resolve().parent.parent / "archive"
+CHUNK_BYTES = 1024 * 1024
+CODECS = ("zstd", "gzip")
+EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+DEFAULT_CODEC = "zstd" if zstandard else "gzip"
+
+
+def is_compressed(path: Path) -> bool:
+    """Whether path is a gzip or zstd file, judged by its extension."""
+    return Path(path).suffix in EXTENSIONS.values()
+
+
+def open_compressed(path: Path):
+    """Open a .gz or .zst file as a buffered, line-iterable binary stream."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.BufferedReader(reader, CHUNK_BYTES)
+    raise ValueError(f"Not a compressed file: {path}")
+
+
+def read_text(path: Path) -> str:
+    """Read a plain or compressed text file."""
+    path = Path(path)
+    if not is_compressed(path):
+        return path.read_text()
+    with open_compressed(path) as f:
+        return f.read().decode("utf-8")
+
+
+def object_path(digest: str, codec: str, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """Location of a stored object."""
+    return archive_dir / "objects" / digest[:2] / f"{digest}{EXTENSIONS[codec]}"
+
+
+def find_object(digest: str, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """Stored object for a content hash under any codec, or None."""
+    for codec in CODECS:
+        path = object_path(digest, codec, archive_dir)
+        if path.exists():
+            return path
+    return None
+
+
+def _compressor(codec: str, raw):
+    """Writable stream compressing into raw."""
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed; use --codec gzip")
+    return zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+
+
+def store_file(source: Path, codec: str = DEFAULT_CODEC, archive_dir: Path = ARCHIVE_DIR) -> dict:
+    """Compress source into the archive in one streaming pass.
+
+    The object is keyed by the SHA-256 of the uncompressed bytes, so identical
+    content is stored once whatever its name or codec.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    tmp_dir = archive_dir / "objects"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as raw, open(source, "rb") as src:
+            writer = _compressor(codec, raw)
+            while True:
+                chunk = src.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                writer.write(chunk)
+            writer.close()
+
+        sha = digest.hexdigest()
+        existing = find_object(sha, archive_dir)
+        if existing is None:
+            target = object_path(sha, codec, archive_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, target)
+            existing = target
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+    return {
+        "sha256": sha,
+        "size": size,
+        "stored": existing.stat().st_size,
+        "codec": "zstd" if existing.suffix == ".zst" else "gzip",
+    }
+
+
+def _write_json(path: Path, data: dict):
+    """Atomically write a JSON document."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def load_sessions(archive_dir: Path = ARCHIVE_DIR) -> dict:
+    """session_id -> object digest for archived transcripts."""
+    try:
+        return json.loads((archive_dir / "sessions.json").read_text())
+    except Exception:
+        return {}
+
+
+def find_archived_transcript(session_id: str, sessions: dict,
+                             archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """Compressed transcript object for a session, or None."""
+    digest = sessions.get(session_id)
+    return find_object(digest, archive_dir) if digest else None
+
+
+def find_archived_subagents(transcript_path: Path, archive_dir: Path = None) -> list:
+    """(file name, object) for each subagent file archived with a transcript object.
+
+    archive_dir defaults to the archive holding the object (objects/<aa>/<sha256>.<codec>).
+    """
+    archive_dir = archive_dir or Path(transcript_path).resolve().parents[2]
+    try:
+        subagents = json.loads((archive_dir / "subagents.json").read_text())
+    except Exception:
+        return []
+    digest = Path(transcript_path).name.split(".")[0]
+    found = []
+    for name, sub_digest in sorted(subagents.get(digest, {}).items()):
+        path = find_object(sub_digest, archive_dir)
+        if path is not None:
+            found.append((name, path))
+    return found
+
+
+def archive_transcripts(session_ids: list, codec: str = DEFAULT_CODEC,
+                        archive_dir: Path = ARCHIVE_DIR) -> dict:
+    """Archive the transcripts of the given sessions with their subagent files.
+
+    Returns session_id -> object info, with the subagent files' infos under
+    "subagents" by file name.
+    """
+    from session_index import find_transcript, load_index, save_index
+    from session_timeline import subagent_files
+
+    index = load_index()
+    sessions = load_sessions(archive_dir)
+    try:
+        subagents = json.loads((archive_dir / "subagents.json").read_text())
+    except Exception:
+        subagents = {}
+    stored = {}
+    for session_id in session_ids:
+        transcript_path = find_transcript(session_id, index)
+        if transcript_path is None:
+            print(f"Transcript not found: {session_id}")
+            continue
+        info = store_file(transcript_path, codec, archive_dir)
+        info["subagents"] = {name: store_file(path, codec, archive_dir)
+                             for name, path in subagent_files(transcript_path)}
+        sessions[session_id] = info["sha256"]
+        if info["subagents"]:
+            subagents[info["sha256"]] = {name: sub["sha256"] for name, sub in info["subagents"].items()}
+        stored[session_id] = info
+    save_index(index)
+    _write_json(archive_dir / "sessions.json", sessions)
+    _write_json(archive_dir / "subagents.json", subagents)
+    return stored
+
+
+def archive_log_dir(log_dir: Path, label: str, codec: str = DEFAULT_CODEC,
+                    transcripts: bool = False, archive_dir: Path = ARCHIVE_DIR) -> dict:
+    """Archive every file under a /tmp/ck-* log dir as run <label>.
+
+    With transcripts=True, the transcripts of sessions listed in
+    *-sessions.txt files are archived as well.
+    """
+    files = {}
+    for path in sorted(p for p in Path(log_dir).rglob("*") if p.is_file()):
+        files[str(path.relative_to(log_dir))] = store_file(path, codec, archive_dir)
+
+    sessions = {}
+    if transcripts:
+        session_ids = []
+        for session_file in sorted(Path(log_dir).glob("*-sessions.txt")):
+            session_ids += [s.strip() for s in session_file.read_text().splitlines() if s.strip()]
+        sessions = archive_transcripts(session_ids, codec, archive_dir)
+
+    manifest = {
+        "label": label,
+        "source": str(log_dir),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+        "sessions": sessions,
+    }
+    _write_json(archive_dir / "runs" / f"{label}.json", manifest)
+    return manifest
+
+
+def restore_run(label: str, dest: Path = None, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """Decompress an archived log run into dest, by default its original log dir.
+
+    Restoring to the original /tmp/ck-* path lets the analyzers re-run
+    unchanged; archived transcripts and their subagent files need no
+    restore, they are read in place.
+    """
+    manifest = json.loads((archive_dir / "runs" / f"{label}.json").read_text())
+    dest = Path(dest or manifest["source"])
+    for name, info in manifest["files"].items():
+        target = Path(dest) / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open_compressed(find_object(info["sha256"], archive_dir)) as src, open(target, "wb") as out:
+            shutil.copyfileobj(src, out, CHUNK_BYTES)
+    return dest
+
+
+def _session_infos(sessions: dict) -> list:
+    """Object infos of archived transcripts and their subagent files."""
+    infos = []
+    for info in sessions.values():
+        infos.append(info)
+        infos += info.get("subagents", {}).values()
+    return infos
+
+
+def _ratio_line(infos: list) -> str:
+    """'N files, X MB -> Y MB (Rx)' for a set of stored objects."""
+    size = sum(i["size"] for i in infos)
+    stored = sum(i["stored"] for i in infos)
+    ratio = size / stored if stored else 0
+    return f"{len(infos)} files, {size / 1e6:.1f} MB -> {stored / 1e6:.1f} MB ({ratio:.1f}x)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed archive for transcripts and benchmark logs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    store = sub.add_parser("store", help="archive a /tmp/ck-* log directory")
+    store.add_argument("log_dir", type=Path)
+    store.add_argument("--label", required=True, help="name of the archived run")
+    store.add_argument("--transcripts", action="store_true", help="also archive listed session transcripts")
+    store.add_argument("--codec", choices=CODECS, default=DEFAULT_CODEC)
+
+    transcript = sub.add_parser("transcript", help="archive session transcripts by id")
+    transcript.add_argument("session_ids", nargs="+")
+    transcript.add_argument("--codec", choices=CODECS, default=DEFAULT_CODEC)
+
+    sub.add_parser("list", help="list archived log runs")
+
+    restore = sub.add_parser("restore", help="decompress an archived log run")
+    restore.add_argument("label")
+    restore.add_argument("dest", type=Path, nargs="?", help="default: the run's original log dir")
+
+    args = parser.parse_args()
+
+    if args.command == "store":
+        if not args.log_dir.is_dir():
+            print(f"Log directory not found: {args.log_dir}")
+            return 1
+        manifest = archive_log_dir(args.log_dir, args.label, args.codec, args.transcripts)
+        print(f"Archived {args.label}: {_ratio_line(list(manifest['files'].values()))}")
+        if manifest["sessions"]:
+            print(f"Transcripts: {_ratio_line(_session_infos(manifest['sessions']))}")
+    elif args.command == "transcript":
+        stored = archive_transcripts(args.session_ids, args.codec)
+        if stored:
+            print(f"Transcripts: {_ratio_line(_session_infos(stored))}")
+    elif args.command == "list":
+        for manifest_file in sorted((ARCHIVE_DIR / "runs").glob("*.json")):
+            manifest = json.loads(manifest_file.read_text())
+            infos = list(manifest["files"].values()) + _session_infos(manifest["sessions"])
+            print(f"{manifest['label']} ({manifest['created']}): {_ratio_line(infos)}")
+    elif args.command == "restore":
+        if not (ARCHIVE_DIR / "runs" / f"{args.label}.json").exists():
+            print(f"Archived run not found: {args.label}")
+            return 1
+        dest = restore_run(args.label, args.dest)
+        print(f"Restored {args.label} to {dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1195 @@
+#!/usr/bin/env python3
+"""
+Single-pass metrics engine for Claude session transcripts (JSONL).
+
+Every analyzer reads its transcript metrics from here. A scan streams the
+transcript once, line by line from a buffered binary handle (memory stays
+flat regardless of size), and feeds each decoded entry to a set of pluggable
+collectors. REPORT_COLLECTORS computes everything the file-ops and
+orchestration reports need, so a session shared by several reports is parsed
+once; new metrics are added by appending a Collector and listing its keys in
+REPORT_KEYS, which the reports copy with report_fields(). DEFAULT_COLLECTORS
+leaves out the timing collectors, whose tool_result lines make up most of a
+transcript's bytes, so scans that do not report timing skip those lines.
+
+LatencyCollector pairs each tool_use with its tool_result to time every tool
+call (p50/p95/max per tool) and splits the main thread's wall time into model
+time (waiting for the next assistant entry), tool time, subagent (Task) time
+and other time (waiting on the user). SubagentCollector records when each
+Task subagent ran, for the critical path and concurrency figures of
+subagent_schedule.py. CacheCollector keeps cache reads and writes apart from
+input (TokenCollector folds them in): per session and per turn it reports the
+cache-read ratio, cache-creation volume and effective cost at the prices in
+pricing.py.
+ContextCollector records the main thread's context size per model call, the
+compactions that cut it back, and how fast it grows per tool call.
+
+Transcripts are append-only, so scan_transcript_cached() keeps a persistent
+cache of per-session collector state keyed by byte offset and only parses
+bytes appended since the previous run.
+
+Transcripts archived by transcript_archive.py (.gz/.zst) are read in place
+through streaming decompression; sessions missing from ~/.claude/projects
+are resolved from the archive.
+
+By default lines are pre-filtered on raw bytes and only those containing a
+collector's markers are JSON-decoded (with orjson when installed);
+--full-decode disables this and --check proves both paths agree.
+
+Usage: python3 transcript_metrics.py <transcript.jsonl> [...] [--jobs N] [--compare]
+                                     [--full-decode] [--check]
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from pricing import rates_for, usage_cost
+from session_index import find_transcript, load_index, save_index
+from subagent_schedule import SCHEDULE_KEYS, schedule_stats
+from transcript_archive import find_archived_transcript, is_compressed, load_sessions, open_compressed, read_text
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+READ_BUFFER_BYTES = 1024 * 1024
+CACHE_FILE = Path.home() / ".cache/skill-validation/transcript-metrics.json"
+CACHE_VERSION = 3
+
+# Raw-byte markers for the fast scan. Collectors declare which of these a line
+# must contain for it to matter to them.
+USAGE_MARKER = b'"usage"'
+TOOL_USE_MARKER = b'"tool_use"'
+TOOL_RESULT_MARKER = b'"tool_result"'
+TIMESTAMP_MARKER = b'"timestamp"'
+# System entry written where a session's context was compacted
+COMPACT_MARKER = b'"compact_boundary"'
+
+# Result keys describing the scan itself rather than the session
+SCAN_STAT_KEYS = ("bytes", "lines", "decoded", "elapsed_s", "mb_per_s")
+
+
+def tool_uses(message: dict):
+    """Yield the tool_use content blocks of a message."""
+    for block in message.get("content", []):
+        if isinstance(block, dict) and block.get("type") == "tool_use":
+            yield block
+
+
+def tool_results(message: dict):
+    """Yield the tool_result content blocks of a message (content may be plain text)."""
+    content = message.get("content")
+    if isinstance(content, list):
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "tool_result":
+                yield block
+
+
+def timestamp_ms(ts: str):
+    """Milliseconds since the epoch for an ISO timestamp, or None if unparseable."""
+    try:
+        return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp() * 1000
+    except (AttributeError, ValueError):
+        return None
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile (q in 0..1) of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def latency_stats(latencies: dict) -> dict:
+    """{tool: [ms, ...]} -> {tool: count, total, p50, p95 and max in ms}."""
+    return {
+        tool: {
+            "count": len(values),
+            "total_ms": round(sum(values)),
+            "p50_ms": round(percentile(values, 0.5)),
+            "p95_ms": round(percentile(values, 0.95)),
+            "max_ms": round(max(values)),
+        }
+        for tool, values in sorted(latencies.items()) if values
+    }
+
+
+def timed_entry(state: dict, obj: dict):
+    """Timestamp in ms of a main-thread entry the timing collectors use, else None.
+
+    Only entries whose lines hold a timing marker count (assistant messages
+    with usage or tool calls, tool results), plus the transcript's first
+    timestamped entry, which the fast scan always decodes. state["started"]
+    records that the first one has been seen.
+    """
+    opening = not state["started"] and bool(obj.get("timestamp"))
+    if opening:
+        state["started"] = True
+    message = obj.get("message")
+    if obj.get("type") not in ("user", "assistant") or obj.get("isSidechain") or not isinstance(message, dict):
+        return None
+    if not opening:
+        if obj["type"] == "assistant":
+            if "usage" not in message and next(tool_uses(message), None) is None:
+                return None
+        elif next(tool_results(message), None) is None:
+            return None
+    return timestamp_ms(obj.get("timestamp"))
+
+
+class Collector:
+    """A metric computed in the shared transcript pass.
+
+    State must be plain JSON data (it is persisted in the metrics cache and
+    sent between processes), so counters are dicts, not defaultdicts.
+    """
+
+    name = ""
+    markers = ()
+
+    def new(self) -> dict:
+        """Return empty per-transcript state."""
+        return {}
+
+    def update(self, state: dict, obj: dict):
+        """Fold one decoded transcript entry into state."""
+
+    def finalize(self, state: dict) -> dict:
+        """Return this collector's result keys from its state."""
+        return dict(state)
+
+
+class TokenCollector(Collector):
+    """Token usage from message.usage; cache tokens count as input."""
+
+    name = "tokens"
+    markers = (USAGE_MARKER,)
+
+    def new(self) -> dict:
+        return {"input_tokens": 0, "output_tokens": 0}
+
+    def update(self, state: dict, obj: dict):
+        message = obj.get("message")
+        if not isinstance(message, dict):
+            return
+        usage = message.get("usage", {})
+        if usage:
+            state["input_tokens"] += usage.get("input_tokens", 0)
+            state["input_tokens"] += usage.get("cache_creation_input_tokens", 0)
+            state["input_tokens"] += usage.get("cache_read_input_tokens", 0)
+            state["output_tokens"] += usage.get("output_tokens", 0)
+
+    def finalize(self, state: dict) -> dict:
+        return {**state, "total_tokens": state["input_tokens"] + state["output_tokens"]}
+
+
+class ToolCollector(Collector):
+    """Tool calls by tool name."""
+
+    name = "tools"
+    markers = (TOOL_USE_MARKER,)
+
+    def new(self) -> dict:
+        return {"tool_counts": {}}
+
+    def update(self, state: dict, obj: dict):
+        message = obj.get("message")
+        if not isinstance(message, dict):
+            return
+        counts = state["tool_counts"]
+        for block in tool_uses(message):
+            tool_name = block.get("name", "unknown")
+            counts[tool_name] = counts.get(tool_name, 0) + 1
+
+    def finalize(self, state: dict) -> dict:
+        return {"tool_counts": dict(state["tool_counts"])}
+
+
+class OrchestrationCollector(Collector):
+    """Subagent calls by subagent_type, review cycles and task management."""
+
+    name = "orchestration"
+    markers = (TOOL_USE_MARKER,)
+
+    def new(self) -> dict:
+        return {"subagent_counts": {}, "review_cycles": 0, "task_creates": 0, "task_updates": 0}
+
+    def update(self, state: dict, obj: dict):
+        message = obj.get("message")
+        if not isinstance(message, dict):
+            return
+        for block in tool_uses(message):
+            tool_name = block.get("name", "unknown")
+
+            # Track subagent calls (Task tool)
+            if tool_name == "Task":
+                subagent_type = block.get("input", {}).get("subagent_type", "unknown")
+                counts = state["subagent_counts"]
+                counts[subagent_type] = counts.get(subagent_type, 0) + 1
+
+                # Track review cycles (code-reviewer invocations)
+                if subagent_type == "code-reviewer":
+                    state["review_cycles"] += 1
+
+            # Track task management
+            elif tool_name == "TaskCreate":
+                state["task_creates"] += 1
+            elif tool_name == "TaskUpdate":
+                state["task_updates"] += 1
+
+    def finalize(self, state: dict) -> dict:
+        return {**state, "subagent_counts": dict(state["subagent_counts"])}
+
+
+class LatencyCollector(Collector):
+    """Where the main thread's wall time went, and how long each tool call took.
+
+    Each gap between consecutive timed entries is attributed to what ended it:
+    an assistant entry (model), a tool_result (tool, or subagent for Task) or
+    a user message answering no pending call (other). Sidechain entries are
+    skipped; a subagent's work is the latency of the Task call that started it.
+
+    Timed entries are assistant messages (they carry usage) and tool results,
+    so the big tool_result lines are the only user lines decoded. Plain user
+    messages carry no marker; only the opening prompt is timed, as the first
+    timestamped entry is decoded in every scan mode. In an interactive session
+    time spent waiting on a later prompt counts as model time.
+    """
+
+    name = "latency"
+    markers = (USAGE_MARKER, TOOL_USE_MARKER, TOOL_RESULT_MARKER)
+
+    def new(self) -> dict:
+        return {
+            "model_ms": 0, "tool_ms": 0, "subagent_ms": 0, "other_ms": 0, "model_turns": 0,
+            "started": False, "last_ms": None, "last_type": None, "pending": {}, "tool_latencies_ms": {},
+        }
+
+    def update(self, state: dict, obj: dict):
+        now = timed_entry(state, obj)
+        if now is None:
+            return
+        entry_type = obj["type"]
+        message = obj["message"]
+        gap = now - state["last_ms"] if state["last_ms"] is not None else 0
+
+        if entry_type == "assistant":
+            state["model_ms"] += gap
+            if state["last_type"] != "assistant":
+                state["model_turns"] += 1
+            for block in tool_uses(message):
+                if "id" in block:
+                    state["pending"][block["id"]] = [block.get("name", "unknown"), now]
+        else:
+            bucket = "other_ms"
+            for block in tool_results(message):
+                tool_name, started = state["pending"].pop(block.get("tool_use_id"), (None, None))
+                if tool_name is None:
+                    continue
+                latencies = state["tool_latencies_ms"].setdefault(tool_name, [])
+                latencies.append(round(now - started))
+                if tool_name == "Task":
+                    bucket = "subagent_ms"
+                elif bucket == "other_ms":
+                    bucket = "tool_ms"
+            state[bucket] += gap
+
+        state["last_ms"] = now
+        state["last_type"] = entry_type
+
+    def finalize(self, state: dict) -> dict:
+        result = {key: round(state[key]) for key in ("model_ms", "tool_ms", "subagent_ms", "other_ms")}
+        return {
+            **result,
+            "model_turns": state["model_turns"],
+            "tool_latency": latency_stats(state["tool_latencies_ms"]),
+            "tool_latencies_ms": {tool: list(values) for tool, values in state["tool_latencies_ms"].items()},
+        }
+
+
+class SubagentCollector(Collector):
+    """Main-thread Task spans, scheduled into critical path and concurrency stats."""
+
+    name = "subagents"
+    markers = LatencyCollector.markers
+
+    def new(self) -> dict:
+        return {"started": False, "first_ms": None, "last_ms": None, "pending": {}, "spans": []}
+
+    def update(self, state: dict, obj: dict):
+        now = timed_entry(state, obj)
+        if now is None:
+            return
+        message = obj["message"]
+        if state["first_ms"] is None:
+            state["first_ms"] = now
+        state["last_ms"] = now
+
+        if obj["type"] == "assistant":
+            for block in tool_uses(message):
+                if block.get("name") == "Task" and "id" in block:
+                    subagent_type = block.get("input", {}).get("subagent_type", "unknown")
+                    state["pending"][block["id"]] = [subagent_type, now]
+        else:
+            for block in tool_results(message):
+                started = state["pending"].pop(block.get("tool_use_id"), None)
+                if started:
+                    state["spans"].append(started + [now])
+
+    def finalize(self, state: dict) -> dict:
+        # Subagents still running when the transcript ends are cut off there
+        spans = state["spans"] + [started + [state["last_ms"]] for started in state["pending"].values()]
+        return schedule_stats(spans, state["first_ms"], state["last_ms"])
+
+
+class CacheCollector(Collector):
+    """Prompt-cache reads and writes per assistant message, priced per model.
+
+    A message split over several transcript entries repeats its usage, so
+    consecutive entries with the same message id count once.
+    """
+
+    name = "cache"
+    markers = (USAGE_MARKER,)
+    # A turn reading less than this share of its input from cache rebuilt the cache
+    COLD_RATIO = 0.5
+
+    def new(self) -> dict:
+        return {"last_id": None, "turns": []}
+
+    def update(self, state: dict, obj: dict):
+        message = obj.get("message")
+        if obj.get("type") != "assistant" or not isinstance(message, dict) or not message.get("usage"):
+            return
+        usage = message["usage"]
+        turn = [
+            message.get("model", ""),
+            usage.get("input_tokens", 0) or 0,
+            usage.get("cache_read_input_tokens", 0) or 0,
+            usage.get("cache_creation_input_tokens", 0) or 0,
+            usage.get("output_tokens", 0) or 0,
+        ]
+        message_id = message.get("id")
+        if message_id and message_id == state["last_id"]:
+            state["turns"][-1] = turn
+        else:
+            state["turns"].append(turn)
+        state["last_id"] = message_id
+
+    def finalize(self, state: dict) -> dict:
+        series = []
+        uncached_total = read_total = created_total = 0
+        cost_total = no_cache_total = 0.0
+        rates_by_model = {}
+        for model, uncached, read, created, output in state["turns"]:
+            rates = rates_by_model.get(model)
+            if rates is None:
+                rates = rates_by_model[model] = rates_for(model)
+            total_input = uncached + read + created
+            cost = usage_cost(uncached, output, created, read, rates)
+            uncached_total += uncached
+            read_total += read
+            created_total += created
+            cost_total += cost
+            no_cache_total += usage_cost(total_input, output, 0, 0, rates)
+            series.append([round(read / total_input, 3) if total_input else 0, created, round(cost, 6)])
+        total_input = uncached_total + read_total + created_total
+        return {
+            "uncached_input_tokens": uncached_total,
+            "cache_read_tokens": read_total,
+            "cache_creation_tokens": created_total,
+            "cache_read_ratio": read_total / total_input if total_input else 0,
+            "cache_cold_turns": sum(1 for ratio, _, _ in series[1:] if ratio < self.COLD_RATIO),
+            "cost_usd_effective": cost_total,
+            "cost_usd_no_cache": no_cache_total,
+            "cache_turns": series,
+        }
+
+
+class ContextCollector(Collector):
+    """Main-thread context size per assistant message, and where it was compacted.
+
+    A message's context is everything it was prompted with: input plus cache
+    read and cache creation tokens. Compaction shows up as a compact_boundary
+    entry before the next message or, failing that, as that message's context
+    falling by more than DROP_RATIO. Sidechains have their own context and are
+    skipped.
+    """
+
+    name = "context"
+    markers = (USAGE_MARKER, TOOL_USE_MARKER, COMPACT_MARKER)
+    DROP_RATIO = 0.3
+    THRESHOLDS = (50_000, 100_000, 150_000)
+
+    def new(self) -> dict:
+        return {"last_id": None, "tool_calls": 0, "compacting": None, "turns": [], "compactions": []}
+
+    def update(self, state: dict, obj: dict):
+        if obj.get("isSidechain"):
+            return
+        if obj.get("subtype") == "compact_boundary":
+            metadata = obj.get("compactMetadata")
+            trigger = metadata.get("trigger") if isinstance(metadata, dict) else None
+            state["compacting"] = trigger or "compact"
+            return
+        message = obj.get("message")
+        if obj.get("type") != "assistant" or not isinstance(message, dict):
+            return
+        usage = message.get("usage")
+        if usage:
+            context = ((usage.get("input_tokens") or 0) + (usage.get("cache_read_input_tokens") or 0)
+                       + (usage.get("cache_creation_input_tokens") or 0))
+            message_id = message.get("id")
+            if message_id and message_id == state["last_id"]:
+                state["turns"][-1][0] = context
+            else:
+                turns = state["turns"]
+                before = turns[-1][0] if turns else 0
+                trigger = state["compacting"] or ("drop" if context < before * (1 - self.DROP_RATIO) else None)
+                if trigger:
+                    state["compactions"].append([len(turns) + 1, before, context, trigger])
+                    state["compacting"] = None
+                turns.append([context, state["tool_calls"]])
+            state["last_id"] = message_id
+        state["tool_calls"] += sum(1 for _ in tool_uses(message))
+
+    def finalize(self, state: dict) -> dict:
+        turns = state["turns"]
+        compacted = {turn for turn, _, _, _ in state["compactions"]}
+        # Growth between consecutive messages, leaving out the drops compaction caused
+        growth = sum(turns[i][0] - turns[i - 1][0] for i in range(1, len(turns)) if i + 1 not in compacted)
+        reached = {}
+        for threshold in self.THRESHOLDS:
+            reached[f"{threshold // 1000}k"] = next(
+                (i + 1 for i, (context, _) in enumerate(turns) if context >= threshold), None)
+        return {
+            "context_turns": [list(turn) for turn in turns],
+            "peak_context_tokens": max((context for context, _ in turns), default=0),
+            "final_context_tokens": turns[-1][0] if turns else 0,
+            "context_growth_per_tool": growth / state["tool_calls"] if state["tool_calls"] else 0,
+            "turns_to_context": reached,
+            "compactions": [list(c) for c in state["compactions"]],
+        }
+
+
+DEFAULT_COLLECTORS = (TokenCollector(), ToolCollector(), OrchestrationCollector(), CacheCollector(),
+                      ContextCollector())
+# Timing needs the tool_result lines, which hold most of a transcript's bytes,
+# so it is left out of the default scan and added by the reports that show it
+TIMING_COLLECTORS = (LatencyCollector(), SubagentCollector())
+REPORT_COLLECTORS = DEFAULT_COLLECTORS + TIMING_COLLECTORS
+CACHE_KEYS = ("uncached_input_tokens", "cache_read_tokens", "cache_creation_tokens", "cache_read_ratio",
+              "cache_cold_turns", "cost_usd_effective", "cost_usd_no_cache", "cache_turns")
+LATENCY_KEYS = ("model_ms", "tool_ms", "subagent_ms", "other_ms", "model_turns", "tool_latencies_ms")
+CONTEXT_KEYS = ("context_turns", "peak_context_tokens", "final_context_tokens", "context_growth_per_tool",
+                "turns_to_context", "compactions")
+# Every per-session key the reports carry over from REPORT_COLLECTORS, besides tokens, duration and tool counts
+REPORT_KEYS = LATENCY_KEYS + SCHEDULE_KEYS + CACHE_KEYS + CONTEXT_KEYS
+
+
+def report_fields(metrics: dict) -> dict:
+    """The REPORT_KEYS of a finalized result."""
+    return {key: metrics[key] for key in REPORT_KEYS}
+
+
+def empty_report() -> dict:
+    """The REPORT_KEYS of a session with no entries."""
+    return report_fields(finalize_metrics(new_metrics(REPORT_COLLECTORS), REPORT_COLLECTORS))
+
+
+def cache_report(groups: dict) -> list:
+    """Markdown lines on prompt-cache reuse and effective cost per method ({label: [runs with CACHE_KEYS]})."""
+    lines = ["## Prompt Cache", ""]
+    lines.append("| Method | Runs | Cache read ratio | Cache created | Cold turns | Effective cost | Without cache | Saved |")
+    lines.append("|--------|------|------------------|---------------|------------|----------------|---------------|-------|")
+    for label, runs in groups.items():
+        runs = [r for r in runs if "cache_read_ratio" in r]
+        if not runs:
+            continue
+        avg = {key: sum(r[key] for r in runs) / len(runs) for key in CACHE_KEYS[:7]}
+        saved = 1 - avg["cost_usd_effective"] / avg["cost_usd_no_cache"] if avg["cost_usd_no_cache"] else 0
+        lines.append(
+            f"| {label} | {len(runs)} | {avg['cache_read_ratio']:.1%} | {avg['cache_creation_tokens']:,.0f} | "
+            f"{avg['cache_cold_turns']:.1f} | ${avg['cost_usd_effective']:.4f} | ${avg['cost_usd_no_cache']:.4f} | "
+            f"{saved:.0%} |"
+        )
+    lines.append("")
+    lines.append("Averages per run, at the prices in scripts/pricing.json. Cold turns read under "
+                 f"{CacheCollector.COLD_RATIO:.0%} of their input from cache (first turn excluded).")
+    lines.append("")
+    return lines
+
+
+def context_report(groups: dict) -> list:
+    """Markdown lines on context-window growth and compaction per method ({label: [runs with CONTEXT_KEYS]})."""
+    thresholds = [f"{threshold // 1000}k" for threshold in ContextCollector.THRESHOLDS]
+    lines = ["## Context Growth", ""]
+    lines.append("| Method | Runs | Peak context | Final context | Growth / tool call | Compactions | "
+                 + " | ".join(f"Turns to {t}" for t in thresholds) + " |")
+    lines.append("|--------|------|--------------|---------------|--------------------|-------------|"
+                 + "|".join("-" * (len(t) + 11) for t in thresholds) + "|")
+    for label, runs in groups.items():
+        runs = [r for r in runs if "peak_context_tokens" in r]
+        if not runs:
+            continue
+        avg = {key: sum(r[key] for r in runs) / len(runs) for key in CONTEXT_KEYS[1:4]}
+        compactions = sum(len(r["compactions"]) for r in runs) / len(runs)
+        cells = []
+        for t in thresholds:
+            turns = [r["turns_to_context"][t] for r in runs if r["turns_to_context"].get(t)]
+            cells.append(f"{sum(turns) / len(turns):.1f} ({len(turns)}/{len(runs)})" if turns else "-")
+        lines.append(
+            f"| {label} | {len(runs)} | {avg['peak_context_tokens']:,.0f} | {avg['final_context_tokens']:,.0f} | "
+            f"{avg['context_growth_per_tool']:,.0f} | {compactions:.1f} | " + " | ".join(cells) + " |"
+        )
+    lines.append("")
+    lines.append("Context is input plus cache tokens per main-thread model call, averaged per run. Growth per "
+                 "tool call leaves out compaction drops; turns to a threshold average the runs that reached it "
+                 "(reached/runs).")
+    lines.append("")
+    return lines
+
+
+def latency_report(groups: dict) -> list:
+    """Markdown lines attributing wall time per method ({label: [runs with LATENCY_KEYS]})."""
+    lines = ["## Time Attribution", ""]
+    lines.append("| Method | Runs | Model turns | Model | Tools | Subagents | Other |")
+    lines.append("|--------|------|-------------|-------|-------|-----------|-------|")
+    for label, runs in groups.items():
+        runs = [r for r in runs if "model_ms" in r]
+        if not runs:
+            continue
+        avg = {key: sum(r[key] for r in runs) / len(runs) for key in LATENCY_KEYS[:5]}
+        total = sum(avg[key] for key in LATENCY_KEYS[:4]) or 1
+        cells = " | ".join(f"{avg[key] / 1000:.1f}s ({avg[key] / total:.0%})" for key in LATENCY_KEYS[:4])
+        lines.append(f"| {label} | {len(runs)} | {avg['model_turns']:.1f} | {cells} |")
+    lines.append("")
+
+    lines.append("### Tool Latency (all runs)")
+    lines.append("")
+    lines.append("| Method | Tool | Calls | p50 | p95 | Max | Total |")
+    lines.append("|--------|------|-------|-----|-----|-----|-------|")
+    for label, runs in groups.items():
+        pooled = {}
+        for r in runs:
+            for tool, values in r.get("tool_latencies_ms", {}).items():
+                pooled.setdefault(tool, []).extend(values)
+        for tool, stats in latency_stats(pooled).items():
+            lines.append(
+                f"| {label} | {tool} | {stats['count']} | {stats['p50_ms'] / 1000:.1f}s | "
+                f"{stats['p95_ms'] / 1000:.1f}s | {stats['max_ms'] / 1000:.1f}s | {stats['total_ms'] / 1000:.1f}s |"
+            )
+    lines.append("")
+    return lines
+
+
+def new_metrics(collectors: tuple = DEFAULT_COLLECTORS) -> dict:
+    """Return an empty metrics accumulator."""
+    return {
+        "first_ts": None,
+        "last_ts": None,
+        "collectors": {c.name: c.new() for c in collectors},
+    }
+
+
+def update_metrics(metrics: dict, obj: dict, collectors: tuple = DEFAULT_COLLECTORS):
+    """Fold one decoded transcript entry into the metrics accumulator."""
+    # Track timestamps for duration
+    ts = obj.get("timestamp")
+    if ts:
+        if metrics["first_ts"] is None:
+            metrics["first_ts"] = ts
+        metrics["last_ts"] = ts
+
+    states = metrics["collectors"]
+    for collector in collectors:
+        collector.update(states[collector.name], obj)
+
+
+def duration_ms(first_ts: str, last_ts: str) -> int:
+    """Milliseconds between two ISO timestamps (0 if unparseable)."""
+    if not (first_ts and last_ts):
+        return 0
+    try:
+        t1 = datetime.fromisoformat(first_ts.replace("Z", "+00:00"))
+        t2 = datetime.fromisoformat(last_ts.replace("Z", "+00:00"))
+        return int((t2 - t1).total_seconds() * 1000)
+    except Exception:
+        return 0
+
+
+def finalize_metrics(metrics: dict, collectors: tuple = DEFAULT_COLLECTORS) -> dict:
+    """Convert an accumulator into a flat result dict from every collector."""
+    result = {
+        "first_ts": metrics["first_ts"],
+        "last_ts": metrics["last_ts"],
+        "duration_ms": duration_ms(metrics["first_ts"], metrics["last_ts"]),
+    }
+    for collector in collectors:
+        result.update(collector.finalize(metrics["collectors"][collector.name]))
+    return result
+
+
+def decode_line(line: bytes):
+    """Decode one raw JSONL line; return the object, or None if it is not JSON."""
+    try:
+        return loads(line)
+    except ValueError:
+        return None
+
+
+def fold_line(metrics: dict, line: bytes, collectors: tuple = DEFAULT_COLLECTORS) -> bool:
+    """Decode one raw JSONL line into metrics; return False if it was blank."""
+    if not line.strip():
+        return False
+    obj = decode_line(line)
+    if isinstance(obj, dict):
+        update_metrics(metrics, obj, collectors)
+    return True
+
+
+def _last_timestamp(f, start: int, end: int) -> str:
+    """Full-decode fallback: last top-level timestamp between two offsets."""
+    last_ts = None
+    f.seek(start)
+    pos = start
+    while pos < end:
+        line = f.readline()
+        if not line:
+            break
+        pos += len(line)
+        if TIMESTAMP_MARKER in line:
+            obj = decode_line(line)
+            if isinstance(obj, dict) and obj.get("timestamp"):
+                last_ts = obj["timestamp"]
+    return last_ts
+
+
+def scan_stream(f, metrics: dict, fast: bool = True, collectors: tuple = DEFAULT_COLLECTORS) -> tuple:
+    """Fold every newline-terminated line of a binary stream into metrics.
+
+    In fast mode, once the first timestamp is known only lines whose raw bytes
+    contain one of the collectors' markers are JSON-decoded; other lines can
+    only move last_ts. Skipped lines are not searched for a timestamp: the
+    last one is decoded at the end, and only if it has no top-level timestamp
+    are the skipped lines after the last decoded timestamp re-read. Results
+    are identical to decoding every line.
+
+    Returns (stats, tail) where tail is a trailing partial line (or None) that
+    has not been folded, so callers can decide whether to count it yet.
+    """
+    stats = {"bytes": 0, "lines": 0, "decoded": 0}
+    tail = None
+    start = f.tell()
+    # The last-timestamp fallback re-reads the stream, which zstd readers cannot do
+    fast = fast and f.seekable()
+    pending_ts = None  # latest line skipped since the last decoded timestamp
+    pending_from = None  # offset of the first of those lines
+    # One regex pass stops at the first marker; testing each marker in turn
+    # rescans the whole line for every marker it lacks, which on tool_result
+    # lines cost more than decoding them
+    markers = dict.fromkeys(marker for c in collectors for marker in c.markers)
+    any_marker = re.compile(b"|".join(map(re.escape, markers)) if markers else b"(?!)").search
+
+    for line in f:
+        if not line.endswith(b"\n"):
+            tail = line
+            break
+        stats["bytes"] += len(line)
+        if not line.strip():
+            continue
+        stats["lines"] += 1
+
+        if fast and metrics["first_ts"] is not None and not any_marker(line):
+            if pending_ts is None:
+                pending_from = start + stats["bytes"] - len(line)
+            pending_ts = line
+            continue
+
+        obj = decode_line(line)
+        stats["decoded"] += 1
+        if isinstance(obj, dict):
+            update_metrics(metrics, obj, collectors)
+            if obj.get("timestamp"):
+                pending_ts = None
+
+    if pending_ts is not None:
+        obj = decode_line(pending_ts)
+        stats["decoded"] += 1
+        if isinstance(obj, dict) and obj.get("timestamp"):
+            metrics["last_ts"] = obj["timestamp"]
+        else:
+            # No top-level timestamp on the last skipped line: an earlier
+            # one may hold the real last timestamp, so decode them all
+            last_ts = _last_timestamp(f, pending_from, start + stats["bytes"])
+            if last_ts:
+                metrics["last_ts"] = last_ts
+
+    return stats, tail
+
+
+def with_throughput(result: dict, stats: dict, elapsed: float) -> dict:
+    """Attach scan size and MB/s to a finalized result."""
+    result["bytes"] = stats["bytes"]
+    result["lines"] = stats["lines"]
+    result["decoded"] = stats.get("decoded", 0)
+    result["elapsed_s"] = elapsed
+    result["mb_per_s"] = (stats["bytes"] / 1e6) / elapsed if elapsed > 0 else 0
+    return result
+
+
+def open_transcript(transcript_path: Path):
+    """Open a plain or archived (.gz/.zst) transcript as a binary stream."""
+    if is_compressed(transcript_path):
+        return open_compressed(transcript_path)
+    return open(transcript_path, "rb", buffering=READ_BUFFER_BYTES)
+
+
+def scan_transcript(transcript_path: Path, fast: bool = True,
+                    collectors: tuple = DEFAULT_COLLECTORS) -> dict:
+    """Stream a transcript once and return its metrics plus scan throughput."""
+    metrics = new_metrics(collectors)
+    start = time.perf_counter()
+
+    with open_transcript(transcript_path) as f:
+        stats, tail = scan_stream(f, metrics, fast, collectors)
+    if tail is not None:
+        stats["bytes"] += len(tail)
+        if fold_line(metrics, tail, collectors):
+            stats["lines"] += 1
+            stats["decoded"] += 1
+
+    result = finalize_metrics(metrics, collectors)
+    return with_throughput(result, stats, time.perf_counter() - start)
+
+
+def load_cache(cache_file: Path = CACHE_FILE) -> dict:
+    """Load the incremental metrics cache (empty if missing or corrupt)."""
+    try:
+        cache = json.loads(cache_file.read_text())
+    except Exception:
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache
+
+
+def save_cache(cache: dict, cache_file: Path = CACHE_FILE):
+    """Atomically persist the incremental metrics cache."""
+    if not cache.get("dirty"):
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": cache.get("entries", {})}))
+    os.replace(tmp, cache_file)
+    cache["dirty"] = False
+
+
+def cache_key(transcript_path: Path) -> str:
+    """Cache entries are keyed by resolved transcript path."""
+    return str(Path(transcript_path).resolve())
+
+
+def _entry_is_prefix(entry: dict, st: os.stat_result, f) -> bool:
+    """Check the cached offset still marks a line boundary of the same file."""
+    if entry.get("inode") != st.st_ino or st.st_size < entry.get("offset", 0):
+        return False
+    offset = entry["offset"]
+    if offset == 0:
+        return True
+    f.seek(offset - 1)
+    return f.read(1) == b"\n"
+
+
+def scan_transcript_cached(transcript_path: Path, cache: dict, fast: bool = True,
+                           collectors: tuple = DEFAULT_COLLECTORS) -> dict:
+    """Return transcript metrics, parsing only bytes appended since the last run.
+
+    The cache maps resolved path to inode, size, mtime, the byte offset of the
+    last complete line parsed and the raw collector state at that offset. A
+    file that shrank, was replaced, or no longer has a line break at the
+    cached offset is rescanned from byte 0, as is one cached with a different
+    collector set. Archived (compressed) transcripts are immutable: they are
+    either answered from the cache or rescanned whole.
+    """
+    key = cache_key(transcript_path)
+    entries = cache.setdefault("entries", {})
+    entry = entries.get(key)
+    names = [c.name for c in collectors]
+    if entry and entry.get("collectors") != names:
+        entry = None
+    start = time.perf_counter()
+
+    compressed = is_compressed(transcript_path)
+    with open_transcript(transcript_path) as f:
+        st = os.stat(transcript_path) if compressed else os.fstat(f.fileno())
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns \
+                and entry["inode"] == st.st_ino and entry.get("tail") is None:
+            stats = {"bytes": 0, "lines": 0}
+            result = finalize_metrics(entry["metrics"], collectors)
+            return with_throughput(result, stats, time.perf_counter() - start)
+
+        if entry is None or compressed or not _entry_is_prefix(entry, st, f):
+            entry = {"offset": 0, "collectors": names, "metrics": new_metrics(collectors)}
+        else:
+            f.seek(entry["offset"])
+        metrics = entry["metrics"]
+        stats, tail = scan_stream(f, metrics, fast, collectors)
+
+    entry.update({
+        "inode": st.st_ino,
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        "offset": entry["offset"] + stats["bytes"],
+        "tail": None if tail is None else len(tail),
+    })
+    entries[key] = entry
+    cache["dirty"] = True
+
+    if tail is not None:
+        # Count a not-yet-terminated last line without committing it to the cache
+        metrics = copy.deepcopy(metrics)
+        stats["bytes"] += len(tail)
+        if fold_line(metrics, tail, collectors):
+            stats["lines"] += 1
+            stats["decoded"] += 1
+
+    result = finalize_metrics(metrics, collectors)
+    return with_throughput(result, stats, time.perf_counter() - start)
+
+
+def _scan_task(transcript_path: Path, entry: dict, use_cache: bool, fast: bool,
+               collectors: tuple) -> tuple:
+    """Process-pool worker: scan one transcript and return (result, cache entry).
+
+    Only the compact result and the (possibly updated) cache entry travel back
+    to the parent; raw lines never leave the worker.
+    """
+    if not use_cache:
+        return scan_transcript(transcript_path, fast, collectors), None
+    key = cache_key(transcript_path)
+    cache = {"entries": {key: entry} if entry else {}}
+    result = scan_transcript_cached(transcript_path, cache, fast, collectors)
+    return result, cache["entries"][key] if cache.get("dirty") else None
+
+
+def scan_transcripts(transcript_paths: list, cache: dict = None, jobs: int = 1,
+                     fast: bool = True, collectors: tuple = DEFAULT_COLLECTORS) -> list:
+    """Scan many transcripts, across a process pool when jobs > 1.
+
+    Results come back in the same order as transcript_paths; a transcript that
+    fails to parse yields None. Cache entries updated by workers are merged
+    into the parent cache.
+    """
+    use_cache = cache is not None
+    entries = cache.setdefault("entries", {}) if use_cache else {}
+    tasks = [
+        (Path(p), entries.get(cache_key(p)), use_cache, fast, collectors)
+        for p in transcript_paths
+    ]
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            futures = [pool.submit(_scan_task, *task) for task in tasks]
+            outcomes = []
+            for task, future in zip(tasks, futures):
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    print(f"Error parsing transcript {task[0].name}: {e}")
+                    outcomes.append((None, None))
+    else:
+        outcomes = []
+        for task in tasks:
+            try:
+                outcomes.append(_scan_task(*task))
+            except Exception as e:
+                print(f"Error parsing transcript {task[0].name}: {e}")
+                outcomes.append((None, None))
+
+    results = []
+    for (path, *_), (result, entry) in zip(tasks, outcomes):
+        if entry is not None:
+            entries[cache_key(path)] = entry
+            cache["dirty"] = True
+        results.append(result)
+    return results
+
+
+def analyze_sessions(session_ids: list, transcript_dir: Path, jobs: int = 1,
+                     collectors: tuple = DEFAULT_COLLECTORS) -> list:
+    """Resolve and scan sessions in one cached pass; this is what analyzers call.
+
+    Each session is looked up in transcript_dir first, then through the
+    session index, then in the transcript archive. Returns one metrics dict
+    per session id, in order, or None for sessions whose transcript is
+    missing or unreadable and for empty ids (runs that never started).
+    """
+    index = load_index()
+    archived = None
+    found = []
+    for i, session_id in enumerate(session_ids):
+        if not session_id:
+            continue
+        transcript_path = Path(transcript_dir) / f"{session_id}.jsonl"
+        if not transcript_path.exists():
+            # Sessions run from another workspace live in another project dir
+            transcript_path = find_transcript(session_id, index)
+        if transcript_path is None:
+            archived = load_sessions() if archived is None else archived
+            transcript_path = find_archived_transcript(session_id, archived)
+        if transcript_path:
+            found.append((i, transcript_path))
+        else:
+            print(f"Transcript not found: {session_id}")
+    save_index(index)
+
+    cache = load_cache()
+    scanned = scan_transcripts([path for _, path in found], cache, jobs, collectors=collectors)
+    save_cache(cache)
+
+    results = [None] * len(session_ids)
+    for (i, _), metrics in zip(found, scanned):
+        results[i] = metrics
+    return results
+
+
+def parse_cli_output(json_file: Path) -> dict:
+    """Parse `claude --print --output-format json` output (plain or archived .gz/.zst)."""
+    result = {
+        "tokens_input": 0,
+        "tokens_output": 0,
+        "tokens_total": 0,
+        "tokens_cache_read": 0,
+        "tokens_cache_creation": 0,
+        "duration_ms": 0,
+        "num_turns": 0,
+        "cost_usd": 0,
+        "session_id": "",
+        "response_text": "",
+    }
+
+    try:
+        content = read_text(json_file).strip()
+        if not content:
+            return result
+
+        data = json.loads(content)
+        if isinstance(data, dict):
+            # Extract metrics from Claude CLI JSON output
+            result["session_id"] = data.get("session_id", "")
+            result["duration_ms"] = data.get("duration_ms", 0)
+            result["num_turns"] = data.get("num_turns", 0)
+            result["cost_usd"] = data.get("total_cost_usd", 0)
+            result["response_text"] = data.get("result", "")
+
+            # Token usage
+            usage = data.get("usage", {})
+            result["tokens_input"] = usage.get("input_tokens", 0)
+            result["tokens_output"] = usage.get("output_tokens", 0)
+            result["tokens_cache_read"] = usage.get("cache_read_input_tokens", 0)
+            result["tokens_cache_creation"] = usage.get("cache_creation_input_tokens", 0)
+
+            # Total = input + output + cache
+            result["tokens_total"] = (
+                result["tokens_input"]
+                + result["tokens_output"]
+                + result["tokens_cache_read"]
+                + result["tokens_cache_creation"]
+            )
+
+    except json.JSONDecodeError as e:
+        print(f"JSON parse error for {json_file}: {e}")
+    except Exception as e:
+        print(f"Error parsing {json_file}: {e}")
+
+    return result
+
+
+def compare_jobs(transcript_paths: list, jobs: int):
+    """Print serial vs process-pool wall time for the same set of transcripts."""
+    timings = {}
+    for n in (1, jobs):
+        start = time.perf_counter()
+        scan_transcripts(transcript_paths, jobs=n)
+        timings[n] = time.perf_counter() - start
+
+    total_mb = sum(Path(p).stat().st_size for p in transcript_paths) / 1e6
+    print(f"{len(transcript_paths)} transcripts, {total_mb:.1f} MB")
+    print("| Jobs | Wall time | MB/s | Speedup |")
+    print("|------|-----------|------|---------|")
+    for n, elapsed in timings.items():
+        print(f"| {n} | {elapsed:.2f}s | {total_mb / elapsed:.1f} | {timings[1] / elapsed:.2f}x |")
+
+
+# Edge cases for the fast scan: first line without a timestamp, blank and
+# invalid lines, a marker inside message text, timestamp-only trailing lines,
+# a nested (non top-level) timestamp, plain user messages and a final line
+# without a newline.
+EQUIVALENCE_SAMPLES = {
+    "basic": [
+        '{"type":"user","message":{"role":"user","content":"start"}}',
+        '{"type":"user","timestamp":"2026-01-01T00:00:00.000Z","message":{"role":"user","content":"hi"}}',
+        '',
+        'not json',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:01.500Z","message":{"usage":{"input_tokens":10,'
+        '"cache_read_input_tokens":90,"cache_creation_input_tokens":5,"output_tokens":7},"content":['
+        '{"type":"tool_use","id":"t1","name":"Task","input":{"subagent_type":"code-reviewer"}},'
+        '{"type":"tool_use","id":"t2","name":"TaskCreate","input":{}}]}}',
+        '{"type":"user","timestamp":"2026-01-01T00:00:03.000Z","message":{"role":"user","content":['
+        '{"type":"tool_result","tool_use_id":"t1","content":"mentions \\"usage\\" and tool_use"}]}}',
+        '{"type":"system","timestamp":"2026-01-01T00:00:04.250Z"}',
+        '{"type":"summary","summary":"done"}',
+    ],
+    "nested-timestamp": [
+        '{"type":"user","timestamp":"2026-01-01T00:00:00Z","message":{"role":"user","content":"hi"}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:02Z","message":{"usage":{"output_tokens":3}}}',
+        '{"type":"system","timestamp":"2026-01-01T00:00:05Z"}',
+        '{"type":"progress","data":{"timestamp":"2026-01-01T00:09:00Z"}}',
+    ],
+    "compaction": [
+        '{"type":"user","timestamp":"2026-01-01T00:00:00Z","message":{"role":"user","content":"go"}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:01Z","message":{"id":"m1","usage":{"input_tokens":4,'
+        '"cache_creation_input_tokens":60000,"output_tokens":5},"content":[{"type":"tool_use","id":"r1",'
+        '"name":"Read","input":{}}]}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:02Z","message":{"id":"m2","usage":{"input_tokens":4,'
+        '"cache_read_input_tokens":90000,"output_tokens":5}}}',
+        '{"type":"system","subtype":"compact_boundary","timestamp":"2026-01-01T00:00:03Z",'
+        '"compactMetadata":{"trigger":"auto","preTokens":90004}}',
+        '{"type":"user","isCompactSummary":true,"timestamp":"2026-01-01T00:00:04Z","message":{"content":"sum"}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:05Z","message":{"id":"m3","usage":{"input_tokens":9000,'
+        '"output_tokens":5}}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:06Z","message":{"id":"m4","usage":{"input_tokens":10,'
+        '"cache_read_input_tokens":2000,"output_tokens":5}}}',
+        '{"type":"system","subtype":"compact_boundary","timestamp":"2026-01-01T00:00:07Z",'
+        '"compactMetadata":{"trigger":"manual","preTokens":2010}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:08Z","message":{"id":"m5","usage":{"input_tokens":10,'
+        '"cache_read_input_tokens":1900,"output_tokens":5}}}',
+    ],
+    "interactive": [
+        '{"type":"system","timestamp":"2026-01-01T00:00:00Z","content":"session start"}',
+        '{"type":"user","timestamp":"2026-01-01T00:00:01Z","message":{"role":"user","content":"first"}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:03Z","message":{"usage":{"output_tokens":2},"content":['
+        '{"type":"tool_use","id":"a1","name":"Task","input":{"subagent_type":"planner"}}]}}',
+        '{"type":"assistant","isSidechain":true,"timestamp":"2026-01-01T00:00:04Z","message":{"usage":{}}}',
+        '{"type":"user","timestamp":"2026-01-01T00:00:09Z","message":{"role":"user","content":['
+        '{"type":"tool_result","tool_use_id":"a1","content":"plan"}]}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:00:10Z","message":{"usage":{"output_tokens":2}}}',
+        '{"type":"user","timestamp":"2026-01-01T00:01:00Z","message":{"role":"user","content":"again"}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:01:02Z","message":{"content":[{"type":"text","text":"ok"}]}}',
+        '{"type":"assistant","timestamp":"2026-01-01T00:01:03Z","message":{"usage":{"output_tokens":2}}}',
+    ],
+    "no-trailing-newline": [
+        '{"timestamp":"2026-01-01T00:00:00Z","message":{"usage":{"input_tokens":1}}}',
+        '{"timestamp":"2026-01-01T00:00:09Z","message":{"content":[{"type":"tool_use","name":"Read"}]}}',
+    ],
+}
+
+
+def _mismatched_keys(a: dict, b: dict) -> list:
+    """Metric keys (scan statistics excluded) whose values differ."""
+    keys = (set(a) | set(b)) - set(SCAN_STAT_KEYS)
+    return sorted(k for k in keys if a.get(k) != b.get(k))
+
+
+def check_equivalence(transcript_paths: list) -> list:
+    """Compare fast and full-decode scans; return a list of mismatch descriptions.
+
+    The built-in EQUIVALENCE_SAMPLES are always checked, plus any transcripts
+    given. Cached scans of each sample split at every line are checked too.
+    """
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = []
+        for name, lines in EQUIVALENCE_SAMPLES.items():
+            path = Path(tmp) / f"{name}.jsonl"
+            content = "\n".join(lines)
+            path.write_text(content if name == "no-trailing-newline" else content + "\n")
+            samples.append(path)
+
+        # Each collector set filters on its own markers, so both are checked
+        for collectors in (DEFAULT_COLLECTORS, REPORT_COLLECTORS):
+            for path in samples + [Path(p) for p in transcript_paths]:
+                full = scan_transcript(path, fast=False, collectors=collectors)
+                fast = scan_transcript(path, fast=True, collectors=collectors)
+                for key in _mismatched_keys(full, fast):
+                    mismatches.append(f"{path.name}: {key} full={full.get(key)!r} fast={fast.get(key)!r}")
+
+            # Incremental scans must agree too, whatever offset the cache stopped at
+            for path in samples:
+                data = path.read_bytes()
+                full = scan_transcript(path, fast=False, collectors=collectors)
+                cut_points = [i + 1 for i, byte in enumerate(data) if byte == ord("\n")]
+                for cut in cut_points:
+                    growing = Path(tmp) / "growing.jsonl"
+                    growing.write_bytes(data[:cut])
+                    cache = {}
+                    scan_transcript_cached(growing, cache, collectors=collectors)
+                    growing.write_bytes(data)
+                    fast = scan_transcript_cached(growing, cache, collectors=collectors)
+                    for key in _mismatched_keys(full, fast):
+                        mismatches.append(
+                            f"{path.name} (cached from byte {cut}): {key} "
+                            f"full={full.get(key)!r} fast={fast.get(key)!r}"
+                        )
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream-parse Claude session transcripts.")
+    parser.add_argument("transcripts", nargs="*", type=Path, help="session JSONL files")
+    parser.add_argument("--jobs", type=int, default=1, help="parse in N worker processes")
+    parser.add_argument("--compare", action="store_true", help="time serial vs --jobs parsing")
+    parser.add_argument("--full-decode", action="store_true", help="JSON-decode every line (no pre-filter)")
+    parser.add_argument("--check", action="store_true", help="verify fast and full-decode scans agree")
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.transcripts:
+        if path.exists():
+            paths.append(path)
+        else:
+            print(f"Transcript not found: {path}")
+
+    if args.check:
+        mismatches = check_equivalence(paths)
+        for mismatch in mismatches:
+            print(f"MISMATCH {mismatch}")
+        checked = len(EQUIVALENCE_SAMPLES) + len(paths)
+        print(f"Fast scan equivalence: {'FAIL' if mismatches else 'OK'} ({checked} transcripts)")
+        return 1 if mismatches else 0
+
+    if not paths:
+        parser.print_usage()
+        return 1
+
+    if args.compare:
+        compare_jobs(paths, max(args.jobs, 2))
+        return 0
+
+    scanned = scan_transcripts(paths, jobs=args.jobs, fast=not args.full_decode, collectors=REPORT_COLLECTORS)
+    for path, m in zip(paths, scanned):
+        if m is None:
+            continue
+        print(
+            f"{path.name}: {m['lines']:,} lines ({m['decoded']:,} decoded), {m['bytes'] / 1e6:.1f} MB in {m['elapsed_s']:.2f}s "
+            f"({m['mb_per_s']:.1f} MB/s) | tokens {m['total_tokens']:,} | "
+            f"tools {sum(m['tool_counts'].values())} | duration {m['duration_ms'] / 1000:.1f}s "
+            f"(model {m['model_ms'] / 1000:.1f}s, tools {m['tool_ms'] / 1000:.1f}s, "
+            f"subagents {m['subagent_ms'] / 1000:.1f}s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+In-process access to the verifier scripts, with results cached by content.
+
+The verify-*.py scripts stay runnable on their own; this module imports them
+and calls their verify functions directly, so the runner and analyzers skip
+an interpreter start and stdout parsing per workspace. Results are cached in
+~/.cache/skill-validation/verify-results.json, keyed by the verifier's
+source hash and a content hash of the verified tree, so an unchanged
+workspace (or log dir) is never verified twice. Results are JSON-shaped
+(string keys) whether they come from the cache or a fresh run.
+
+Each tree is walked once into a workspace_snapshot.Snapshot; the content
+hash and the workspace verifiers' checks share its file reads. verify_many
+sweeps N workspaces in a thread pool. A check spec from verify-specs/ (see
+check_spec.py) can be named instead of a script, so a new benchmark needs
+only a spec file.
+
+Usage: python3 verification.py <verifier script | spec.json> <workspace> [...] [--jobs N] [--no-cache]
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from check_spec import SPEC_DIR, compile_spec, verify_spec
+from workspace_snapshot import Snapshot
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CACHE_FILE = Path.home() / ".cache/skill-validation/verify-results.json"
+CACHE_VERSION = 1
+DEFAULT_JOBS = 8
+
+# Verifier script -> (function, whether it accepts a Snapshot instead of a path)
+VERIFIERS = {
+    "verify-steps.py": ("verify", True),
+    "verify-greeting-feature-implementation.py": ("verify_implementation", True),
+    "verify-context-engineering-skill-benchmark-responses.py": ("verify_benchmark", False),
+}
+
+
+def is_spec(verifier: str) -> bool:
+    return verifier.endswith(".json")
+
+
+@lru_cache(maxsize=None)
+def load_module(script: str):
+    """Import a hyphenated verifier script as a module."""
+    path = SCRIPT_DIR / script
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@lru_cache(maxsize=None)
+def load_verifier(verifier: str):
+    """The verify function of a script, or a compiled check spec's runner."""
+    if is_spec(verifier):
+        plan = compile_spec(SPEC_DIR / verifier)
+        return lambda workspace: verify_spec(plan, workspace)
+    return getattr(load_module(verifier), VERIFIERS[verifier][0])
+
+
+@lru_cache(maxsize=None)
+def source_digest(verifier: str) -> str:
+    """Hash of a verifier's code and spec, so editing a check invalidates cached results."""
+    if is_spec(verifier):
+        sources = [SPEC_DIR / verifier, SCRIPT_DIR / "check_spec.py"]
+    else:
+        spec_file = getattr(load_module(verifier), "SPEC_FILE", None)
+        sources = [SCRIPT_DIR / verifier] + ([Path(spec_file), SCRIPT_DIR / "check_spec.py"] if spec_file else [])
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def load_cache(cache_file: Path = CACHE_FILE) -> dict:
+    """Load the verification cache (empty if missing or corrupt)."""
+    try:
+        cache = json.loads(cache_file.read_text())
+    except Exception:
+        return {"entries": {}}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {"entries": {}}
+    return cache
+
+
+def save_cache(cache: dict, cache_file: Path = CACHE_FILE):
+    """Atomically persist the verification cache."""
+    if not cache.get("dirty"):
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": cache.get("entries", {})}))
+    os.replace(tmp, cache_file)
+    cache["dirty"] = False
+
+
+def verify(script: str, path: Path, cache: dict = None) -> dict:
+    """Run a verifier in-process on path, reusing the cached result for identical content."""
+    snap = Snapshot(path)
+    key = f"{script}:{source_digest(script)}:{snap.digest()}"
+    if cache is not None and key in cache["entries"]:
+        result = json.loads(json.dumps(cache["entries"][key]))
+    else:
+        takes_snapshot = is_spec(script) or VERIFIERS[script][1]
+        result = json.loads(json.dumps(load_verifier(script)(snap if takes_snapshot else Path(path))))
+        if cache is not None:
+            cache["entries"][key] = result
+            cache["dirty"] = True
+    if "workspace" in result:
+        result["workspace"] = str(path)
+    return result
+
+
+def verify_many(script: str, paths: list, cache: dict = None, jobs: int = DEFAULT_JOBS) -> list:
+    """verify() every path, jobs at a time; results in input order."""
+    load_verifier(script)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(paths)))) as pool:
+        return list(pool.map(lambda path: verify(script, path, cache), paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a verifier in-process with result caching.")
+    parser.add_argument("verifier", choices=sorted(VERIFIERS) + sorted(p.name for p in SPEC_DIR.glob("*.json")))
+    parser.add_argument("paths", nargs="+", type=Path, help="workspaces (or log dirs) to verify")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="verify N paths at a time")
+    parser.add_argument("--no-cache", action="store_true", help="always re-verify")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else load_cache()
+    results = verify_many(args.verifier, args.paths, cache, args.jobs)
+    if cache is not None:
+        save_cache(cache)
+
+    if len(results) == 1:
+        print(json.dumps(results[0], indent=2))
+        return 0
+    print("| Workspace | Passed | Total | Accuracy |")
+    print("|-----------|--------|-------|----------|")
+    for path, result in zip(args.paths, results):
+        print(f"| {path} | {result.get('passed', '-')} | {result.get('total', '-')} | "
+              f"{result.get('accuracy', 0):.1%} |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
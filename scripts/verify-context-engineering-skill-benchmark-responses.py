@@ -2,12 +2,37 @@
 """
 Verify context engineering benchmark responses against expected concepts.
 Scores accuracy based on coverage of key concepts per task.
+
+--batch scores every stored response at once: all archived runs (see
+transcript_archive.py) plus any log dirs given, across models and skill
+types. It reports per-concept recall, per-task accuracy distributions and
+the concepts that best separate the monolithic (local) skill from the
+modular (external) one. The response x concept matrices use NumPy when it
+is installed.
+
+Usage: python3 verify-context-engineering-skill-benchmark-responses.py [log_dir]
+       python3 verify-context-engineering-skill-benchmark-responses.py --batch [log_dir ...]
 """
+import argparse
+import hashlib
 import json
+import math
 import re
+import statistics
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from transcript_archive import ARCHIVE_DIR, find_object, read_text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOG_DIR = Path("/tmp/ck-context-benchmark")
+RESPONSE_FILE = re.compile(r"(?:^|/)(local|external)-task-(\d+)\.json$")
+SKILL_TYPES = {"local": "monolithic", "external": "modular"}
 
 # Expected concepts per task
 EXPECTED_CONCEPTS = {
@@ -69,10 +94,38 @@ EXPECTED_CONCEPTS = {
 }
 
 
-def check_concept(text: str, patterns: List[str]) -> bool:
-    """Check if any pattern matches in text (case-insensitive)."""
+def compile_concepts(concepts: List[Tuple[str, List[str]]]) -> Dict[str, List[str]]:
+    """Compile (concept, patterns) pairs into {lowercased pattern: [concepts]} for find_concepts()."""
+    owners = {}
+    for concept_name, patterns in concepts:
+        for pattern in patterns:
+            owners.setdefault(pattern.lower(), []).append(concept_name)
+    return owners
+
+
+def find_concepts(matcher: Dict[str, List[str]], text: str) -> Dict[str, Tuple[int, str]]:
+    """First hit of each concept as {concept: (offset, pattern)}, case-insensitive.
+
+    The text is lowercased once and each distinct pattern searched once; once
+    its concepts have a hit, a pattern is only looked for before that hit.
+    """
     text_lower = text.lower()
-    return any(p.lower() in text_lower for p in patterns)
+    hits = {}
+    for pattern, concept_names in matcher.items():
+        end = len(text_lower)
+        if all(name in hits for name in concept_names):
+            end = max(hits[name][0] for name in concept_names) + len(pattern) - 1
+        pos = text_lower.find(pattern, 0, end)
+        if pos < 0:
+            continue
+        for concept_name in concept_names:
+            if concept_name not in hits or pos < hits[concept_name][0]:
+                hits[concept_name] = (pos, pattern)
+    return hits
+
+
+# One matcher per task, compiled at import
+CONCEPT_MATCHERS = {task_id: compile_concepts(info["concepts"]) for task_id, info in EXPECTED_CONCEPTS.items()}
 
 
 def score_response(task_id: int, response_text: str) -> Dict:
@@ -86,11 +139,14 @@ def score_response(task_id: int, response_text: str) -> Dict:
         "score": 0,
     }
 
-    for concept_name, patterns in task_info["concepts"]:
-        if check_concept(response_text, patterns):
+    hits = find_concepts(CONCEPT_MATCHERS[task_id], response_text)
+    for concept_name, _ in task_info["concepts"]:
+        if concept_name in hits:
             results["concepts_found"].append(concept_name)
         else:
             results["concepts_missing"].append(concept_name)
+    # Offset (into the lowercased text) and pattern of each concept's first hit
+    results["positions"] = {name: {"offset": pos, "pattern": pattern} for name, (pos, pattern) in hits.items()}
 
     results["score"] = len(results["concepts_found"])
     results["accuracy"] = results["score"] / results["total"] if results["total"] > 0 else 0
@@ -99,9 +155,9 @@ def score_response(task_id: int, response_text: str) -> Dict:
 
 
 def extract_response_text(json_file: Path) -> str:
-    """Extract response text from claude output JSON."""
+    """Extract response text from claude output JSON (plain or archived .gz/.zst)."""
     try:
-        content = json_file.read_text().strip()
+        content = read_text(json_file).strip()
         if not content:
             return ""
 
@@ -170,6 +226,9 @@ def print_results(results: Dict):
                 total_score += found
                 total_possible += total
                 print(f"Task {task_id} ({name}): {acc:.0f}% ({found}/{total})")
+                if task_result.get("positions"):
+                    matched = (f"{c}@{p['offset']}" for c, p in task_result["positions"].items())
+                    print(f"  Matched: {', '.join(matched)}")
                 if task_result["concepts_missing"]:
                     print(f"  Missing: {', '.join(task_result['concepts_missing'])}")
 
@@ -178,8 +237,215 @@ def print_results(results: Dict):
             print(f"\nOverall Accuracy: {overall:.1f}% ({total_score}/{total_possible})")
 
 
+def load_stored_responses(log_dirs: List[Path] = (), archive_dir: Path = ARCHIVE_DIR) -> List[Dict]:
+    """Every response file in archived runs and log_dirs.
+
+    A run that is both archived and still in a log dir counts once: responses
+    are keyed by content, model, skill type and task, so identical responses
+    in different cells are all kept.
+    """
+    responses = []
+    seen = set()
+
+    def add(run: str, model: str, name: str, digest: str, path: Path):
+        match = RESPONSE_FILE.search(name)
+        if not match or path is None:
+            return
+        task_id = int(match.group(2))
+        key = (digest, model, match.group(1), task_id)
+        if key in seen:
+            return
+        seen.add(key)
+        if task_id in EXPECTED_CONCEPTS:
+            responses.append({"run": run, "model": model, "skill_type": match.group(1),
+                              "task_id": task_id, "text": extract_response_text(path)})
+
+    for manifest_file in sorted((archive_dir / "runs").glob("*.json")):
+        manifest = json.loads(manifest_file.read_text())
+        files = manifest.get("files", {})
+        model = "default"
+        if "model.txt" in files:
+            model = read_text(find_object(files["model.txt"]["sha256"], archive_dir)).strip() or model
+        for name, info in files.items():
+            add(manifest["label"], model, name, info["sha256"], find_object(info["sha256"], archive_dir))
+
+    for log_dir in log_dirs:
+        for path in sorted(Path(log_dir).rglob("*-task-*.json")):
+            model_file = path.parent / "model.txt"
+            model = model_file.read_text().strip() if model_file.exists() else "default"
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            add(str(path.parent), model, path.name, digest, path)
+    return responses
+
+
+def build_matrices(responses: List[Dict]) -> Dict[int, Dict]:
+    """Per task, the responses and their response x concept hit matrix."""
+    rows = {task_id: [] for task_id in EXPECTED_CONCEPTS}
+    docs = {task_id: [] for task_id in EXPECTED_CONCEPTS}
+    for response in responses:
+        task_id = response["task_id"]
+        hits = find_concepts(CONCEPT_MATCHERS[task_id], response["text"])
+        rows[task_id].append([name in hits for name, _ in EXPECTED_CONCEPTS[task_id]["concepts"]])
+        docs[task_id].append(response)
+
+    matrices = {}
+    for task_id, task_rows in rows.items():
+        width = len(EXPECTED_CONCEPTS[task_id]["concepts"])
+        hits = np.array(task_rows, dtype=bool).reshape(len(task_rows), width) if np else task_rows
+        matrices[task_id] = {"docs": docs[task_id], "hits": hits, "width": width}
+    return matrices
+
+
+def concept_rates(matrix: Dict, mask: List[bool]) -> Tuple[int, List[Optional[float]]]:
+    """(selected responses, hit rate per concept) over the rows where mask is set; rates are None without rows."""
+    if np:
+        selected = matrix["hits"][np.array(mask, dtype=bool)] if len(mask) else matrix["hits"]
+        if not len(selected):
+            return 0, [None] * matrix["width"]
+        return len(selected), selected.mean(axis=0).tolist()
+    selected = [row for row, keep in zip(matrix["hits"], mask) if keep]
+    if not selected:
+        return 0, [None] * matrix["width"]
+    return len(selected), [sum(col) / len(selected) for col in zip(*selected)]
+
+
+def response_accuracies(matrix: Dict) -> List[float]:
+    """Fraction of the task's concepts each response covers."""
+    if np:
+        return matrix["hits"].mean(axis=1).tolist() if len(matrix["hits"]) else []
+    return [sum(row) / matrix["width"] for row in matrix["hits"]]
+
+
+def distribution(values: List[float]) -> Dict:
+    """n, mean, stdev and quartiles of a list of accuracies."""
+    if not values:
+        return {"n": 0}
+    quartiles = statistics.quantiles(values, n=4, method="inclusive") if len(values) > 1 else values * 3
+    return {
+        "n": len(values),
+        "mean": statistics.mean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "p25": quartiles[0],
+        "median": quartiles[1],
+        "p75": quartiles[2],
+        "max": max(values),
+    }
+
+
+def separation(rate_a: float, n_a: int, rate_b: float, n_b: int) -> float:
+    """Two-proportion z score of rate_a vs rate_b (0 when undefined)."""
+    if not n_a or not n_b:
+        return 0.0
+    pooled = (rate_a * n_a + rate_b * n_b) / (n_a + n_b)
+    spread = math.sqrt(pooled * (1 - pooled) * (1 / n_a + 1 / n_b))
+    return (rate_a - rate_b) / spread if spread else 0.0
+
+
+def summarize_batch(matrices: Dict[int, Dict]) -> Dict:
+    """Recall, accuracy distributions and separating concepts from the hit matrices."""
+    summary = {"tasks": {}, "models": {}, "separating": []}
+    for task_id, matrix in matrices.items():
+        task_info = EXPECTED_CONCEPTS[task_id]
+        names = [name for name, _ in task_info["concepts"]]
+        accuracies = response_accuracies(matrix)
+        n, overall = concept_rates(matrix, [True] * len(matrix["docs"]))
+        task = {"name": task_info["name"], "n": n,
+                "recall": {name: {"all": rate} for name, rate in zip(names, overall)},
+                "accuracy": {}}
+
+        by_type = {}
+        for skill_type in SKILL_TYPES:
+            mask = [doc["skill_type"] == skill_type for doc in matrix["docs"]]
+            by_type[skill_type] = concept_rates(matrix, mask)
+            for name, rate in zip(names, by_type[skill_type][1]):
+                task["recall"][name][skill_type] = rate
+            task["accuracy"][skill_type] = distribution([a for a, keep in zip(accuracies, mask) if keep])
+
+        (n_local, local), (n_external, external) = by_type["local"], by_type["external"]
+        # Separation needs responses from both skill types
+        if n_local and n_external:
+            for name, rate_local, rate_external in zip(names, local, external):
+                summary["separating"].append({
+                    "task": task_info["name"],
+                    "concept": name,
+                    "local": rate_local,
+                    "external": rate_external,
+                    "diff": rate_local - rate_external,
+                    "z": separation(rate_local, n_local, rate_external, n_external),
+                })
+
+        for doc, accuracy in zip(matrix["docs"], accuracies):
+            summary["models"].setdefault(doc["model"], {}).setdefault(doc["skill_type"], []).append(accuracy)
+        summary["tasks"][task_id] = task
+
+    summary["separating"].sort(key=lambda s: abs(s["z"]), reverse=True)
+    summary["models"] = {
+        model: {skill_type: distribution(values) for skill_type, values in types.items()}
+        for model, types in summary["models"].items()
+    }
+    return summary
+
+
+def percent(rate: Optional[float]) -> str:
+    """A rate as a percentage, or n/a when there was nothing to measure."""
+    return "n/a" if rate is None else f"{rate:.0%}"
+
+
+def print_batch(summary: Dict, responses: int, top: int = 10):
+    """Markdown tables for a batch summary."""
+    print(f"## Concept Coverage ({responses} responses)\n")
+    print("### Accuracy by Task\n")
+    print("| Task | Skill | n | Mean | Stdev | Min | P25 | Median | P75 | Max |")
+    print("|------|-------|---|------|-------|-----|-----|--------|-----|-----|")
+    for task in summary["tasks"].values():
+        for skill_type, dist in task["accuracy"].items():
+            if dist["n"]:
+                print(f"| {task['name']} | {SKILL_TYPES[skill_type]} | {dist['n']} | {dist['mean']:.0%} | "
+                      f"{dist['stdev']:.0%} | {dist['min']:.0%} | {dist['p25']:.0%} | {dist['median']:.0%} | "
+                      f"{dist['p75']:.0%} | {dist['max']:.0%} |")
+
+    print("\n### Accuracy by Model\n")
+    print("| Model | Skill | n | Mean | Median |")
+    print("|-------|-------|---|------|--------|")
+    for model, types in sorted(summary["models"].items()):
+        for skill_type, dist in sorted(types.items()):
+            print(f"| {model} | {SKILL_TYPES[skill_type]} | {dist['n']} | {dist['mean']:.0%} | {dist['median']:.0%} |")
+
+    print("\n### Concept Recall\n")
+    print("| Task | Concept | All | Monolithic | Modular |")
+    print("|------|---------|-----|------------|---------|")
+    for task in summary["tasks"].values():
+        for name, recall in task["recall"].items():
+            print(f"| {task['name']} | {name} | {percent(recall['all'])} | {percent(recall['local'])} | "
+                  f"{percent(recall['external'])} |")
+
+    print(f"\n### Concepts Separating Monolithic from Modular (top {top})\n")
+    print("| Task | Concept | Monolithic | Modular | Diff | z |")
+    print("|------|---------|------------|---------|------|---|")
+    for s in summary["separating"][:top]:
+        print(f"| {s['task']} | {s['concept']} | {s['local']:.0%} | {s['external']:.0%} | "
+              f"{s['diff']:+.0%} | {s['z']:+.1f} |")
+
+
 def main():
-    log_dir = Path("/tmp/ck-context-benchmark")
+    parser = argparse.ArgumentParser(description="Verify context engineering benchmark responses.")
+    parser.add_argument("log_dirs", nargs="*", type=Path, help=f"log directories (default: {LOG_DIR})")
+    parser.add_argument("--batch", action="store_true", help="score every archived response plus log_dirs")
+    parser.add_argument("--archive-dir", type=Path, default=ARCHIVE_DIR)
+    parser.add_argument("--top", type=int, default=10, help="separating concepts to list")
+    args = parser.parse_args()
+
+    if args.batch:
+        responses = load_stored_responses(args.log_dirs, args.archive_dir)
+        if not responses:
+            print(f"No stored responses in {args.archive_dir} or {', '.join(map(str, args.log_dirs)) or 'log dirs'}")
+            sys.exit(1)
+        summary = summarize_batch(build_matrices(responses))
+        print_batch(summary, len(responses), args.top)
+        return summary
+
+    log_dir = args.log_dirs[0] if args.log_dirs else LOG_DIR
 
     if not log_dir.exists():
         print(f"Log directory not found: {log_dir}")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifests of a workspace, and the diff between two of them.
+
+A manifest maps each file's relative path to its size, mtime, inode and
+sha256. Building one is incremental: given an earlier manifest of the same
+tree, files whose size, mtime and inode are unchanged (at the same path, or
+moved) keep their hash without being read (the stat cache), and only the
+rest are hashed, in a thread pool. run-benchmarks.py takes one manifest
+before and one after each run, so the after manifest costs a stat per file
+plus a read of what the run wrote.
+
+diff_manifests classifies changes as created, modified, deleted or renamed
+(a deleted and a created path with the same content hash);
+check_spec.verify_changes compares them with a spec's expected changes.
+
+Usage: python3 workspace_manifest.py <workspace> [--previous FILE] [--save FILE] [--diff FILE] [--jobs N]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from workspace_snapshot import SKIP_DIRS
+
+MANIFEST_VERSION = 1
+DEFAULT_JOBS = 8
+CHANGE_KINDS = ("created", "modified", "deleted", "renamed")
+
+
+def scan_files(root: Path) -> dict:
+    """rel path -> (size, mtime_ns, inode) for every regular file under root."""
+    files = {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        try:
+            scanner = os.scandir(Path(root) / rel)
+        except OSError:
+            continue
+        with scanner:
+            for entry in scanner:
+                path = f"{rel}/{entry.name}" if rel else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+                except OSError:
+                    continue
+    return files
+
+
+def hash_file(path: Path) -> str:
+    """sha256 of a file, or None if it vanished or is unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+def build_manifest(root: Path, previous: dict = None, jobs: int = DEFAULT_JOBS) -> dict:
+    """Manifest of root, reusing previous hashes for files whose stat is unchanged."""
+    old = (previous or {}).get("files", {})
+    # A rename keeps the inode and mtime, so moved files are found by inode
+    by_inode = {entry["ino"]: entry for entry in old.values()}
+    files = {}
+    todo = []
+    for rel, (size, mtime_ns, ino) in scan_files(root).items():
+        entry = {"size": size, "mtime_ns": mtime_ns, "ino": ino, "sha256": None}
+        cached = old.get(rel) or by_inode.get(ino)
+        if cached and (cached["size"], cached["mtime_ns"], cached["ino"]) == (size, mtime_ns, ino):
+            entry["sha256"] = cached["sha256"]
+        else:
+            todo.append(rel)
+        files[rel] = entry
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(todo)))) as pool:
+            for rel, digest in zip(todo, pool.map(hash_file, [Path(root) / rel for rel in todo])):
+                files[rel]["sha256"] = digest
+
+    return {
+        "version": MANIFEST_VERSION,
+        "root": str(root),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "hashed": len(todo),
+        "files": files,
+    }
+
+
+def diff_manifests(before: dict, after: dict) -> dict:
+    """Created, modified, deleted and renamed paths from before to after."""
+    old, new = before["files"], after["files"]
+    created = sorted(set(new) - set(old))
+    deleted = sorted(set(old) - set(new))
+    modified = sorted(p for p in set(old) & set(new) if old[p]["sha256"] != new[p]["sha256"])
+
+    # A created file with the content of a deleted one is a rename (pairs matched in path order)
+    deleted_by_hash = {}
+    for path in deleted:
+        if old[path]["sha256"]:
+            deleted_by_hash.setdefault(old[path]["sha256"], []).append(path)
+    renamed = []
+    for path in created:
+        candidates = deleted_by_hash.get(new[path]["sha256"])
+        if candidates:
+            renamed.append([candidates.pop(0), path])
+    moved_from = {pair[0] for pair in renamed}
+    moved_to = {pair[1] for pair in renamed}
+
+    return {
+        "created": [p for p in created if p not in moved_to],
+        "modified": modified,
+        "deleted": [p for p in deleted if p not in moved_from],
+        "renamed": renamed,
+    }
+
+
+def load_manifest(path: Path) -> dict:
+    """A saved manifest, or None if missing, corrupt or from another version."""
+    try:
+        manifest = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def save_manifest(manifest: dict, path: Path):
+    """Write a manifest atomically."""
+    path = Path(path)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest))
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-hash manifest of a workspace.")
+    parser.add_argument("workspace", type=Path)
+    parser.add_argument("--previous", type=Path, help="earlier manifest to reuse hashes from")
+    parser.add_argument("--save", type=Path, help="write the manifest here")
+    parser.add_argument("--diff", type=Path, help="print changes since this manifest")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="hash N files at a time")
+    args = parser.parse_args()
+
+    previous = load_manifest(args.previous) if args.previous else None
+    manifest = build_manifest(args.workspace, previous, args.jobs)
+    print(f"{args.workspace}: {len(manifest['files'])} files, {manifest['hashed']} hashed")
+    if args.save:
+        save_manifest(manifest, args.save)
+    if args.diff:
+        before = load_manifest(args.diff)
+        if before is None:
+            print(f"Cannot read manifest {args.diff}")
+            return 1
+        diff = diff_manifests(before, manifest)
+        for kind in CHANGE_KINDS:
+            for change in diff[kind]:
+                print(f"{kind:9} {' -> '.join(change) if kind == 'renamed' else change}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
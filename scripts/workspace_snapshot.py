@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+One-pass workspace snapshot for the verifiers.
+
+Snapshot walks a tree once with os.scandir and records each entry's type and
+size. File contents and hashes are loaded on first use and kept, so several
+checks on the same file share one read, and the content hash used for the
+verification cache reuses them. The verify-*.py scripts evaluate every check
+against a snapshot instead of issuing their own stat and read calls.
+
+Usage: python3 workspace_snapshot.py <workspace> [...]
+"""
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+# Recorded as directories but not walked
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv"}
+# Files up to this size keep their bytes after hashing, for later checks
+KEEP_CONTENT_BYTES = 4 * 1024 * 1024
+
+
+class Snapshot:
+    """Types and sizes of everything under root; contents and hashes on demand.
+
+    Paths are relative to root with "/" separators, e.g. "src/main.py".
+    """
+
+    def __init__(self, root: Path, skip_dirs: set = SKIP_DIRS):
+        self.root = Path(root)
+        self.entries = {}
+        self._content = {}
+        self._hashes = {}
+        if self.root.is_dir():
+            self.entries[""] = ("dir", 0)
+            self._scan(skip_dirs)
+
+    def _scan(self, skip_dirs: set):
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                scanner = os.scandir(self.root / rel)
+            except OSError:
+                continue
+            with scanner:
+                for entry in scanner:
+                    path = f"{rel}/{entry.name}" if rel else entry.name
+                    try:
+                        if entry.is_dir():
+                            self.entries[path] = ("dir", 0)
+                            if entry.name not in skip_dirs and not entry.is_symlink():
+                                stack.append(path)
+                        elif entry.is_file():
+                            self.entries[path] = ("file", entry.stat().st_size)
+                    except OSError:
+                        continue
+
+    def exists(self, rel: str) -> bool:
+        return rel in self.entries
+
+    def is_dir(self, rel: str) -> bool:
+        return self.entries.get(rel, (None,))[0] == "dir"
+
+    def is_file(self, rel: str) -> bool:
+        return self.entries.get(rel, (None,))[0] == "file"
+
+    def size(self, rel: str) -> int:
+        return self.entries[rel][1]
+
+    def read_bytes(self, rel: str) -> bytes:
+        """File contents, read once; raises OSError like Path.read_bytes."""
+        if rel not in self._content:
+            if not self.is_file(rel):
+                raise FileNotFoundError(self.root / rel)
+            self._content[rel] = (self.root / rel).read_bytes()
+        return self._content[rel]
+
+    def read_text(self, rel: str) -> str:
+        return self.read_bytes(rel).decode("utf-8")
+
+    def json(self, rel: str) -> dict:
+        """Parsed JSON file, {} when missing or invalid."""
+        try:
+            return json.loads(self.read_bytes(rel))
+        except (OSError, ValueError):
+            return {}
+
+    def sha256(self, rel: str) -> str:
+        """Content hash, computed once; small files keep their bytes for read_bytes."""
+        if rel not in self._hashes:
+            if rel in self._content:
+                self._hashes[rel] = hashlib.sha256(self._content[rel]).hexdigest()
+            elif self.size(rel) <= KEEP_CONTENT_BYTES:
+                self._hashes[rel] = hashlib.sha256(self.read_bytes(rel)).hexdigest()
+            else:
+                with open(self.root / rel, "rb") as f:
+                    self._hashes[rel] = hashlib.file_digest(f, "sha256").hexdigest()
+        return self._hashes[rel]
+
+    def digest(self) -> str:
+        """Hash of every directory name and file path + content in the snapshot."""
+        if not self.entries:
+            return "missing"
+        digest = hashlib.sha256()
+        for rel in sorted(self.entries):
+            if self.is_dir(rel):
+                digest.update(f"d {rel}\n".encode())
+            else:
+                try:
+                    content = self.sha256(rel)
+                except OSError:
+                    content = "unreadable"
+                digest.update(f"f {rel} {content}\n".encode())
+        return digest.hexdigest()
+
+
+def main():
+    for root in sys.argv[1:]:
+        snap = Snapshot(Path(root))
+        files = [rel for rel in snap.entries if snap.is_file(rel)]
+        total = sum(snap.size(rel) for rel in files)
+        print(f"{root}: {len(snap.entries) - len(files)} dirs, {len(files)} files, "
+              f"{total / 1e6:.1f} MB, digest {snap.digest()[:16]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())